@@ -1,9 +1,14 @@
 """模擬 REST API 端點"""
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Optional
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Query, Response
+from typing import Literal, Optional
 
 from app.models.simulation import SimulationJob, SimulationParameters
-from app.models.results import FlowFieldResults
+from app.models.results import CacheStats, ConvergenceHistoryPage, FlowFieldResults
+from app.services.result_query import parse_fields, parse_window
+from app.services.scheduler import SchedulerRejected
+from app.services.serialization import (
+    JSON_MEDIA_TYPE, NPZ_MEDIA_TYPE, RAW_MEDIA_TYPE, SUPPORTED_MEDIA_TYPES, encode_npz, encode_raw, negotiate
+)
 from app.services.solver_service import solver_service
 
 router = APIRouter()
@@ -17,10 +22,17 @@ async def create_simulation(
     """
     建立新的模擬任務
 
-    接收模擬參數,建立任務並在背景執行求解器
+    接收模擬參數,建立任務並在背景執行求解器;
+    相同參數已有結果時直接返回已完成的任務, 執行中時返回該任務;
+    排程佇列工作量超過上限時返回 429; initial_condition 指定的任務無結果時返回 400
     """
     # 建立任務
-    job = solver_service.create_job(parameters)
+    try:
+        job = solver_service.create_job(parameters)
+    except SchedulerRejected as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # 啟動背景任務
     background_tasks.add_task(solver_service.run_simulation, job.job_id)
@@ -28,12 +40,19 @@ async def create_simulation(
     return job
 
 
+@router.get("/cache/stats", response_model=CacheStats)
+async def get_cache_stats():
+    """結果快取統計 (命中、未命中、合併次數與佔用記憶體)"""
+    return solver_service.cache_stats()
+
+
 @router.get("/{job_id}", response_model=SimulationJob)
 async def get_simulation_status(job_id: str):
     """
     查詢模擬任務狀態
 
-    返回任務的當前狀態 (PENDING, RUNNING, COMPLETED, FAILED)
+    返回任務的當前狀態 (PENDING, QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED);
+    排隊中的任務附上佇列位置與預估等待時間
     """
     job = solver_service.get_job(job_id)
     if not job:
@@ -42,12 +61,36 @@ async def get_simulation_status(job_id: str):
     return job
 
 
-@router.get("/{job_id}/results", response_model=FlowFieldResults)
-async def get_simulation_results(job_id: str):
+@router.get(
+    "/{job_id}/results",
+    response_model=FlowFieldResults,
+    responses={
+        200: {"content": {RAW_MEDIA_TYPE: {}, NPZ_MEDIA_TYPE: {}}},
+        406: {"description": "不支援 Accept 所要求的格式"},
+    },
+)
+async def get_simulation_results(
+    job_id: str,
+    accept: Optional[str] = Header(None),
+    fields: Optional[str] = Query(
+        None,
+        description="以逗號分隔的欄位 (pressure, velocity_u, velocity_v, x_coords, y_coords)"
+    ),
+    stride: int = Query(1, ge=1, description="間隔取樣 (每 stride 點取一點)"),
+    window: Optional[str] = Query(
+        None,
+        description="子區域 i0:i1,j0:j1 (i 為 x 方向索引, j 為 y 方向索引, 半開區間)"
+    ),
+    dtype: Literal["float64", "float32"] = Query("float64", description="輸出浮點精度")
+):
     """
     取得模擬結果
 
-    僅當任務狀態為 COMPLETED 時可用
+    僅當任務狀態為 COMPLETED 時可用。依 Accept 標頭選擇格式:
+    application/json (預設, 巢狀 list)、
+    application/octet-stream (小端序原始緩衝區 + JSON 標頭) 或 application/x-npz。
+    fields、stride、window 與 dtype 可只取所需部分; 帶查詢條件的 JSON 回應
+    僅包含所選欄位, 並附上 query 摘要。收斂歷史不含於結果中, 由 /history 分頁取得
     """
     job = solver_service.get_job(job_id)
     if not job:
@@ -59,30 +102,101 @@ async def get_simulation_results(job_id: str):
             detail=f"任務尚未完成,當前狀態: {job.status}"
         )
 
-    results = solver_service.get_results(job_id)
-    if not results:
+    try:
+        selected_fields = parse_fields(fields)
+        selected_window = parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = negotiate(accept)
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"支援的格式: {', '.join(SUPPORTED_MEDIA_TYPES)}"
+        )
+
+    if media_type in (RAW_MEDIA_TYPE, NPZ_MEDIA_TYPE):
+        arrays = solver_service.get_result_arrays(job_id, selected_fields, stride, selected_window)
+        if not arrays:
+            raise HTTPException(status_code=404, detail="結果不存在")
+        encode = encode_raw if media_type == RAW_MEDIA_TYPE else encode_npz
+        return Response(content=encode(*arrays, dtype=dtype), media_type=media_type)
+
+    # JSON: 略過 response_model 驗證 (完整結果使用快取的序列化內容)
+    payload = solver_service.get_results_json(job_id, selected_fields, stride, selected_window, dtype)
+    if payload is None:
         raise HTTPException(status_code=404, detail="結果不存在")
 
-    return results
+    return Response(content=payload, media_type=JSON_MEDIA_TYPE)
 
 
-@router.delete("/{job_id}", status_code=204)
-async def delete_simulation(job_id: str):
+@router.get("/{job_id}/history", response_model=ConvergenceHistoryPage)
+async def get_simulation_history(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="第一筆取樣的索引"),
+    limit: int = Query(1000, ge=1, le=10000, description="每頁最多筆數")
+):
     """
-    取消/刪除模擬任務
+    分頁取得收斂歷史
 
-    注意: MVP 版本不支援取消正在執行的任務
+    僅當任務狀態為 COMPLETED 時可用; 取樣依迭代次數遞增,
+    較舊的取樣已依 history_max_samples 以對數間隔稀疏化
     """
     job = solver_service.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="任務不存在")
 
-    # MVP: 僅支援刪除已完成或失敗的任務
-    if job.status == "RUNNING":
+    if job.status != "COMPLETED":
         raise HTTPException(
             status_code=400,
-            detail="無法刪除正在執行的任務"
+            detail=f"任務尚未完成,當前狀態: {job.status}"
         )
 
-    # TODO: 實作刪除邏輯
+    page = solver_service.get_history(job_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="結果不存在")
+    return page
+
+
+@router.post("/{job_id}/resume", response_model=SimulationJob)
+async def resume_simulation(job_id: str, background_tasks: BackgroundTasks):
+    """
+    續算已取消或失敗的任務
+
+    有檢查點時由最近的檢查點繼續, 否則重新開始;
+    任務狀態不是 CANCELLED 或 FAILED 時返回 400
+    """
+    job = solver_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="任務不存在")
+
+    try:
+        resumed = solver_service.resume_job(job_id)
+    except SchedulerRejected as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    if not resumed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"僅能續算已取消或失敗的任務,當前狀態: {job.status}"
+        )
+
+    background_tasks.add_task(solver_service.run_simulation, job_id)
+    return resumed
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_simulation(job_id: str):
+    """
+    取消/刪除模擬任務
+
+    排隊中或執行中的任務會被取消 (狀態變為 CANCELLED, 執行中者於下一次外迭代停止);
+    已結束的任務則連同結果一併刪除
+    """
+    job = solver_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="任務不存在")
+
+    if not solver_service.cancel_job(job_id):
+        solver_service.delete_job(job_id)
+
     return None
@@ -1,49 +1,209 @@
 """WebSocket 端點"""
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict
+import asyncio
 import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.solver.snapshot import downsample_stride
+from app.models.results import SnapshotOptions
+from app.services.serialization import encode_raw
 
 router = APIRouter()
 
+Frame = Union[str, bytes]
+
+
+class Subscriber:
+    """
+    單一 WebSocket 訂閱者
+
+    訊息放入有界佇列, 由專屬的傳送任務送出; 佇列滿時丟棄最舊的訊息,
+    慢速客戶端不會拖慢求解器或其他訂閱者。
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.dropped = 0
+        # 快照訂閱選項 (None 表示未訂閱) 與上一次送出的快照 (網格序列層級與迭代次數)
+        self.snapshot_options: Optional[SnapshotOptions] = None
+        self.last_snapshot_level = 0
+        self.last_snapshot_iteration: Optional[int] = None
+        self.last_snapshot_time = 0.0
+        self._queue: Deque[Frame] = deque(maxlen=max_queue)
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._task = self._loop.create_task(self._send_loop())
+
+    def enqueue(self, frame: Frame) -> None:
+        """加入待送訊息 (可在任意執行緒呼叫)"""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(frame)
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    def snapshot_due(self, level: int, iteration: int, now: float) -> bool:
+        """
+        依訂閱的迭代間隔與速率上限判斷是否送出此快照
+
+        網格序列進入下一層時迭代次數由 0 重新起算, 該層的第一筆快照一律送出
+        """
+        options = self.snapshot_options
+        if options is None:
+            return False
+        if self.last_snapshot_iteration is None or level != self.last_snapshot_level:
+            return True
+        return (
+            iteration - self.last_snapshot_iteration >= options.every
+            and now - self.last_snapshot_time >= 1.0 / options.max_rate
+        )
+
+    def close(self) -> None:
+        """停止傳送任務"""
+        self._task.cancel()
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._queue:
+                frame = self._queue.popleft()
+                try:
+                    if isinstance(frame, bytes):
+                        await self.websocket.send_bytes(frame)
+                    else:
+                        await self.websocket.send_text(frame)
+                except Exception:
+                    # 連線已斷開, 由接收端處理移除
+                    return
+
 
 class ConnectionManager:
-    """WebSocket 連線管理器"""
+    """WebSocket 連線管理器 (每個任務可有多個訂閱者)"""
+
+    def __init__(self, max_queue: int = settings.WS_SEND_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self.subscribers: Dict[str, Set[Subscriber]] = {}
+        # 任務的最後一個訂閱者斷線時呼叫的處理函式 (參數為 job_id)
+        self.disconnect_handlers: List[Callable[[str], None]] = []
+        # 任務是否仍有快照訂閱者改變時呼叫的處理函式 (參數為 job_id 與是否需要快照)
+        self.snapshot_handlers: List[Callable[[str, bool], None]] = []
+
+    def add_disconnect_handler(self, handler: Callable[[str], None]):
+        """註冊斷線處理函式"""
+        self.disconnect_handlers.append(handler)
 
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+    def add_snapshot_handler(self, handler: Callable[[str, bool], None]):
+        """註冊快照需求變更處理函式"""
+        self.snapshot_handlers.append(handler)
 
-    async def connect(self, job_id: str, websocket: WebSocket):
+    def wants_snapshots(self, job_id: str) -> bool:
+        """任務是否有訂閱快照的連線"""
+        return any(s.snapshot_options is not None for s in self.subscribers.get(job_id, ()))
+
+    def set_snapshot_options(
+        self, job_id: str, subscriber: Subscriber, options: Optional[SnapshotOptions]
+    ) -> None:
+        """設定 (或以 None 取消) 連線的快照訂閱"""
+        before = self.wants_snapshots(job_id)
+        subscriber.snapshot_options = options
+        subscriber.last_snapshot_iteration = None
+        self._notify_snapshot_demand(job_id, before)
+
+    def _notify_snapshot_demand(self, job_id: str, before: bool) -> None:
+        after = self.wants_snapshots(job_id)
+        if after != before:
+            for handler in self.snapshot_handlers:
+                handler(job_id, after)
+
+    async def connect(self, job_id: str, websocket: WebSocket) -> Subscriber:
         """建立連線"""
         await websocket.accept()
-        self.active_connections[job_id] = websocket
+        subscriber = Subscriber(websocket, self.max_queue)
+        self.subscribers.setdefault(job_id, set()).add(subscriber)
+        return subscriber
+
+    def disconnect(self, job_id: str, subscriber: Subscriber):
+        """斷開連線; 任務已無訂閱者時呼叫斷線處理函式"""
+        subscriber.close()
+        subscribers = self.subscribers.get(job_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        before = self.wants_snapshots(job_id)
+        subscribers.discard(subscriber)
+        self._notify_snapshot_demand(job_id, before)
+        if not subscribers:
+            del self.subscribers[job_id]
+            for handler in self.disconnect_handlers:
+                handler(job_id)
 
-    def disconnect(self, job_id: str):
-        """斷開連線"""
-        if job_id in self.active_connections:
-            del self.active_connections[job_id]
+    def broadcast(self, job_id: str, frame: Frame) -> None:
+        """將已序列化的訊息放入該任務所有訂閱者的佇列"""
+        for subscriber in list(self.subscribers.get(job_id, ())):
+            subscriber.enqueue(frame)
+
+    def broadcast_json(self, job_id: str, message: dict) -> None:
+        """序列化一次後廣播"""
+        if job_id in self.subscribers:
+            self.broadcast(job_id, json.dumps(message))
 
     async def send_progress(self, job_id: str, data: dict):
         """發送進度更新"""
-        if job_id in self.active_connections:
-            try:
-                await self.active_connections[job_id].send_json({
-                    "type": "progress",
-                    "data": data
-                })
-            except Exception:
-                # 連線已斷開,移除
-                self.disconnect(job_id)
+        self.broadcast_json(job_id, {"type": "progress", "data": data})
+
+    async def send_snapshot(self, job_id: str, snapshot: Dict) -> None:
+        """
+        發送流場快照給訂閱的連線 (二進位訊息, 格式同結果的原始二進位格式)
+
+        依各連線的解析度與精度再降採樣; 相同選項的連線共用同一份編碼
+        """
+        now = time.monotonic()
+        iteration = snapshot["iteration"]
+        level = snapshot.get("level", 0)
+        frames: Dict[Tuple[int, int, str], bytes] = {}
+        for subscriber in list(self.subscribers.get(job_id, ())):
+            if not subscriber.snapshot_due(level, iteration, now):
+                continue
+            options = subscriber.snapshot_options
+            sx = downsample_stride(len(snapshot["x_coords"]), options.max_points)
+            sy = downsample_stride(len(snapshot["y_coords"]), options.max_points)
+            key = (sx, sy, options.dtype)
+            if key not in frames:
+                frames[key] = _encode_snapshot(job_id, snapshot, sx, sy, options.dtype)
+            subscriber.enqueue(frames[key])
+            subscriber.last_snapshot_level = level
+            subscriber.last_snapshot_iteration = iteration
+            subscriber.last_snapshot_time = now
 
     async def send_completion(self, job_id: str, success: bool, message: str = ""):
         """發送完成訊息"""
-        if job_id in self.active_connections:
-            try:
-                await self.active_connections[job_id].send_json({
-                    "type": "completed" if success else "error",
-                    "message": message
-                })
-            except Exception:
-                self.disconnect(job_id)
+        self.broadcast_json(job_id, {
+            "type": "completed" if success else "error",
+            "message": message
+        })
+
+
+def _encode_snapshot(job_id: str, snapshot: Dict, sx: int, sy: int, dtype: str) -> bytes:
+    """以間隔 (sx, sy) 取樣並編碼快照"""
+    fields = {
+        "pressure": snapshot["pressure"][::sy, ::sx],
+        "velocity_u": snapshot["velocity_u"][::sy, ::sx],
+        "velocity_v": snapshot["velocity_v"][::sy, ::sx],
+        "x_coords": np.asarray(snapshot["x_coords"])[::sx],
+        "y_coords": np.asarray(snapshot["y_coords"])[::sy],
+    }
+    metadata = {
+        "type": "snapshot",
+        "job_id": job_id,
+        "iteration": snapshot["iteration"],
+        "level": snapshot.get("level", 0)
+    }
+    return encode_raw(fields, metadata, dtype)
 
 
 # 全域單例
@@ -52,14 +212,44 @@ manager = ConnectionManager()
 
 @router.websocket("/simulation/{job_id}")
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
-    """WebSocket 端點用於即時進度更新"""
-    await manager.connect(job_id, websocket)
+    """
+    WebSocket 端點用於即時進度更新 (同一任務可有多個連線)
+
+    客戶端可送出 {"type": "snapshots", ...} (欄位見 SnapshotOptions) 訂閱即時流場快照,
+    快照以二進位訊息送出; enabled 為 false 時取消訂閱
+    """
+    subscriber = await manager.connect(job_id, websocket)
     try:
         while True:
             # 保持連線,等待訊息
             data = await websocket.receive_text()
             # 客戶端可以發送 ping 保持連線
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                subscriber.enqueue(json.dumps({"type": "pong"}))
+                continue
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("type") == "snapshots":
+                _handle_snapshot_request(job_id, subscriber, message)
     except WebSocketDisconnect:
-        manager.disconnect(job_id)
+        pass
+    finally:
+        manager.disconnect(job_id, subscriber)
+
+
+def _handle_snapshot_request(job_id: str, subscriber: Subscriber, message: Dict) -> None:
+    """處理快照訂閱訊息, 回覆生效的選項或錯誤"""
+    try:
+        options = SnapshotOptions.model_validate(
+            {key: value for key, value in message.items() if key != "type"}
+        )
+    except ValidationError as e:
+        subscriber.enqueue(json.dumps(
+            {"type": "error", "message": "快照選項無效", "details": e.errors(include_url=False)},
+            default=str
+        ))
+        return
+    manager.set_snapshot_options(job_id, subscriber, options if options.enabled else None)
+    subscriber.enqueue(json.dumps({"type": "snapshots", "options": options.model_dump()}))
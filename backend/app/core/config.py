@@ -1,4 +1,5 @@
 """應用程式配置"""
+import os
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -24,6 +25,42 @@ class Settings(BaseSettings):
     MIN_GRID_SIZE: int = 10
     DEFAULT_GRID_SIZE: int = 41
 
+    # 求解器執行後端: "process" (行程池) 或 "thread" (執行緒池)
+    SOLVER_EXECUTOR: str = "process"
+    SOLVER_WORKERS: int = os.cpu_count() or 1
+
+    # 排程器設定 (成本單位: 網格點數 x 迭代次數)
+    SCHEDULER_MAX_RUNNING: int = os.cpu_count() or 1
+    SCHEDULER_MAX_RUNNING_COST: float = 2e10
+    SCHEDULER_MAX_QUEUED_COST: float = 1e11
+    SCHEDULER_THROUGHPUT: float = 2e6
+    # 等待超過此秒數的任務提前到佇列頭 (避免持續有小任務時大任務無法執行)
+    SCHEDULER_MAX_WAIT: float = 600.0
+
+    # 結果快取的記憶體預算 (位元組)
+    RESULT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # 資料目錄 (結果檔案等)
+    DATA_DIR: str = "data"
+    # 結果儲存: 記憶體熱集合上限、磁碟總量上限 (位元組) 與閒置保留秒數
+    RESULT_STORE_HOT_BYTES: int = 256 * 1024 * 1024
+    RESULT_STORE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+    RESULT_TTL: float = 7 * 24 * 3600.0
+
+    # WebSocket 進度訊息的速率上限 (每個任務每秒訊息數)
+    PROGRESS_MAX_RATE: float = 10.0
+    # 每個 WebSocket 連線的待送訊息上限 (超過時丟棄最舊者)
+    WS_SEND_QUEUE_SIZE: int = 64
+
+    # 即時流場快照: 求解器取樣間隔 (外迭代次數)、每軸最多點數與每個任務每秒的快照上限
+    SNAPSHOT_EVERY: int = 10
+    SNAPSHOT_MAX_POINTS: int = 128
+    SNAPSHOT_MAX_RATE: float = 5.0
+
+    # 檢查點間隔 (外迭代次數或秒數, 先到者為準)
+    CHECKPOINT_EVERY_ITERATIONS: int = 1000
+    CHECKPOINT_EVERY_SECONDS: float = 60.0
+
     class Config:
         case_sensitive = True
 
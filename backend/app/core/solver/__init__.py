@@ -1,4 +1,10 @@
 """CFD 求解器"""
-from .simplec_wrapper import solve_cavity_flow
+from .anderson import AndersonAccelerator
+from .checkpoint import Checkpointer
+from .convergence import OUTCOME_CONVERGED, OUTCOME_MAX_ITER, OUTCOME_STAGNATED, ConvergenceMonitor, EtaEstimator
+from .history import HISTORY_COLUMNS, ConvergenceHistory
+from .simplec_wrapper import FIELD_KEYS, SolverCancelled, solve_cavity_flow
+from .snapshot import SnapshotEmitter
+from .workspace import SolverWorkspace, workspace_pool
 
-__all__ = ["solve_cavity_flow"]
+__all__ = ["solve_cavity_flow", "AndersonAccelerator", "Checkpointer", "ConvergenceMonitor", "EtaEstimator", "OUTCOME_CONVERGED", "OUTCOME_STAGNATED", "OUTCOME_MAX_ITER", "ConvergenceHistory", "HISTORY_COLUMNS", "SolverCancelled", "SnapshotEmitter", "FIELD_KEYS", "SolverWorkspace", "workspace_pool"]
@@ -0,0 +1,89 @@
+"""外迭代的 Anderson 加速"""
+import numpy as np
+
+
+class AndersonAccelerator:
+    """
+    不動點迭代 x_{k+1} = G(x_k) 的 Anderson 加速 (type II, 混合係數 1)
+
+    以最近 depth 組殘差差分 ΔF 與映射值差分 ΔG 求最小平方組合:
+        γ = argmin ||f_k - ΔF γ||,  x_{k+1} = G(x_k) - ΔG γ
+    差分存於預先配置的環形緩衝區 (depth x size), 迭代期間不另行配置大型陣列。
+    殘差範數超過前一次的 restart_factor 倍、不是有限值或最小平方求解失敗時清除歷史,
+    本次改用未加速的 G(x_k)。
+    """
+
+    def __init__(self, size: int, depth: int, restart_factor: float = 2.0):
+        self.size = size
+        self.depth = depth
+        self.restart_factor = restart_factor
+        self.restarts = 0
+
+        self._x = np.zeros(size)
+        self._f = np.zeros(size)
+        self._f_prev = np.zeros(size)
+        self._g_prev = np.zeros(size)
+        self._df = np.zeros((depth, size))
+        self._dg = np.zeros((depth, size))
+        self._count = 0
+        self._head = 0
+        self._steps = 0
+        self._prev_norm = np.inf
+
+    def reset(self) -> None:
+        """清除差分歷史"""
+        self._count = 0
+        self._head = 0
+
+    def step(self, g: np.ndarray) -> bool:
+        """
+        由 G(x_k) 計算下一個迭代值 (原地寫入 g)
+
+        第一次呼叫只記錄迭代值。返回本次是否使用了加速。
+        """
+        self._steps += 1
+        if self._steps == 1:
+            self._x[...] = g
+            return False
+
+        f = self._f
+        np.subtract(g, self._x, out=f)
+        norm = float(np.linalg.norm(f))
+        if not np.isfinite(norm):
+            # 迭代值含 NaN/inf: 捨棄歷史, 下一次呼叫重新開始記錄
+            self.reset()
+            self.restarts += 1
+            self._steps = 0
+            self._prev_norm = np.inf
+            return False
+
+        if self._steps > 2:
+            if norm > self.restart_factor * self._prev_norm:
+                # 殘差成長: 捨棄歷史, 退回未加速的更新
+                self.reset()
+                self.restarts += 1
+            else:
+                row = self._head
+                np.subtract(f, self._f_prev, out=self._df[row])
+                np.subtract(g, self._g_prev, out=self._dg[row])
+                self._head = (row + 1) % self.depth
+                self._count = min(self._count + 1, self.depth)
+        self._f_prev[...] = f
+        self._g_prev[...] = g
+        self._prev_norm = norm
+
+        accelerated = False
+        if self._count:
+            df = self._df[:self._count]
+            try:
+                gamma, *_ = np.linalg.lstsq(df.T, f, rcond=None)
+            except np.linalg.LinAlgError:
+                # SVD 不收斂: 捨棄歷史, 退回未加速的更新
+                self.reset()
+                self.restarts += 1
+                gamma = None
+            if gamma is not None and np.all(np.isfinite(gamma)):
+                g -= gamma @ self._dg[:self._count]
+                accelerated = True
+        self._x[...] = g
+        return accelerated
@@ -0,0 +1,80 @@
+"""求解器檢查點 - 定期保存流場與收斂狀態, 供中斷後續算"""
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class Checkpointer:
+    """
+    檢查點寫入器
+
+    每 every_iterations 次外迭代或每 every_seconds 秒 (先到者) 寫入一次;
+    檔案先寫入同目錄的暫存檔再以 os.replace 改名, 讀取端不會看到寫到一半的檔案。
+    """
+
+    def __init__(self, path: str, every_iterations: int = 500, every_seconds: float = 60.0):
+        self.path = path
+        self.every_iterations = every_iterations
+        self.every_seconds = every_seconds
+        self._last_iteration = 0
+        self._last_time = time.monotonic()
+
+    def due(self, iteration: int) -> bool:
+        """本次迭代後是否應寫入檢查點"""
+        return (
+            iteration - self._last_iteration >= self.every_iterations
+            or time.monotonic() - self._last_time >= self.every_seconds
+        )
+
+    def save(
+        self,
+        iteration: int,
+        p: np.ndarray,
+        u: np.ndarray,
+        v: np.ndarray,
+        convergence_history: Dict[str, np.ndarray],
+        elapsed_time: float
+    ) -> None:
+        """寫入檢查點 (iteration 為已完成的最後一次外迭代, convergence_history 為歷史欄位)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(
+                f,
+                p=p, u=u, v=v,
+                iteration=np.int64(iteration),
+                elapsed_time=np.float64(elapsed_time),
+                **{f"history_{name}": column for name, column in convergence_history.items()}
+            )
+        os.replace(temporary, self.path)
+        self._last_iteration = iteration
+        self._last_time = time.monotonic()
+
+    def load(self, nx: int, ny: int) -> Optional[Dict]:
+        """
+        讀取檢查點; 不存在或網格尺寸不符時返回 None
+
+        返回:
+            {p, u, v, iteration, elapsed_time, convergence_history}
+        """
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as data:
+            if data["p"].shape != (ny, nx):
+                return None
+            state = {key: data[key] for key in ("p", "u", "v")}
+            state["iteration"] = int(data["iteration"])
+            state["elapsed_time"] = float(data["elapsed_time"])
+            state["convergence_history"] = {
+                key[len("history_"):]: data[key] for key in data.files if key.startswith("history_")
+            }
+        self._last_iteration = state["iteration"]
+        return state
+
+    def remove(self) -> None:
+        """刪除檢查點檔案"""
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,125 @@
+"""收斂判斷 - 正規化殘差標準、停滯偵測與剩餘時間估計"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# 求解結束的原因
+OUTCOME_CONVERGED = "CONVERGED"
+OUTCOME_STAGNATED = "STAGNATED"
+OUTCOME_MAX_ITER = "MAX_ITER"
+
+
+class ConvergenceMonitor:
+    """
+    收斂與停滯監測
+
+    所選標準的殘差各自除以容許值後取最大者為收斂度量, 小於 1 即收斂:
+        velocity: u、v 相對變化量 / tolerance
+        continuity: 連續方程式殘差 / continuity_tolerance
+        all: 以上皆須滿足
+
+    收斂度量在 stagnation_window 次外迭代內未比最佳值再降低
+    stagnation_min_improvement (比例) 時判定停滯; window 為 0 時不偵測停滯。
+    第一次更新不列入判斷 (由靜止初始場預測的速度, 質量不平衡恆為零)。
+    """
+
+    def __init__(
+        self,
+        criterion: str = "velocity",
+        tolerance: float = 1e-5,
+        continuity_tolerance: float = 1e-4,
+        stagnation_window: int = 0,
+        stagnation_min_improvement: float = 0.01
+    ):
+        if criterion not in ("velocity", "continuity", "all"):
+            raise ValueError(f"未知的收斂標準: {criterion}")
+        self.criterion = criterion
+        self.tolerance = tolerance
+        self.continuity_tolerance = continuity_tolerance
+        self.stagnation_window = stagnation_window
+        self.stagnation_min_improvement = stagnation_min_improvement
+        self.best = float("inf")
+        # 最近一次的收斂度量
+        self.value = float("inf")
+        self._best_iteration: Optional[int] = None
+        self._updates = 0
+
+    def measure(self, residual_u: float, residual_v: float, continuity: float) -> float:
+        """正規化的收斂度量 (小於 1 表示收斂)"""
+        velocity = max(residual_u, residual_v) / self.tolerance
+        if self.criterion == "velocity":
+            return velocity
+        mass = continuity / self.continuity_tolerance
+        if self.criterion == "continuity":
+            return mass
+        return max(velocity, mass)
+
+    def update(
+        self, iteration: int, residual_u: float, residual_v: float, continuity: float
+    ) -> Optional[str]:
+        """加入一次外迭代的殘差, 返回 OUTCOME_CONVERGED、OUTCOME_STAGNATED 或 None (繼續)"""
+        value = self.value = self.measure(residual_u, residual_v, continuity)
+        self._updates += 1
+        if self._updates == 1:
+            return None
+        if value < 1.0:
+            return OUTCOME_CONVERGED
+
+        if self._best_iteration is None or value < self.best * (1.0 - self.stagnation_min_improvement):
+            self.best = value
+            self._best_iteration = iteration
+        elif self.stagnation_window and iteration - self._best_iteration >= self.stagnation_window:
+            return OUTCOME_STAGNATED
+        return None
+
+
+class EtaEstimator:
+    """
+    剩餘迭代次數與秒數估計
+
+    以預先配置的環形緩衝區保留最近 window 筆 (迭代次數, 已執行秒數, log 收斂度量),
+    以最小平方法擬合殘差衰減率 (log 度量對迭代次數的斜率) 與迭代速率,
+    預測收斂度量降至 1 所需的迭代次數; 殘差未下降時為 stalled_remaining (如停滯判定窗口)。
+    """
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self._samples = np.zeros((3, window))
+        self._count = 0
+
+    def update(self, iteration: int, elapsed: float, measure: float) -> None:
+        """加入一筆取樣 (measure 為 ConvergenceMonitor 的收斂度量)"""
+        i = self._count % self.window
+        self._samples[:, i] = (iteration, elapsed, math.log(max(measure, 1e-300)))
+        self._count += 1
+
+    def estimate(
+        self, max_remaining: int, stalled_remaining: Optional[int] = None
+    ) -> Optional[Tuple[int, float]]:
+        """
+        返回 (剩餘迭代次數, 剩餘秒數); 取樣不足時返回 None
+
+        參數:
+            max_remaining: 剩餘迭代次數上限 (距 max_iter 的迭代數)
+            stalled_remaining: 殘差未下降時的剩餘迭代次數 (省略時為 max_remaining)
+        """
+        n = min(self._count, self.window)
+        if n < 3:
+            return None
+        iterations, elapsed, log_measure = self._samples[:, :n]
+        iteration_span = iterations.max() - iterations.min()
+        time_span = elapsed.max() - elapsed.min()
+        if iteration_span <= 0 or time_span <= 0:
+            return None
+
+        # 最小平方斜率 (每次迭代的 log 度量變化)
+        centered = iterations - iterations.mean()
+        slope = float(centered @ (log_measure - log_measure.mean()) / (centered @ centered))
+        latest = log_measure[(self._count - 1) % self.window]
+        if slope < 0:
+            remaining = min(math.ceil(max(latest, 0.0) / -slope), max_remaining)
+        else:
+            remaining = min(max_remaining, stalled_remaining if stalled_remaining is not None else max_remaining)
+        return remaining, remaining * time_span / iteration_span
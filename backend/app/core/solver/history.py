@@ -0,0 +1,117 @@
+"""收斂歷史 - 預先配置的 NumPy 欄位, 達上限時以對數間隔稀疏化較舊的取樣"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# 欄位名稱與型別 (pressure_iterations 為壓力修正的內迭代次數,
+# pressure_residual 為其結束時的相對殘差)
+HISTORY_COLUMNS: Dict[str, np.dtype] = {
+    "iteration": np.dtype(np.int64),
+    "residual_u": np.dtype(np.float64),
+    "residual_v": np.dtype(np.float64),
+    "continuity": np.dtype(np.float64),
+    "pressure_iterations": np.dtype(np.int32),
+    "pressure_residual": np.dtype(np.float64),
+}
+
+
+class ConvergenceHistory:
+    """
+    收斂歷史緩衝區
+
+    每 every 次外迭代取樣一次 (呼叫端另可強制記錄最後一次迭代);
+    取樣數達 max_samples 時, 依與最新取樣的距離以對數間隔保留約一半,
+    近期取樣保持完整, 越舊越稀疏, 記憶體用量固定。
+    """
+
+    def __init__(self, every: int = 10, max_samples: int = 1000):
+        self.every = every
+        self.max_samples = max_samples
+        self.length = 0
+        self._columns = {
+            name: np.zeros(max_samples, dtype=dtype) for name, dtype in HISTORY_COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return self.length
+
+    def due(self, iteration: int) -> bool:
+        """此次迭代是否為取樣點"""
+        return iteration % self.every == 0
+
+    def record(
+        self,
+        iteration: int,
+        residual_u: float,
+        residual_v: float,
+        continuity: float,
+        pressure_iterations: int,
+        pressure_residual: float
+    ) -> None:
+        """加入一筆取樣"""
+        if self.length == self.max_samples:
+            self._decimate()
+        i = self.length
+        columns = self._columns
+        columns["iteration"][i] = iteration
+        columns["residual_u"][i] = residual_u
+        columns["residual_v"][i] = residual_v
+        columns["continuity"][i] = continuity
+        columns["pressure_iterations"][i] = pressure_iterations
+        columns["pressure_residual"][i] = pressure_residual
+        self.length += 1
+
+    def columns(self, copy: bool = False) -> Dict[str, np.ndarray]:
+        """目前的取樣 (預設為緩衝區的檢視)"""
+        return {
+            name: column[:self.length].copy() if copy else column[:self.length]
+            for name, column in self._columns.items()
+        }
+
+    def last(self) -> Optional[Dict[str, float]]:
+        """最新一筆取樣"""
+        if self.length == 0:
+            return None
+        return {name: column[self.length - 1].item() for name, column in self._columns.items()}
+
+    @classmethod
+    def from_columns(
+        cls, columns: Dict[str, np.ndarray], every: int = 10, max_samples: int = 1000
+    ) -> "ConvergenceHistory":
+        """
+        由既有欄位 (如檢查點) 重建; 超過上限時只保留最新的取樣
+
+        缺少的欄位 (較舊版本的檢查點) 以 NaN 填入, 整數欄位為 0
+        """
+        history = cls(every, max_samples)
+        length = min(len(columns["iteration"]), max_samples)
+        for name, column in history._columns.items():
+            source = columns.get(name)
+            if source is None:
+                column[:length] = np.nan if column.dtype.kind == "f" else 0
+            else:
+                column[:length] = source[len(source) - length:]
+        history.length = length
+        return history
+
+    def _decimate(self) -> None:
+        """
+        以對數間隔保留約一半取樣
+
+        目標為與最新取樣相隔 (以迭代次數計) 呈等比數列的位置, 每個目標保留最接近的取樣;
+        以迭代次數而非筆數計算, 反覆稀疏化後仍涵蓋完整的迭代範圍。最舊與最新者一定保留。
+        """
+        n = self.length
+        iterations = self._columns["iteration"][:n]
+        newest = iterations[n - 1]
+        span = max(int(newest - iterations[0]), 1)
+        targets = newest - np.geomspace(1, span, num=max(n // 2 - 2, 1))
+        nearest = np.clip(np.searchsorted(iterations, targets), 1, n - 1)
+        # searchsorted 返回右側鄰居, 與左側鄰居比較取較近者
+        left_closer = targets - iterations[nearest - 1] < iterations[nearest] - targets
+        nearest = nearest - left_closer
+        keep = np.unique(np.concatenate(([0, n - 1], nearest)))
+        for column in self._columns.values():
+            column[:len(keep)] = column[keep]
+        self.length = len(keep)
@@ -0,0 +1,69 @@
+"""交錯網格流場的雙線性插值 (不同解析度之間的轉換)"""
+import numpy as np
+from typing import Tuple
+
+
+def _axis_weights(old: np.ndarray, new: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """新座標在舊座標中的左側索引與線性權重 (超出範圍時截斷至端點)"""
+    if old.size == 1:
+        return np.zeros(new.size, dtype=np.intp), np.zeros(new.size)
+    i0 = np.clip(np.searchsorted(old, new, side="right") - 1, 0, old.size - 2)
+    w = np.clip((new - old[i0]) / (old[i0 + 1] - old[i0]), 0.0, 1.0)
+    return i0, w
+
+
+def resample(
+    field: np.ndarray,
+    x_old: np.ndarray,
+    y_old: np.ndarray,
+    x_new: np.ndarray,
+    y_new: np.ndarray
+) -> np.ndarray:
+    """張量網格上的雙線性插值, field 形狀為 (len(y_old), len(x_old))"""
+    i0, wx = _axis_weights(x_old, x_new)
+    j0, wy = _axis_weights(y_old, y_new)
+    i1 = np.minimum(i0 + 1, x_old.size - 1)
+    j1 = np.minimum(j0 + 1, y_old.size - 1)
+
+    # 先沿 x 方向, 再沿 y 方向插值
+    rows = field[:, i0] * (1.0 - wx) + field[:, i1] * wx
+    return rows[j0] * (1.0 - wy)[:, None] + rows[j1] * wy[:, None]
+
+
+def staggered_coords(nx: int, ny: int) -> dict:
+    """單位方腔上各欄位的座標: p 位於節點, u 位於 x 方向面中點, v 位於 y 方向面中點"""
+    x = np.linspace(0.0, 1.0, nx)
+    y = np.linspace(0.0, 1.0, ny)
+    x_face = 0.5 * (x[:-1] + x[1:])
+    y_face = 0.5 * (y[:-1] + y[1:])
+    return {
+        "pressure": (x, y),
+        "velocity_u": (x_face, y),
+        "velocity_v": (x, y_face),
+    }
+
+
+def interpolate_state(
+    pressure: np.ndarray,
+    velocity_u: np.ndarray,
+    velocity_v: np.ndarray,
+    nx: int,
+    ny: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    將 (p, u, v) 插值到 nx x ny 的交錯網格
+
+    舊網格尺寸由 pressure 的形狀推得; 尺寸相同時直接複製
+    """
+    old_ny, old_nx = pressure.shape
+    if (old_nx, old_ny) == (nx, ny):
+        return pressure.copy(), velocity_u.copy(), velocity_v.copy()
+
+    old = staggered_coords(old_nx, old_ny)
+    new = staggered_coords(nx, ny)
+    fields = {"pressure": pressure, "velocity_u": velocity_u, "velocity_v": velocity_v}
+    p, u, v = (
+        resample(np.asarray(fields[key], dtype=float), *old[key], *new[key])
+        for key in ("pressure", "velocity_u", "velocity_v")
+    )
+    return p, u, v
@@ -0,0 +1,243 @@
+"""動量方程式 (速度預測) 組裝
+
+以整體陣列切片一次計算所有 u/v 面的迎風係數與預測速度,
+取代逐點的 Python 雙重迴圈; 中間量寫入 MomentumScratch, 迭代期間不配置新陣列。
+
+a_P 與 Σa_nb 以完整的面陣列返回 (u: NY x (NX-1), v: (NY-1) x NX),
+壁面上的值沿用相鄰內部面, 供壓力修正方程式在邊界處使用。
+"""
+import numpy as np
+from typing import Optional, Tuple
+
+
+# SIMPLEC d 因子分母相對於 a_P 的下限
+D_FLOOR = 0.05
+
+
+class MomentumScratch:
+    """單一速度分量組裝用的暫存陣列 (內部面形狀), 由工作區持有"""
+
+    def __init__(self, shape: Tuple[int, int]):
+        self.conv = np.zeros(shape)       # 單一方向的對流通量
+        self.flux = np.zeros(shape)       # 淨流出對流通量 (E - W + N - S)
+        self.a_nb = np.zeros(shape)       # 單一方向的鄰點係數
+        self.numerator = np.zeros(shape)
+        self.work = np.zeros(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in vars(self).values())
+
+
+def _fill_walls(faces: np.ndarray) -> np.ndarray:
+    """壁面上的係數沿用相鄰內部面"""
+    faces[1:-1, 0] = faces[1:-1, 1]
+    faces[1:-1, -1] = faces[1:-1, -2]
+    faces[0, :] = faces[1, :]
+    faces[-1, :] = faces[-2, :]
+    return faces
+
+
+def _assemble(
+    phi: np.ndarray,
+    conv_pairs: Tuple,
+    neighbours: Tuple,
+    pressure_pair: Tuple[np.ndarray, np.ndarray],
+    area: float,
+    rho: float,
+    mu: float,
+    dx: float,
+    dy: float,
+    alpha_u: float,
+    star: np.ndarray,
+    a_P: np.ndarray,
+    a_nb: np.ndarray,
+    scratch: MomentumScratch
+) -> None:
+    """
+    組裝並求解一個速度分量的動量方程式 (一階迎風), 全部寫入既有陣列
+
+    參數:
+        phi: 目前迭代值 (內部面)
+        conv_pairs: E、W、N、S 各面對流速度的兩個取樣點
+        neighbours: E、W、N、S 鄰點的速度
+        pressure_pair: 壓力梯度項的 (上游, 下游) 壓力
+        star: 預測速度 (內部面), a_P/a_nb: 係數 (內部面)
+    """
+    # (對流通量係數, 擴散係數, 迎風方向): E、N 為流出面, W、S 為流入面
+    faces = (
+        (0.5 * rho * dy, mu * dy / dx, -1.0),
+        (0.5 * rho * dy, mu * dy / dx, 1.0),
+        (0.5 * rho * dx, mu * dx / dy, -1.0),
+        (0.5 * rho * dx, mu * dx / dy, 1.0),
+    )
+    conv, flux, a, numerator, work = (
+        scratch.conv, scratch.flux, scratch.a_nb, scratch.numerator, scratch.work
+    )
+
+    # 壓力梯度項
+    np.subtract(pressure_pair[0], pressure_pair[1], out=numerator)
+    numerator *= area
+
+    a_nb.fill(0.0)
+    flux.fill(0.0)
+    for (left, right), neighbour, (scale, diffusion, upwind) in zip(conv_pairs, neighbours, faces):
+        np.add(left, right, out=conv)
+        conv *= scale
+        if upwind < 0:
+            flux += conv
+        else:
+            flux -= conv
+
+        # 係數 (擴散 + 迎風)
+        np.multiply(conv, upwind, out=a)
+        np.maximum(a, 0.0, out=a)
+        a += diffusion
+        a_nb += a
+        np.multiply(a, neighbour, out=work)
+        numerator += work
+
+    # 中心點係數與鬆弛後的預測速度
+    np.add(a_nb, flux, out=a_P)
+    numerator /= a_P
+    numerator *= alpha_u
+    np.multiply(phi, 1 - alpha_u, out=work)
+    np.add(work, numerator, out=star)
+
+
+def predict_u(
+    u: np.ndarray,
+    v: np.ndarray,
+    p: np.ndarray,
+    u_star: np.ndarray,
+    rho: float,
+    mu: float,
+    dx: float,
+    dy: float,
+    alpha_u: float,
+    a_P_out: Optional[np.ndarray] = None,
+    a_nb_out: Optional[np.ndarray] = None,
+    scratch: Optional[MomentumScratch] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    求解 u-動量方程式 (一階迎風), 將預測速度寫入 u_star 內部點
+
+    返回:
+        (a_P, Σa_nb), 形狀與 u 相同; 提供 a_P_out/a_nb_out 時原地寫入,
+        提供 scratch 時不配置新陣列
+    """
+    NY, NX = p.shape
+    J = slice(1, NY - 1)
+    I = slice(1, NX - 2)
+    a_P = a_P_out if a_P_out is not None else np.zeros_like(u)
+    a_nb = a_nb_out if a_nb_out is not None else np.zeros_like(u)
+    if scratch is None:
+        scratch = MomentumScratch((NY - 2, NX - 3))
+
+    _assemble(
+        u[J, I],
+        (
+            (u[J, I], u[J, 2:NX - 1]),
+            (u[J, 0:NX - 3], u[J, I]),
+            (v[J, 1:NX - 2], v[J, 2:NX - 1]),
+            (v[0:NY - 2, 1:NX - 2], v[0:NY - 2, 2:NX - 1]),
+        ),
+        (u[J, 2:NX - 1], u[J, 0:NX - 3], u[2:NY, I], u[0:NY - 2, I]),
+        (p[J, 1:NX - 2], p[J, 2:NX - 1]),
+        dy, rho, mu, dx, dy, alpha_u,
+        u_star[J, I], a_P[J, I], a_nb[J, I], scratch
+    )
+    return _fill_walls(a_P), _fill_walls(a_nb)
+
+
+def predict_v(
+    u: np.ndarray,
+    v: np.ndarray,
+    p: np.ndarray,
+    v_star: np.ndarray,
+    rho: float,
+    mu: float,
+    dx: float,
+    dy: float,
+    alpha_u: float,
+    a_P_out: Optional[np.ndarray] = None,
+    a_nb_out: Optional[np.ndarray] = None,
+    scratch: Optional[MomentumScratch] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    求解 v-動量方程式 (一階迎風), 將預測速度寫入 v_star 內部點
+
+    返回:
+        (a_P, Σa_nb), 形狀與 v 相同; 提供 a_P_out/a_nb_out 時原地寫入,
+        提供 scratch 時不配置新陣列
+    """
+    NY, NX = p.shape
+    J = slice(1, NY - 2)
+    I = slice(1, NX - 1)
+    a_P = a_P_out if a_P_out is not None else np.zeros_like(v)
+    a_nb = a_nb_out if a_nb_out is not None else np.zeros_like(v)
+    if scratch is None:
+        scratch = MomentumScratch((NY - 3, NX - 2))
+
+    _assemble(
+        v[J, I],
+        (
+            (u[J, I], u[2:NY - 1, I]),
+            (u[J, 0:NX - 2], u[2:NY - 1, 0:NX - 2]),
+            (v[J, I], v[2:NY - 1, I]),
+            (v[0:NY - 3, I], v[J, I]),
+        ),
+        (v[J, 2:NX], v[J, 0:NX - 2], v[2:NY - 1, I], v[0:NY - 3, I]),
+        (p[J, I], p[2:NY - 1, I]),
+        dx, rho, mu, dx, dy, alpha_u,
+        v_star[J, I], a_P[J, I], a_nb[J, I], scratch
+    )
+    return _fill_walls(a_P), _fill_walls(a_nb)
+
+
+def predict_velocity(
+    u: np.ndarray,
+    v: np.ndarray,
+    p: np.ndarray,
+    u_star: np.ndarray,
+    v_star: np.ndarray,
+    rho: float,
+    mu: float,
+    dx: float,
+    dy: float,
+    alpha_u: float,
+    a_P_u: Optional[np.ndarray] = None,
+    a_nb_u: Optional[np.ndarray] = None,
+    a_P_v: Optional[np.ndarray] = None,
+    a_nb_v: Optional[np.ndarray] = None,
+    scratch_u: Optional[MomentumScratch] = None,
+    scratch_v: Optional[MomentumScratch] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """速度預測 (步驟 A), 返回 (a_P_u, Σa_nb_u, a_P_v, Σa_nb_v)"""
+    a_P_u, a_nb_u = predict_u(u, v, p, u_star, rho, mu, dx, dy, alpha_u, a_P_u, a_nb_u, scratch_u)
+    a_P_v, a_nb_v = predict_v(u, v, p, v_star, rho, mu, dx, dy, alpha_u, a_P_v, a_nb_v, scratch_v)
+    return a_P_u, a_nb_u, a_P_v, a_nb_v
+
+
+def simplec_d(
+    a_P: np.ndarray,
+    a_nb: np.ndarray,
+    area: float,
+    alpha_u: float,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    SIMPLEC 的 d 因子 d = α·A / (a_P − α·Σa_nb)
+
+    由鬆弛後的動量方程式 (a_P/α) u = Σa_nb u_nb + ... 推得。
+    分母下限為 D_FLOOR·a_P, 避免 α 接近 1 時分母趨近於零。
+    """
+    # 分母寫成 a_P·max(1 − α·Σa_nb/a_P, D_FLOOR), 只使用 out
+    out = np.divide(a_nb, a_P, out=out)
+    out *= -alpha_u
+    out += 1.0
+    np.maximum(out, D_FLOOR, out=out)
+    out *= a_P
+    np.divide(alpha_u * area, out, out=out)
+    return out
+
@@ -0,0 +1,237 @@
+"""壓力修正方程式的幾何多重網格求解器"""
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from .pressure import PressureOperator, PressureSolver, red_black_sweep
+
+
+# 最粗網格的未知數上限 (改以直接法求解)
+COARSEST_SIZE = 16
+
+
+def coarse_shape(shape: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    粗網格的內部點數
+
+    細網格內部點 2I+1 (含邊界的節點編號 2I+2) 即粗網格內部點 I;
+    含邊界節點數為偶數時, 最後一個粗網格間距只有一個細網格間距。
+    """
+    return shape[0] // 2, shape[1] // 2
+
+
+def _prolong_axis(padded: np.ndarray, out: np.ndarray) -> None:
+    """沿第 0 軸線性內插: padded 為前後各補一列零邊界的粗網格值"""
+    out[1::2] = padded[1:-1]
+    even = out[0::2]
+    n = even.shape[0]
+    np.add(padded[:n], padded[1:n + 1], out=even)
+    even *= 0.5
+
+
+def _restrict_axis(fine: np.ndarray, out: np.ndarray) -> None:
+    """沿第 0 軸的內插轉置: out[I] = fine[2I+1] + (fine[2I] + fine[2I+2]) / 2"""
+    n = out.shape[0]
+    out[...] = fine[0:2 * n:2]
+    following = fine[2::2][:n]
+    out[:following.shape[0]] += following
+    out *= 0.5
+    out += fine[1::2]
+
+
+def prolong(coarse_padded: np.ndarray, work_padded: np.ndarray, out: np.ndarray) -> None:
+    """
+    雙線性延拓 e = P e_c
+
+    coarse_padded 為含一圈零邊界的粗網格值 (NYc+2, NXc+2),
+    work_padded 為 (NY, NXc+2) 的暫存 (首末兩行維持為零)。
+    """
+    _prolong_axis(coarse_padded[:, 1:-1], work_padded[:, 1:-1])
+    _prolong_axis(work_padded.T, out.T)
+
+
+def restrict(fine: np.ndarray, work: np.ndarray, out: np.ndarray) -> None:
+    """全加權限制 r_c = P^T r (work 為 (NY, NXc) 的暫存)"""
+    _restrict_axis(fine.T, work.T)
+    _restrict_axis(work, out)
+
+
+def _coarsen_faces(faces: np.ndarray, series: np.ndarray, out: np.ndarray) -> None:
+    """
+    由細網格面係數計算粗網格面係數 (面與第 1 軸垂直)
+
+    沿第 1 軸相鄰的兩個細網格面串聯 (a·b / (a + b)), 橫向以 (1/2, 1, 1/2) 加權合併
+    粗網格控制體積涵蓋的三列; 常係數時與在粗網格重新離散化的係數相同。
+    """
+    a = faces[:, 0::2]
+    b = faces[:, 1::2]
+    k = b.shape[1]
+    # 最後一個粗網格間距只有一個細網格面時直接沿用
+    series[:, k:] = a[:, k:]
+    np.add(a[:, :k], b, out=series[:, :k])
+    np.divide(b, series[:, :k], out=series[:, :k])
+    series[:, :k] *= a[:, :k]
+
+    n = out.shape[0]
+    out[...] = series[0:2 * n:2]
+    following = series[2::2][:n]
+    out[:following.shape[0]] += following
+    out *= 0.5
+    out += series[1::2]
+
+
+class _Level:
+    """單一網格層的運算子、面係數與暫存 (結構建立一次, 每次求解只更新數值)"""
+
+    def __init__(self, shape: Tuple[int, int], op: Optional[PressureOperator] = None):
+        ny, nx = shape
+        self.shape = shape
+        self.op = op if op is not None else PressureOperator.empty(shape)
+
+        # 含壁面的面係數: x 方向 (NY, NX+1), y 方向 (NY+1, NX)
+        self.faces_x = np.zeros((ny, nx + 1))
+        self.faces_y = np.zeros((ny + 1, nx))
+
+        # 粗網格層的解含一圈零邊界 (延拓時直接使用), 細網格層的 x、b 由呼叫端提供
+        self.x_padded = np.zeros((ny + 2, nx + 2))
+        self.x = self.x_padded[1:-1, 1:-1]
+        self.b = np.zeros(shape)
+        self.r = np.zeros(shape)
+        self.correction = np.zeros(shape)
+
+        # 最粗層的直接解
+        self.inverse: Optional[np.ndarray] = None
+
+    def load_faces(self) -> None:
+        """由運算子係數 (含已移除的壁面耦合) 填入面係數"""
+        op = self.op
+        self.faces_x[:, 1:-1] = op.a_E[:, :-1]
+        self.faces_x[:, 0] = op.wall_W
+        self.faces_x[:, -1] = op.wall_E
+        self.faces_y[1:-1, :] = op.a_N[:-1, :]
+        self.faces_y[0, :] = op.wall_S
+        self.faces_y[-1, :] = op.wall_N
+
+    def store_faces(self) -> None:
+        """以面係數更新運算子"""
+        op = self.op
+        op.a_E[...] = self.faces_x[:, 1:]
+        op.a_W[...] = self.faces_x[:, :-1]
+        op.a_N[...] = self.faces_y[1:, :]
+        op.a_S[...] = self.faces_y[:-1, :]
+        op.refresh()
+
+
+class _Transfer:
+    """相鄰兩層之間的延拓、限制與面係數暫存"""
+
+    def __init__(self, fine: Tuple[int, int], coarse: Tuple[int, int]):
+        ny, nx = fine
+        nyc, nxc = coarse
+        self.work_padded = np.zeros((ny, nxc + 2))
+        self.work = self.work_padded[:, 1:-1]
+        self.series_x = np.zeros((ny, nxc + 1))
+        self.series_y = np.zeros((nx, nyc + 1))
+
+
+class MultigridSolver(PressureSolver):
+    """
+    幾何多重網格 (V/W 循環)
+
+    雙線性延拓、全加權限制 (延拓的轉置), 紅黑高斯-賽德爾平滑;
+    粗網格運算子由細網格面係數串聯/加權平均重新離散化, 各層皆為五點模板,
+    最粗層以直接法求解。網格階層 (各層形狀與暫存陣列) 於第一次求解時建立,
+    之後每次外迭代只更新係數。
+    """
+
+    name = "multigrid"
+
+    def __init__(
+        self,
+        cycle: str = "V",
+        tolerance: float = 1e-3,
+        max_cycles: int = 50,
+        pre_sweeps: int = 2,
+        post_sweeps: int = 2
+    ):
+        if cycle not in ("V", "W"):
+            raise ValueError(f"未知的多重網格循環: {cycle}")
+        self.gamma = 1 if cycle == "V" else 2
+        self.tolerance = tolerance
+        self.max_cycles = max_cycles
+        self.pre_sweeps = pre_sweeps
+        self.post_sweeps = post_sweeps
+        self._levels: List[_Level] = []
+        self._transfers: List[_Transfer] = []
+
+    def _build(self, op: PressureOperator) -> None:
+        """建立網格階層"""
+        levels = [_Level(op.shape, op)]
+        while levels[-1].op.a_P.size > COARSEST_SIZE and min(levels[-1].shape) >= 2:
+            levels.append(_Level(coarse_shape(levels[-1].shape)))
+        self._levels = levels
+        self._transfers = [
+            _Transfer(fine.shape, coarse.shape) for fine, coarse in zip(levels, levels[1:])
+        ]
+
+    def setup(self, op: PressureOperator) -> List[_Level]:
+        """依細網格係數更新各層運算子 (第一次或網格改變時建立階層)"""
+        if not self._levels or self._levels[0].shape != op.shape:
+            self._build(op)
+        levels = self._levels
+        levels[0].op = op
+        levels[0].load_faces()
+        for fine, coarse, transfer in zip(levels, levels[1:], self._transfers):
+            _coarsen_faces(fine.faces_x, transfer.series_x, coarse.faces_x)
+            _coarsen_faces(fine.faces_y.T, transfer.series_y, coarse.faces_y.T)
+            coarse.store_faces()
+
+        coarsest = levels[-1]
+        coarsest.inverse = np.linalg.inv(coarsest.op.to_dense())
+        return levels
+
+    def _cycle(self, level: int, x: np.ndarray, b: np.ndarray) -> None:
+        current = self._levels[level]
+        op = current.op
+        if level == len(self._levels) - 1:
+            x[...] = (current.inverse @ b.ravel()).reshape(current.shape)
+            return
+
+        coarse = self._levels[level + 1]
+        transfer = self._transfers[level]
+        for _ in range(self.pre_sweeps):
+            red_black_sweep(op, x, b)
+
+        for _ in range(self.gamma):
+            op.residual(x, b, out=current.r)
+            restrict(current.r, transfer.work, coarse.b)
+            coarse.x.fill(0.0)
+            self._cycle(level + 1, coarse.x, coarse.b)
+            prolong(coarse.x_padded, transfer.work_padded, current.correction)
+            x += current.correction
+
+        for _ in range(self.post_sweeps):
+            red_black_sweep(op, x, b)
+
+    def solve(self, op: PressureOperator, b: np.ndarray, x: np.ndarray) -> Dict:
+        """
+        求解 A x = b (原地更新 x), 以相對殘差 ||r|| / ||r0|| 判斷收斂
+
+        返回:
+            {iterations, residual}
+        """
+        levels = self.setup(op)
+        r = levels[0].r
+        r0 = np.linalg.norm(op.residual(x, b, out=r))
+        if r0 == 0.0:
+            return {"iterations": 0, "residual": 0.0}
+
+        cycles = 0
+        rel = 1.0
+        while cycles < self.max_cycles:
+            self._cycle(0, x, b)
+            cycles += 1
+            rel = float(np.linalg.norm(op.residual(x, b, out=r)) / r0)
+            if rel < self.tolerance:
+                break
+
+        return {"iterations": cycles, "residual": rel}
@@ -0,0 +1,242 @@
+"""壓力修正方程式的五點模板運算子
+
+內部壓力點 (j=1..NY-2, i=1..NX-2) 上的離散方程式:
+
+    a_P p'_P = a_E p'_E + a_W p'_W + a_N p'_N + a_S p'_S + b
+
+邊界點 p' 固定為 0, 因此與邊界的耦合只出現在 a_P 中。
+"""
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+class PressureOperator:
+    """壓力修正方程式 A p' = b 的無矩陣 (matrix-free) 表示"""
+
+    def __init__(
+        self,
+        a_E: np.ndarray,
+        a_W: np.ndarray,
+        a_N: np.ndarray,
+        a_S: np.ndarray,
+        a_P: Optional[np.ndarray] = None
+    ):
+        """
+        參數:
+            a_E, a_W, a_N, a_S: 內部點的鄰點係數, 形狀 (NY-2, NX-2)
+            a_P: 中心係數, 省略時為鄰點係數總和
+        """
+        if a_P is None:
+            a_P = a_E + a_W + a_N + a_S
+        self.a_P = a_P
+
+        # 與邊界 (p'=0) 的耦合不參與鄰點運算
+        self.a_E = a_E.copy()
+        self.a_W = a_W.copy()
+        self.a_N = a_N.copy()
+        self.a_S = a_S.copy()
+        self._allocate_buffers()
+        self._drop_boundary_coupling()
+
+    @classmethod
+    def empty(cls, shape) -> "PressureOperator":
+        """建立係數全為零的運算子, 供 refresh() 原地填入"""
+        op = cls.__new__(cls)
+        op.a_P = np.zeros(shape)
+        op.a_E = np.zeros(shape)
+        op.a_W = np.zeros(shape)
+        op.a_N = np.zeros(shape)
+        op.a_S = np.zeros(shape)
+        op._allocate_buffers()
+        return op
+
+    def _allocate_buffers(self) -> None:
+        """與邊界耦合的係數 (多重網格建立粗網格係數時使用) 與運算用暫存"""
+        ny, nx = self.a_P.shape
+        self.wall_E = np.zeros(ny)
+        self.wall_W = np.zeros(ny)
+        self.wall_N = np.zeros(nx)
+        self.wall_S = np.zeros(nx)
+
+        self._work = np.zeros((ny, nx))
+        # 紅黑掃描: 含一圈零邊界的解與單一子格點大小的暫存
+        self._padded = np.zeros((ny + 2, nx + 2))
+        self._sub_acc = np.zeros(((ny + 1) // 2, (nx + 1) // 2))
+        self._sub_work = np.zeros_like(self._sub_acc)
+
+    def refresh(self) -> None:
+        """
+        鄰點係數已原地寫入 a_E/a_W/a_N/a_S 後呼叫:
+        重新計算 a_P 並移除與邊界的耦合
+        """
+        np.add(self.a_E, self.a_W, out=self.a_P)
+        self.a_P += self.a_N
+        self.a_P += self.a_S
+        self._drop_boundary_coupling()
+
+    def reset(self) -> None:
+        for a in (self.a_P, self.a_E, self.a_W, self.a_N, self.a_S,
+                  self.wall_E, self.wall_W, self.wall_N, self.wall_S):
+            a.fill(0.0)
+
+    def _drop_boundary_coupling(self) -> None:
+        self.wall_E[...] = self.a_E[:, -1]
+        self.wall_W[...] = self.a_W[:, 0]
+        self.wall_N[...] = self.a_N[-1, :]
+        self.wall_S[...] = self.a_S[0, :]
+        self.a_E[:, -1] = 0.0
+        self.a_W[:, 0] = 0.0
+        self.a_N[-1, :] = 0.0
+        self.a_S[0, :] = 0.0
+
+    @property
+    def shape(self):
+        return self.a_P.shape
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in vars(self).values() if isinstance(a, np.ndarray))
+
+    def neighbour_sum(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """計算 Σ a_nb x_nb"""
+        if out is None:
+            out = np.empty_like(x)
+        work = self._work
+        np.multiply(self.a_E[:, :-1], x[:, 1:], out=out[:, :-1])
+        out[:, -1] = 0.0
+        np.multiply(self.a_W[:, 1:], x[:, :-1], out=work[:, 1:])
+        out[:, 1:] += work[:, 1:]
+        np.multiply(self.a_N[:-1, :], x[1:, :], out=work[:-1, :])
+        out[:-1, :] += work[:-1, :]
+        np.multiply(self.a_S[1:, :], x[:-1, :], out=work[1:, :])
+        out[1:, :] += work[1:, :]
+        return out
+
+    def apply(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """計算 A x"""
+        out = self.neighbour_sum(x, out)
+        np.multiply(self.a_P, x, out=self._work)
+        np.subtract(self._work, out, out=out)
+        return out
+
+    def residual(self, x: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """計算 r = b - A x"""
+        out = self.apply(x, out)
+        np.subtract(b, out, out=out)
+        return out
+
+    def to_dense(self) -> np.ndarray:
+        """組成稠密矩陣 (僅用於最粗網格的直接求解)"""
+        n = self.a_P.size
+        matrix = np.zeros((n, n))
+        basis = np.zeros(n)
+        for k in range(n):
+            basis[k] = 1.0
+            matrix[:, k] = self.apply(basis.reshape(self.shape)).ravel()
+            basis[k] = 0.0
+        return matrix
+
+
+# 紅黑著色 ((i + j) 為偶數者為紅)
+RED = 0
+BLACK = 1
+
+
+@lru_cache(maxsize=32)
+def _sublattices(shape: Tuple[int, int]) -> Tuple[Tuple, Tuple]:
+    """
+    紅、黑兩色各由兩組 (j, i) 奇偶性相同的子格點組成; 每組返回
+    (子格點形狀, 係數切片, 以及含零邊界陣列中的 中心/東/西/北/南 切片)
+    """
+    ny, nx = shape
+    colors = []
+    for parity in (RED, BLACK):
+        groups = []
+        for sj in (0, 1):
+            si = (sj + parity) % 2
+            rows = slice(1 + sj, ny + 1, 2)
+            cols = slice(1 + si, nx + 1, 2)
+            groups.append((
+                (len(range(sj, ny, 2)), len(range(si, nx, 2))),
+                (slice(sj, ny, 2), slice(si, nx, 2)),
+                (rows, cols),
+                (rows, slice(2 + si, nx + 2, 2)),
+                (rows, slice(si, nx, 2)),
+                (slice(2 + sj, ny + 2, 2), cols),
+                (slice(sj, ny, 2), cols),
+            ))
+        colors.append(tuple(groups))
+    return tuple(colors)
+
+
+def relax_colors(
+    op: PressureOperator,
+    x: np.ndarray,
+    b: np.ndarray,
+    schedule: Tuple[Tuple[int, float], ...]
+) -> None:
+    """
+    依 schedule 的 (顏色, 鬆弛因子) 依序鬆弛 (原地更新 x)
+
+    同色點互不耦合; 每種顏色由兩組等間隔子格點組成, 在含零邊界的暫存上
+    以步長 2 的切片更新, 不配置新陣列。
+    """
+    padded = op._padded
+    padded[1:-1, 1:-1] = x
+    for color, omega in schedule:
+        for sub_shape, coef, center, east, west, north, south in _sublattices(op.shape)[color]:
+            acc = op._sub_acc[:sub_shape[0], :sub_shape[1]]
+            work = op._sub_work[:sub_shape[0], :sub_shape[1]]
+            np.multiply(op.a_E[coef], padded[east], out=acc)
+            np.multiply(op.a_W[coef], padded[west], out=work)
+            acc += work
+            np.multiply(op.a_N[coef], padded[north], out=work)
+            acc += work
+            np.multiply(op.a_S[coef], padded[south], out=work)
+            acc += work
+            acc += b[coef]
+            acc /= op.a_P[coef]
+            if omega == 1.0:
+                padded[center] = acc
+            else:
+                target = padded[center]
+                acc -= target
+                acc *= omega
+                target += acc
+    x[...] = padded[1:-1, 1:-1]
+
+
+def red_black_sweep(
+    op: PressureOperator,
+    x: np.ndarray,
+    b: np.ndarray,
+    omega: float = 1.0
+) -> None:
+    """
+    紅黑排序 SOR 迭代一次 (原地更新 x)
+
+    同色點互不耦合, 因此每種顏色可以整體陣列一次更新; omega=1 即高斯-賽德爾。
+    """
+    relax_colors(op, x, b, ((RED, omega), (BLACK, omega)))
+
+
+class PressureSolver:
+    """
+    壓力修正求解器介面
+
+    子類別實作 solve(), 原地更新 x 並返回
+    {iterations, residual}, 其中 residual 為結束時相對於初始殘差的比值。
+    """
+
+    name = "base"
+    _scratch: Tuple[np.ndarray, ...] = ()
+
+    def scratch(self, shape: Tuple[int, int], count: int) -> Tuple[np.ndarray, ...]:
+        """求解器持有的暫存陣列 (同一網格的外迭代間重複使用, 形狀改變時重新配置)"""
+        if len(self._scratch) < count or self._scratch[0].shape != tuple(shape):
+            self._scratch = tuple(np.empty(shape) for _ in range(count))
+        return self._scratch[:count]
+
+    def solve(self, op: PressureOperator, b: np.ndarray, x: np.ndarray) -> Dict:
+        raise NotImplementedError
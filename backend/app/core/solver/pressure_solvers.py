@@ -0,0 +1,140 @@
+"""壓力修正方程式求解器 (紅黑 SOR、預條件共軛梯度) 與選擇工廠"""
+import numpy as np
+from typing import Dict
+
+from app.models.simulation import SimulationParameters
+from .multigrid import MultigridSolver
+from .pressure import BLACK, RED, PressureOperator, PressureSolver, red_black_sweep, relax_colors
+
+
+class RedBlackSORSolver(PressureSolver):
+    """
+    紅黑排序 SOR 迭代
+
+    每次迭代後檢查相對殘差, 降至 tolerance 以下或達到 max_iter 即停止。
+    收斂時與逐點高斯-賽德爾具有相同的解 (同一線性系統)。
+    """
+
+    name = "sor"
+
+    def __init__(self, omega: float = 1.0, tolerance: float = 1e-3, max_iter: int = 50):
+        if not 0.0 < omega < 2.0:
+            raise ValueError(f"SOR 鬆弛因子須介於 0 與 2 之間: {omega}")
+        self.omega = omega
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+
+    def solve(self, op: PressureOperator, b: np.ndarray, x: np.ndarray) -> Dict:
+        r, = self.scratch(x.shape, 1)
+        r0 = np.linalg.norm(op.residual(x, b, out=r))
+        if r0 == 0.0:
+            return {"iterations": 0, "residual": 0.0}
+
+        iterations = 0
+        rel = 1.0
+        while iterations < self.max_iter:
+            red_black_sweep(op, x, b, self.omega)
+            iterations += 1
+            rel = float(np.linalg.norm(op.residual(x, b, out=r)) / r0)
+            if rel < self.tolerance:
+                break
+
+        return {"iterations": iterations, "residual": rel}
+
+
+class ConjugateGradientSolver(PressureSolver):
+    """
+    無矩陣預條件共軛梯度法
+
+    預條件子:
+        jacobi: z = r / a_P
+        ssor:   紅黑排序的對稱 SOR 掃描一次 (由 z=0 開始), 保持預條件子對稱正定
+    """
+
+    name = "pcg"
+
+    def __init__(
+        self,
+        preconditioner: str = "jacobi",
+        tolerance: float = 1e-3,
+        max_iter: int = 50,
+        omega: float = 1.0
+    ):
+        if preconditioner not in ("jacobi", "ssor"):
+            raise ValueError(f"未知的預條件子: {preconditioner}")
+        if not 0.0 < omega < 2.0:
+            raise ValueError(f"SSOR 鬆弛因子須介於 0 與 2 之間: {omega}")
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+        self.omega = omega
+
+    def _precondition(self, op: PressureOperator, r: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """z = M^-1 r (原地寫入 z)"""
+        if self.preconditioner == "jacobi":
+            return np.divide(r, op.a_P, out=z)
+
+        # 前向 (紅 -> 黑) 與反向 (黑 -> 紅) 掃描; 黑點由 z=0 開始且兩次掃描之間鄰點不變,
+        # 兩次鬆弛合併為一次, 等效鬆弛因子為 ω(2-ω)
+        omega = self.omega
+        z.fill(0.0)
+        relax_colors(op, z, r, ((RED, omega), (BLACK, omega * (2.0 - omega)), (RED, omega)))
+        return z
+
+    def solve(self, op: PressureOperator, b: np.ndarray, x: np.ndarray) -> Dict:
+        r, z, d, Ad = self.scratch(x.shape, 4)
+        r0 = np.linalg.norm(op.residual(x, b, out=r))
+        if r0 == 0.0:
+            return {"iterations": 0, "residual": 0.0}
+
+        self._precondition(op, r, z)
+        d[...] = z
+        rz = np.vdot(r, z)
+
+        iterations = 0
+        rel = 1.0
+        while iterations < self.max_iter:
+            op.apply(d, out=Ad)
+            step = rz / np.vdot(d, Ad)
+            # z 在下次預條件前僅作暫存
+            np.multiply(d, step, out=z)
+            x += z
+            np.multiply(Ad, step, out=z)
+            r -= z
+
+            iterations += 1
+            rel = float(np.linalg.norm(r) / r0)
+            if rel < self.tolerance:
+                break
+
+            self._precondition(op, r, z)
+            rz_new = np.vdot(r, z)
+            d *= rz_new / rz
+            d += z
+            rz = rz_new
+
+        return {"iterations": iterations, "residual": rel}
+
+
+def create_pressure_solver(parameters: SimulationParameters) -> PressureSolver:
+    """依模擬參數建立壓力修正求解器"""
+    if parameters.pressure_solver == "multigrid":
+        return MultigridSolver(
+            cycle=parameters.multigrid_cycle,
+            tolerance=parameters.pressure_tolerance,
+            max_cycles=parameters.pressure_max_cycles
+        )
+    if parameters.pressure_solver == "pcg":
+        return ConjugateGradientSolver(
+            preconditioner=parameters.pcg_preconditioner,
+            tolerance=parameters.pressure_tolerance,
+            max_iter=parameters.pressure_max_cycles,
+            omega=parameters.sor_omega
+        )
+    # gauss_seidel 即 omega=1 的紅黑 SOR
+    omega = parameters.sor_omega if parameters.pressure_solver == "sor" else 1.0
+    return RedBlackSORSolver(
+        omega=omega,
+        tolerance=parameters.pressure_tolerance,
+        max_iter=parameters.pressure_max_cycles
+    )
@@ -0,0 +1,22 @@
+"""網格序列 (由粗到細) 的層級與各層收斂標準"""
+from typing import List, Tuple
+
+
+def grid_levels(nx: int, ny: int, coarsest: int) -> List[Tuple[int, int]]:
+    """
+    由粗到細的網格尺寸, 最後一層為 (nx, ny)
+
+    每層點數約為下一層的一半 ((n - 1) // 2 + 1, 節點對齊), 直到任一方向小於 coarsest
+    """
+    levels = [(nx, ny)]
+    while True:
+        cx, cy = (levels[0][0] - 1) // 2 + 1, (levels[0][1] - 1) // 2 + 1
+        if min(cx, cy) < coarsest:
+            break
+        levels.insert(0, (cx, cy))
+    return levels
+
+
+def level_tolerance(tolerance: float, factor: float, depth: int, cap: float = 0.1) -> float:
+    """比最細層粗 depth 層的收斂標準 (每層放寬 factor 倍, 不超過 cap)"""
+    return min(tolerance * factor ** depth, max(cap, tolerance))
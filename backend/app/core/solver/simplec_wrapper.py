@@ -1,23 +1,203 @@
 """SIMPLEC 求解器包裝器"""
 import numpy as np
 import time
-from typing import Dict, Optional, Callable, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from app.models.simulation import SimulationParameters
+from .anderson import AndersonAccelerator
+from .checkpoint import Checkpointer
+from .convergence import OUTCOME_CONVERGED, OUTCOME_MAX_ITER, ConvergenceMonitor, EtaEstimator
+from .history import ConvergenceHistory
+from .interpolation import interpolate_state
+from .momentum import predict_velocity, simplec_d
+from .pressure_solvers import create_pressure_solver
+from .sequencing import grid_levels, level_tolerance
+from .snapshot import SnapshotEmitter
+from .workspace import SolverWorkspace, workspace_pool
+
+
+# 結果中以陣列表示的欄位
+FIELD_KEYS = ("pressure", "velocity_u", "velocity_v", "x_coords", "y_coords")
+
+
+class SolverCancelled(Exception):
+    """求解過程中收到取消要求"""
+
+    def __init__(self, iteration: int):
+        super().__init__(iteration)
+        self.iteration = iteration
+
+    def __str__(self) -> str:
+        return f"求解已於第 {self.iteration} 次迭代取消"
 
 
 def solve_cavity_flow(
     parameters: SimulationParameters,
-    progress_callback: Optional[Callable[[Dict], None]] = None
+    progress_callback: Optional[Callable[[Dict], None]] = None,
+    workspace: Optional[SolverWorkspace] = None,
+    as_arrays: bool = False,
+    cancel_event: Optional[Any] = None,
+    initial_state: Optional[Dict] = None,
+    checkpointer: Optional[Checkpointer] = None,
+    snapshots: Optional[SnapshotEmitter] = None
 ) -> Dict:
     """
     使用 SIMPLEC 演算法求解蓋驅動方腔流
 
     參數:
         parameters: 模擬參數
-        progress_callback: 進度回調函式,接收 {iteration, residual_u, residual_v, elapsed_time}
+        progress_callback: 進度回調函式,接收 {iteration, residual_u, residual_v, continuity, elapsed_time,
+            estimated_iterations, estimated_remaining}
+        workspace: 預先配置的工作區 (求解前清除); 省略時由 workspace_pool 取得並於結束後歸還
+        as_arrays: 為 True 時流場、座標與收斂歷史欄位以 ndarray 返回, 否則轉為 list
+        cancel_event: 取消旗標 (具有 is_set() 的物件, 如 threading.Event),
+            於每次外迭代開始時檢查, 已設定時拋出 SolverCancelled
+        initial_state: 暖啟動的初始流場 {pressure, velocity_u, velocity_v, lid_velocity},
+            可為任意解析度, 插值到本次網格後作為起始值; 省略時由零場開始
+        checkpointer: 檢查點寫入器; 檢查點存在時由其續算 (忽略 initial_state),
+            迭代期間定期寫入, 取消時也會寫入目前進度
+        snapshots: 快照產生器; 啟用時定期送出降採樣的流場
+
+    parameters.grid_sequencing 為 True 時先在較粗的網格依序收斂 (各層收斂標準較寬),
+    再以插值結果作為下一層的初始流場; 進度訊息附上 level (0 起算)、levels 與 grid [nx, ny]。
+    最細層已有檢查點時直接由檢查點續算。
+
+    parameters.anderson_depth 大於 0 時, 前 anderson_start 次外迭代之後以 Anderson 加速組合
+    最近的 SIMPLEC 掃描結果 (u、v、p); 收斂判斷仍以未加速的掃描殘差計算。
+
+    返回:
+        包含流場資料的字典; convergence_history 為歷史欄位
+        {iteration, residual_u, residual_v, continuity, pressure_iterations, pressure_residual},
+        outcome 為結束原因 (CONVERGED、STAGNATED 或 MAX_ITER);
+        網格序列時 levels 為各層摘要 [{nx, ny, tolerance, iterations, elapsed_time, outcome}],
+        total_iterations 與 convergence_history 僅含最細層, elapsed_time 含所有層
+    """
+    # 檢查點只讀取一次: 同時決定是否略過網格序列的粗層, 並交給 _solve 恢復流場
+    checkpoint = checkpointer.load(parameters.nx, parameters.ny) if checkpointer is not None else None
+    levels = None
+    if parameters.grid_sequencing and checkpoint is None:
+        initial_state, levels = _solve_coarse_levels(
+            parameters, progress_callback, cancel_event, initial_state, snapshots
+        )
+        progress_callback = _level_progress(
+            progress_callback, len(levels), len(levels) + 1, parameters.nx, parameters.ny
+        )
+        if snapshots is not None:
+            snapshots.level = len(levels)
+
+    if workspace is not None:
+        # 呼叫端提供的工作區可能留有上一個任務的流場; 初始流場與檢查點於 _solve 中載入
+        workspace.reset()
+        result = _solve(
+            parameters, progress_callback, workspace, cancel_event, initial_state, checkpointer, snapshots,
+            checkpoint
+        )
+    else:
+        workspace = workspace_pool.acquire(parameters.nx, parameters.ny)
+        try:
+            result = _solve(
+                parameters, progress_callback, workspace, cancel_event, initial_state, checkpointer, snapshots,
+                checkpoint
+            )
+        finally:
+            workspace_pool.release(workspace)
+
+    if levels is not None:
+        levels.append(_level_summary(parameters, result))
+        result["levels"] = levels
+        result["elapsed_time"] = sum(level["elapsed_time"] for level in levels)
+
+    if not as_arrays:
+        for key in FIELD_KEYS:
+            result[key] = result[key].tolist()
+        result["convergence_history"] = {
+            name: column.tolist() for name, column in result["convergence_history"].items()
+        }
+    return result
+
+
+def _solve_coarse_levels(
+    parameters: SimulationParameters,
+    progress_callback: Optional[Callable[[Dict], None]],
+    cancel_event: Optional[Any],
+    initial_state: Optional[Dict],
+    snapshots: Optional[SnapshotEmitter]
+) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    網格序列的粗層 (不含最細層)
 
     返回:
-        包含流場資料的字典
+        (最細層的初始流場, 各粗層摘要)
+    """
+    grids = grid_levels(parameters.nx, parameters.ny, parameters.sequencing_coarsest)
+    factor = parameters.sequencing_tolerance_factor
+    levels: List[Dict] = []
+    state = initial_state
+    for index, (nx, ny) in enumerate(grids[:-1]):
+        depth = len(grids) - 1 - index
+        level_parameters = parameters.model_copy(update={
+            "nx": nx,
+            "ny": ny,
+            "tolerance": level_tolerance(parameters.tolerance, factor, depth),
+            "continuity_tolerance": level_tolerance(parameters.continuity_tolerance, factor, depth),
+            "grid_sequencing": False
+        })
+        if snapshots is not None:
+            snapshots.level = index
+        ws = workspace_pool.acquire(nx, ny)
+        try:
+            result = _solve(
+                level_parameters,
+                _level_progress(progress_callback, index, len(grids), nx, ny),
+                ws, cancel_event, state, None, snapshots
+            )
+        finally:
+            workspace_pool.release(ws)
+        levels.append(_level_summary(level_parameters, result))
+        state = {
+            "pressure": result["pressure"],
+            "velocity_u": result["velocity_u"],
+            "velocity_v": result["velocity_v"],
+            "lid_velocity": parameters.lid_velocity
+        }
+    return state, levels
+
+
+def _level_progress(
+    progress_callback: Optional[Callable[[Dict], None]], level: int, levels: int, nx: int, ny: int
+) -> Optional[Callable[[Dict], None]]:
+    """在進度訊息中附上網格序列的層級"""
+    if progress_callback is None:
+        return None
+    return lambda data: progress_callback({**data, "level": level, "levels": levels, "grid": [nx, ny]})
+
+
+def _level_summary(parameters: SimulationParameters, result: Dict) -> Dict:
+    """網格序列單層的摘要"""
+    return {
+        "nx": parameters.nx,
+        "ny": parameters.ny,
+        "tolerance": parameters.tolerance,
+        "iterations": result["total_iterations"],
+        "elapsed_time": result["elapsed_time"],
+        "outcome": result["outcome"]
+    }
+
+
+def _solve(
+    parameters: SimulationParameters,
+    progress_callback: Optional[Callable[[Dict], None]],
+    ws: SolverWorkspace,
+    cancel_event: Optional[Any],
+    initial_state: Optional[Dict] = None,
+    checkpointer: Optional[Checkpointer] = None,
+    snapshots: Optional[SnapshotEmitter] = None,
+    checkpoint: Optional[Dict] = None
+) -> Dict:
+    """
+    SIMPLEC 主迴圈, 所有陣列皆屬於工作區 ws
+
+    checkpoint 為呼叫端已讀取的檢查點 (Checkpointer.load 的返回值), 存在時由其續算;
+    checkpointer 只用於寫入
     """
     # 提取參數
     NX = parameters.nx
@@ -37,205 +217,242 @@ def solve_cavity_flow(
     # 流體性質 (從 Reynolds 數計算黏滯係數)
     rho = 1.0
     mu = rho * U_lid * LX / parameters.reynolds_number
-
-    # 初始化變數
-    p = np.zeros((NY, NX))
-    p_prime = np.zeros_like(p)
-
-    u = np.zeros((NY, NX - 1))
-    v = np.zeros((NY - 1, NX))
-
-    u_star = u.copy()
-    v_star = v.copy()
-
-    # 收斂歷史
-    convergence_history: List[Dict] = []
-
-    # 開始計時
-    start_time = time.time()
+    mass_scale = rho * U_lid * LY
+
+    # 工作區陣列 (不隨迭代變動的部分)
+    p = ws.p
+    p_prime = ws.p_prime
+    u_star = ws.u_star
+    v_star = ws.v_star
+    d_u = ws.d_u
+    d_v = ws.d_v
+    pressure_op = ws.pressure_op
+    mass_imbalance = ws.mass_imbalance
+    pressure_rhs = ws.scratch_p
+
+    # 收斂歷史 (預先配置的欄位, 取樣數有上限)
+    history = ConvergenceHistory(parameters.history_every, parameters.history_max_samples)
+    start_iteration = 0
+    elapsed_before = 0.0
+
+    # 續算: 由檢查點恢復流場與收斂歷史
+    if checkpoint is not None:
+        p[...] = checkpoint["p"]
+        ws.u[...] = checkpoint["u"]
+        ws.v[...] = checkpoint["v"]
+        start_iteration = min(checkpoint["iteration"] + 1, max_iter - 1)
+        elapsed_before = checkpoint["elapsed_time"]
+        history = ConvergenceHistory.from_columns(
+            checkpoint["convergence_history"], history.every, history.max_samples
+        )
+
+    # 暖啟動: 插值既有流場, 並依頂蓋速度比例縮放 (p 與速度平方成正比)
+    elif initial_state is not None:
+        p0, u0, v0 = interpolate_state(
+            initial_state["pressure"], initial_state["velocity_u"], initial_state["velocity_v"],
+            NX, NY
+        )
+        scale = U_lid / initial_state.get("lid_velocity", U_lid)
+        np.multiply(p0, scale * scale, out=p)
+        np.multiply(u0, scale, out=ws.u)
+        np.multiply(v0, scale, out=ws.v)
+        _apply_velocity_bc(ws.u, ws.v, U_lid)
+
+    # 壓力修正求解器
+    pressure_solver = create_pressure_solver(parameters)
+
+    # 收斂與停滯監測
+    monitor = ConvergenceMonitor(
+        parameters.convergence_criterion,
+        tolerance,
+        parameters.continuity_tolerance,
+        parameters.stagnation_window,
+        parameters.stagnation_min_improvement
+    )
+    outcome = None
+    eta = EtaEstimator()
+
+    # Anderson 加速: 以 [u, v, p] 串接的狀態向量 (預先配置) 作為不動點迭代的變數
+    accelerator = None
+    if parameters.anderson_depth:
+        state = np.empty(ws.u.size + ws.v.size + p.size)
+        state_u = state[:ws.u.size].reshape(ws.u.shape)
+        state_v = state[ws.u.size:ws.u.size + ws.v.size].reshape(ws.v.shape)
+        state_p = state[ws.u.size + ws.v.size:].reshape(p.shape)
+        accelerator = AndersonAccelerator(
+            state.size, parameters.anderson_depth, parameters.anderson_restart_factor
+        )
+
+    # 開始計時 (續算時包含先前已花費的時間)
+    start_time = time.time() - elapsed_before
 
     # 主迭代迴圈
-    for it in range(max_iter):
-        u_old_iter = u.copy()
-        v_old_iter = v.copy()
+    for it in range(start_iteration, max_iter):
+        if cancel_event is not None and cancel_event.is_set():
+            if checkpointer is not None and it > start_iteration:
+                checkpointer.save(
+                    it - 1, p, ws.u, ws.v, history.columns(), time.time() - start_time
+                )
+            raise SolverCancelled(it)
+
+        # 交換緩衝區: u_old/v_old 為目前迭代值, u/v 將被完整覆寫
+        ws.swap_velocity()
+        u, v = ws.u, ws.v
+        u_old, v_old = ws.u_old, ws.v_old
 
         # === 步驟 A: 求解動量方程式 (速度預測) ===
 
-        # A1. 求解 u-動量方程式
-        for j in range(1, NY - 1):
-            for i in range(1, NX - 2):
-                # 對流項
-                conv_u_E = 0.5 * rho * dy * (u[j, i] + u[j, i + 1])
-                conv_u_W = 0.5 * rho * dy * (u[j, i - 1] + u[j, i])
-                conv_v_N = 0.5 * rho * dx * (v[j, i] + v[j, i + 1])
-                conv_v_S = 0.5 * rho * dx * (v[j - 1, i] + v[j - 1, i + 1])
-
-                # 擴散項
-                diff_u_E = mu * dy / dx
-                diff_u_W = mu * dy / dx
-                diff_u_N = mu * dx / dy
-                diff_u_S = mu * dx / dy
-
-                # 係數
-                a_E = diff_u_E + max(0, -conv_u_E)
-                a_W = diff_u_W + max(0, conv_u_W)
-                a_N = diff_u_N + max(0, -conv_v_N)
-                a_S = diff_u_S + max(0, conv_v_S)
-
-                # 壓力梯度項
-                source_p_u = (p[j, i] - p[j, i + 1]) * dy
-
-                # 中心點係數
-                a_P_u = a_E + a_W + a_N + a_S + \
-                    (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
-
-                # 預測速度
-                numerator = (a_E * u[j, i+1] + a_W * u[j, i-1] +
-                           a_N * u[j+1, i] + a_S * u[j-1, i] + source_p_u)
-                u_star[j, i] = (1 - alpha_u) * u[j, i] + alpha_u * (numerator / a_P_u)
-
-        # A2. 求解 v-動量方程式
-        for j in range(1, NY - 2):
-            for i in range(1, NX - 1):
-                # 對流項
-                conv_u_E = 0.5 * rho * dy * (u[j, i] + u[j + 1, i])
-                conv_u_W = 0.5 * rho * dy * (u[j, i - 1] + u[j + 1, i - 1])
-                conv_v_N = 0.5 * rho * dx * (v[j, i] + v[j + 1, i])
-                conv_v_S = 0.5 * rho * dx * (v[j - 1, i] + v[j, i])
-
-                # 擴散項
-                diff_v_E = mu * dy / dx
-                diff_v_W = mu * dy / dx
-                diff_v_N = mu * dx / dy
-                diff_v_S = mu * dx / dy
-
-                # 係數
-                a_E = diff_v_E + max(0, -conv_u_E)
-                a_W = diff_v_W + max(0, conv_u_W)
-                a_N = diff_v_N + max(0, -conv_v_N)
-                a_S = diff_v_S + max(0, conv_v_S)
-
-                # 壓力梯度項
-                source_p_v = (p[j, i] - p[j + 1, i]) * dx
-
-                # 中心點係數
-                a_P_v = a_E + a_W + a_N + a_S + \
-                    (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
-
-                # 預測速度
-                numerator = (a_E * v[j, i+1] + a_W * v[j, i-1] +
-                           a_N * v[j+1, i] + a_S * v[j-1, i] + source_p_v)
-                v_star[j, i] = (1 - alpha_u) * v[j, i] + alpha_u * (numerator / a_P_v)
+        # A1/A2. 以整體陣列運算求解 u、v 動量方程式
+        predict_velocity(
+            u_old, v_old, p, u_star, v_star, rho, mu, dx, dy, alpha_u,
+            ws.a_P_u, ws.a_nb_u, ws.a_P_v, ws.a_nb_v, ws.momentum_u, ws.momentum_v
+        )
+
+        # SIMPLEC 的 d 因子 (每個面各自計算)
+        simplec_d(ws.a_P_u, ws.a_nb_u, dy, alpha_u, out=d_u)
+        simplec_d(ws.a_P_v, ws.a_nb_v, dx, alpha_u, out=d_v)
 
         # === 步驟 B: 求解壓力修正方程式 ===
-        p_prime[:, :] = 0
-        for _ in range(50):  # 高斯-賽德爾迭代
-            for j in range(1, NY - 1):
-                for i in range(1, NX - 1):
-                    # 簡化的 a_P (應為每個位置重新計算)
-                    a_P_u_E = a_P_u if 'a_P_u' in locals() else 1.0
-                    a_P_u_W = a_P_u if 'a_P_u' in locals() else 1.0
-                    a_P_v_N = a_P_v if 'a_P_v' in locals() else 1.0
-                    a_P_v_S = a_P_v if 'a_P_v' in locals() else 1.0
-
-                    # SIMPLEC 的 d 因子
-                    d_u_E = alpha_u * dy / a_P_u_E
-                    d_u_W = alpha_u * dy / a_P_u_W
-                    d_v_N = alpha_u * dx / a_P_v_N
-                    d_v_S = alpha_u * dx / a_P_v_S
-
-                    # 壓力修正方程式係數
-                    a_E_p = rho * d_u_E * dy
-                    a_W_p = rho * d_u_W * dy
-                    a_N_p = rho * d_v_N * dx
-                    a_S_p = rho * d_v_S * dx
-                    a_P_p = a_E_p + a_W_p + a_N_p + a_S_p
-
-                    # 質量不平衡
-                    mass_imbalance = (rho * (u_star[j, i] - u_star[j, i-1]) * dy +
-                                    rho * (v_star[j, i] - v_star[j-1, i]) * dx)
-
-                    # 求解 p_prime
-                    if a_P_p > 1e-12:
-                        p_prime[j, i] = (a_E_p * p_prime[j, i+1] + a_W_p * p_prime[j, i-1] +
-                                       a_N_p * p_prime[j+1, i] + a_S_p * p_prime[j-1, i] -
-                                       mass_imbalance) / a_P_p
+        p_prime.fill(0.0)
+
+        # 五點模板係數
+        np.multiply(d_u[1:-1, 1:], rho * dy, out=pressure_op.a_E)
+        np.multiply(d_u[1:-1, :-1], rho * dy, out=pressure_op.a_W)
+        np.multiply(d_v[1:, 1:-1], rho * dx, out=pressure_op.a_N)
+        np.multiply(d_v[:-1, 1:-1], rho * dx, out=pressure_op.a_S)
+        pressure_op.refresh()
+
+        # 質量不平衡
+        np.subtract(u_star[1:-1, 1:], u_star[1:-1, :-1], out=mass_imbalance)
+        mass_imbalance *= rho * dy
+        np.subtract(v_star[1:, 1:-1], v_star[:-1, 1:-1], out=pressure_rhs)
+        pressure_rhs *= rho * dx
+        mass_imbalance += pressure_rhs
+        np.negative(mass_imbalance, out=pressure_rhs)
+
+        pressure_info = pressure_solver.solve(
+            pressure_op, pressure_rhs, p_prime[1:-1, 1:-1]
+        )
 
         # === 步驟 C: 修正壓力與速度 ===
-        p += alpha_p * p_prime
+        # 邊界上 p' 為零, 只需更新內部點 (pressure_rhs 於壓力求解後作為暫存)
+        np.multiply(p_prime[1:-1, 1:-1], alpha_p, out=pressure_rhs)
+        p[1:-1, 1:-1] += pressure_rhs
 
         # 修正 u 速度
-        for j in range(1, NY-1):
-            for i in range(1, NX-2):
-                d_u = alpha_u * dy / (a_P_u if 'a_P_u' in locals() else 1.0)
-                u[j, i] = u_star[j, i] - d_u * (p_prime[j, i+1] - p_prime[j, i])
+        du = ws.scratch_u[1:-1, 1:-1]
+        np.subtract(p_prime[1:-1, 2:-1], p_prime[1:-1, 1:-2], out=du)
+        du *= d_u[1:-1, 1:-1]
+        np.subtract(u_star[1:-1, 1:-1], du, out=u[1:-1, 1:-1])
 
         # 修正 v 速度
-        for j in range(1, NY-2):
-            for i in range(1, NX-1):
-                d_v = alpha_u * dx / (a_P_v if 'a_P_v' in locals() else 1.0)
-                v[j, i] = v_star[j, i] - d_v * (p_prime[j+1, i] - p_prime[j, i])
+        dv = ws.scratch_v[1:-1, 1:-1]
+        np.subtract(p_prime[2:-1, 1:-1], p_prime[1:-2, 1:-1], out=dv)
+        dv *= d_v[1:-1, 1:-1]
+        np.subtract(v_star[1:-1, 1:-1], dv, out=v[1:-1, 1:-1])
 
         # === 步驟 D: 施加邊界條件 ===
-        u[0, :] = 0.0
-        u[-1, :] = 0.0
-        u[:, 0] = 0.0
-        u[:, -1] = 0.0
-
-        v[:, 0] = 0.0
-        v[:, -1] = 0.0
-        v[0, :] = 0.0
-        v[-1, :] = 0.0
-
-        # 頂蓋速度
-        u[NY-1, :] = U_lid
+        _apply_velocity_bc(u, v, U_lid)
 
         # === 步驟 E: 檢查收斂 ===
-        u_res = np.sqrt(np.sum((u - u_old_iter)**2)) / (np.sqrt(np.sum(u_old_iter**2)) + 1e-12)
-        v_res = np.sqrt(np.sum((v - v_old_iter)**2)) / (np.sqrt(np.sum(v_old_iter**2)) + 1e-12)
-
-        # 記錄收斂歷史
-        if it % 10 == 0:
+        np.subtract(u, u_old, out=ws.scratch_u)
+        np.subtract(v, v_old, out=ws.scratch_v)
+        u_res = np.linalg.norm(ws.scratch_u) / (np.linalg.norm(u_old) + 1e-12)
+        v_res = np.linalg.norm(ws.scratch_v) / (np.linalg.norm(v_old) + 1e-12)
+
+        # 連續方程式殘差: 預測速度的質量不平衡 (壓力修正方程式的源項) 總和, 以頂蓋質量通量正規化
+        continuity = float(np.abs(mass_imbalance, out=pressure_rhs).sum()) / mass_scale
+
+        # 依所選標準判斷收斂或停滯 (outcome 不為 None 時結束)
+        outcome = monitor.update(it, u_res, v_res, continuity)
+        finished = outcome is not None
+
+        # 記錄收斂歷史 (依取樣間隔及最後一次迭代)
+        if history.due(it) or finished or it == max_iter - 1:
+            history.record(
+                it, u_res, v_res, continuity, pressure_info["iterations"], pressure_info["residual"]
+            )
+
+        # 呼叫進度回調 (每 10 次迭代及最後一次迭代), 附上依殘差衰減率估計的剩餘迭代次數與秒數
+        if progress_callback and (it % 10 == 0 or finished or it == max_iter - 1):
             elapsed = time.time() - start_time
-            convergence_history.append({
+            if it > start_iteration:
+                # 第一次迭代的度量來自初始場, 不列入擬合
+                eta.update(it, elapsed, monitor.value)
+            estimate = (0, 0.0) if finished else eta.estimate(
+                max_iter - 1 - it, parameters.stagnation_window or None
+            )
+            progress_callback({
                 "iteration": it,
                 "residual_u": float(u_res),
-                "residual_v": float(v_res)
+                "residual_v": float(v_res),
+                "continuity": continuity,
+                "elapsed_time": elapsed,
+                "pressure_iterations": pressure_info["iterations"],
+                "estimated_iterations": estimate[0] if estimate else None,
+                "estimated_remaining": estimate[1] if estimate else None
             })
 
-            # 呼叫進度回調
-            if progress_callback:
-                progress_callback({
-                    "iteration": it,
-                    "residual_u": float(u_res),
-                    "residual_v": float(v_res),
-                    "elapsed_time": elapsed
-                })
-
-        # 檢查收斂
-        if u_res < tolerance and v_res < tolerance:
+        if snapshots is not None:
+            snapshots.maybe_emit(it, p, u, v)
+
+        # 收斂或停滯
+        if finished:
             break
 
+        # 以本次 SIMPLEC 掃描的結果 G(x) 組合出加速後的迭代值 (殘差成長時即為 G(x))
+        if accelerator is not None and it >= start_iteration + parameters.anderson_start:
+            np.copyto(state_u, u)
+            np.copyto(state_v, v)
+            np.copyto(state_p, p)
+            if accelerator.step(state):
+                np.copyto(u, state_u)
+                np.copyto(v, state_v)
+                np.copyto(p, state_p)
+                _apply_velocity_bc(u, v, U_lid)
+
+        # 定期寫入檢查點 (最後一次迭代不需要)
+        if checkpointer is not None and it < max_iter - 1 and checkpointer.due(it):
+            checkpointer.save(it, p, u, v, history.columns(), time.time() - start_time)
+
     # 計算最終結果
     elapsed_total = time.time() - start_time
 
     # 產生座標
-    x_coords = np.linspace(0, LX, NX).tolist()
-    y_coords = np.linspace(0, LY, NY).tolist()
+    x_coords = np.linspace(0, LX, NX)
+    y_coords = np.linspace(0, LY, NY)
 
-    # 返回結果
+    # 返回結果 (複製出工作區, 工作區隨後可能被其他任務重複使用)
     return {
-        "pressure": p.tolist(),
-        "velocity_u": u.tolist(),
-        "velocity_v": v.tolist(),
+        "pressure": p.copy(),
+        "velocity_u": ws.u.copy(),
+        "velocity_v": ws.v.copy(),
         "x_coords": x_coords,
         "y_coords": y_coords,
-        "convergence_history": convergence_history,
+        "convergence_history": history.columns(copy=True),
         "final_residuals": {
             "u": float(u_res),
-            "v": float(v_res)
+            "v": float(v_res),
+            "continuity": continuity
         },
         "total_iterations": it + 1,
         "elapsed_time": elapsed_total,
-        "converged": u_res < tolerance and v_res < tolerance
+        "converged": outcome == OUTCOME_CONVERGED,
+        "outcome": outcome or OUTCOME_MAX_ITER
     }
+
+
+def _apply_velocity_bc(u: np.ndarray, v: np.ndarray, U_lid: float) -> None:
+    """無滑移壁面與頂蓋速度邊界條件"""
+    u[0, :] = 0.0
+    u[-1, :] = 0.0
+    u[:, 0] = 0.0
+    u[:, -1] = 0.0
+
+    v[:, 0] = 0.0
+    v[:, -1] = 0.0
+    v[0, :] = 0.0
+    v[-1, :] = 0.0
+
+    # 頂蓋速度
+    u[-1, :] = U_lid
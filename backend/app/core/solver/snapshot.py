@@ -0,0 +1,46 @@
+"""求解期間的降採樣流場快照"""
+import math
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+
+def downsample_stride(n: int, max_points: int) -> int:
+    """使長度 n 的軸取樣後不超過 max_points 點的間隔"""
+    return max(1, math.ceil(n / max_points))
+
+
+class SnapshotEmitter:
+    """
+    快照產生器
+
+    enabled 旗標 (具有 is_set() 的物件) 設定時, 每 every 次外迭代以間隔取樣複製
+    p、u、v (各軸不超過 max_points 點, float32) 並交給 callback;
+    只複製取樣後的小陣列, 未啟用時僅多一次旗標檢查。
+    網格序列時 level 由求解器於每層開始前設定 (各層的迭代次數由 0 起算)。
+    """
+
+    def __init__(self, enabled: Any, every: int = 10, max_points: int = 64):
+        self.enabled = enabled
+        self.every = every
+        self.max_points = max_points
+        self.level = 0
+        # 由執行後端設定 (行程池時於工作行程中設定)
+        self.callback: Optional[Callable[[Dict], None]] = None
+
+    def maybe_emit(self, iteration: int, p: np.ndarray, u: np.ndarray, v: np.ndarray) -> None:
+        """於外迭代結束時呼叫"""
+        if self.callback is None or iteration % self.every or not self.enabled.is_set():
+            return
+        ny, nx = p.shape
+        sx = downsample_stride(nx, self.max_points)
+        sy = downsample_stride(ny, self.max_points)
+        self.callback({
+            "iteration": iteration,
+            "level": self.level,
+            "pressure": p[::sy, ::sx].astype(np.float32),
+            "velocity_u": u[::sy, ::sx].astype(np.float32),
+            "velocity_v": v[::sy, ::sx].astype(np.float32),
+            "x_coords": np.linspace(0.0, 1.0, nx)[::sx].astype(np.float32),
+            "y_coords": np.linspace(0.0, 1.0, ny)[::sy].astype(np.float32),
+        })
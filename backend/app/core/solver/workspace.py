@@ -0,0 +1,118 @@
+"""求解器工作區 - 預先配置並重複使用迭代所需的陣列"""
+import threading
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from .momentum import MomentumScratch
+from .pressure import PressureOperator
+
+
+# 每種網格尺寸最多保留的閒置工作區數量
+MAX_IDLE_PER_GRID = 4
+
+
+class SolverWorkspace:
+    """
+    單一 (nx, ny) 網格的求解器緩衝區
+
+    擁有速度、壓力、預測值、前一步值與係數陣列;
+    迭代期間一律原地更新 (out= 運算與緩衝區交換), 不另行配置。
+    """
+
+    def __init__(self, nx: int, ny: int):
+        self.nx = nx
+        self.ny = ny
+
+        # 流場
+        self.p = np.zeros((ny, nx))
+        self.p_prime = np.zeros((ny, nx))
+        self.u = np.zeros((ny, nx - 1))
+        self.v = np.zeros((ny - 1, nx))
+
+        # 預測速度與前一步速度
+        self.u_star = np.zeros_like(self.u)
+        self.v_star = np.zeros_like(self.v)
+        self.u_old = np.zeros_like(self.u)
+        self.v_old = np.zeros_like(self.v)
+
+        # 動量方程式係數與 SIMPLEC d 因子 (完整面陣列)
+        self.a_P_u = np.zeros_like(self.u)
+        self.a_nb_u = np.zeros_like(self.u)
+        self.d_u = np.zeros_like(self.u)
+        self.a_P_v = np.zeros_like(self.v)
+        self.a_nb_v = np.zeros_like(self.v)
+        self.d_v = np.zeros_like(self.v)
+
+        # 動量方程式組裝暫存 (內部面)
+        self.momentum_u = MomentumScratch((ny - 2, nx - 3))
+        self.momentum_v = MomentumScratch((ny - 3, nx - 2))
+
+        # 壓力修正方程式
+        interior = (ny - 2, nx - 2)
+        self.pressure_op = PressureOperator.empty(interior)
+        self.mass_imbalance = np.zeros(interior)
+        self.scratch_p = np.zeros(interior)
+
+        # 殘差計算暫存
+        self.scratch_u = np.zeros_like(self.u)
+        self.scratch_v = np.zeros_like(self.v)
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return (self.nx, self.ny)
+
+    @property
+    def nbytes(self) -> int:
+        """工作區佔用的位元組數"""
+        return sum(
+            value.nbytes for value in vars(self).values()
+            if isinstance(value, np.ndarray)
+        ) + self.pressure_op.nbytes + self.momentum_u.nbytes + self.momentum_v.nbytes
+
+    def reset(self) -> None:
+        """清除所有緩衝區 (供下一個任務使用)"""
+        for value in vars(self).values():
+            if isinstance(value, np.ndarray):
+                value.fill(0.0)
+        self.pressure_op.reset()
+
+    def swap_velocity(self) -> None:
+        """交換 u/u_old 與 v/v_old; 交換後 u_old、v_old 為目前的迭代值"""
+        self.u, self.u_old = self.u_old, self.u
+        self.v, self.v_old = self.v_old, self.v
+
+
+class WorkspacePool:
+    """依網格尺寸重複使用工作區 (執行緒安全)"""
+
+    def __init__(self, max_idle_per_grid: int = MAX_IDLE_PER_GRID):
+        self.max_idle_per_grid = max_idle_per_grid
+        self._idle: Dict[Tuple[int, int], List[SolverWorkspace]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def acquire(self, nx: int, ny: int) -> SolverWorkspace:
+        """取得已清除的工作區, 沒有閒置者時新建"""
+        with self._lock:
+            idle = self._idle.get((nx, ny))
+            workspace = idle.pop() if idle else None
+        if workspace is None:
+            return SolverWorkspace(nx, ny)
+        workspace.reset()
+        return workspace
+
+    def release(self, workspace: SolverWorkspace) -> None:
+        """歸還工作區"""
+        with self._lock:
+            idle = self._idle[workspace.key]
+            if len(idle) < self.max_idle_per_grid and all(w is not workspace for w in idle):
+                idle.append(workspace)
+
+    def clear(self) -> None:
+        """釋放所有閒置工作區"""
+        with self._lock:
+            self._idle.clear()
+
+
+# 全域單例
+workspace_pool = WorkspacePool()
@@ -1,14 +1,39 @@
 """FastAPI 應用程式入口"""
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api import simulation, websocket
+from app.services.executor import solver_executor
+from app.services.job_registry import job_registry
+from app.services.solver_service import solver_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    應用程式生命週期
+
+    啟動時重新排入上次未完成的任務; 關閉時釋放求解器行程池並提交任務登錄
+    """
+    recovered = [
+        asyncio.create_task(solver_service.run_simulation(job_id))
+        for job_id in solver_service.recover_jobs()
+    ]
+    yield
+    for task in recovered:
+        task.cancel()
+    solver_executor.shutdown()
+    job_registry.close()
+
 
 # 建立 FastAPI 應用程式
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="CFD 求解器 Web API - 使用 SIMPLEC 演算法求解蓋驅動方腔流",
+    lifespan=lifespan,
 )
 
 # 設定 CORS
@@ -1,5 +1,5 @@
 """求解結果相關資料模型"""
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +11,13 @@ class SolverProgress(BaseModel):
     residual_u: float = Field(..., description="u 速度殘差")
     residual_v: float = Field(..., description="v 速度殘差")
     elapsed_time: float = Field(..., description="已執行時間 (秒)")
+    continuity: Optional[float] = Field(None, description="連續方程式 (質量不平衡) 殘差")
+    level: Optional[int] = Field(None, description="網格序列目前層級 (0 起算, 網格序列時)")
+    levels: Optional[int] = Field(None, description="網格序列總層數 (網格序列時)")
+    estimated_iterations: Optional[int] = Field(
+        None,
+        description="預估剩餘外迭代次數 (依殘差衰減率, 不超過 max_iter)"
+    )
     estimated_remaining: Optional[float] = Field(
         None,
         description="預估剩餘時間 (秒)"
@@ -24,6 +31,8 @@ class SolverProgress(BaseModel):
                 "residual_u": 0.001,
                 "residual_v": 0.0015,
                 "elapsed_time": 5.2,
+                "continuity": 0.0004,
+                "estimated_iterations": 300,
                 "estimated_remaining": 15.0
             }
         }
@@ -38,13 +47,25 @@ class FlowFieldResults(BaseModel):
     velocity_v: List[List[float]] = Field(..., description="v 速度場 ((ny-1) x nx)")
     x_coords: List[float] = Field(..., description="x 座標")
     y_coords: List[float] = Field(..., description="y 座標")
-    convergence_history: List[Dict] = Field(
-        ...,
-        description="收斂歷史 [{iteration, residual_u, residual_v}]"
+    history_length: int = Field(
+        0,
+        description="收斂歷史取樣數 (內容由 GET /api/simulations/{job_id}/history 分頁取得)"
     )
     final_residuals: Dict[str, float] = Field(
         ...,
-        description="最終殘差 {u, v}"
+        description="最終殘差 {u, v, continuity}"
+    )
+    outcome: Optional[str] = Field(
+        None,
+        description="求解結束原因 (CONVERGED、STAGNATED 或 MAX_ITER)"
+    )
+    levels: Optional[List[Dict]] = Field(
+        None,
+        description="網格序列各層摘要 [{nx, ny, tolerance, iterations, elapsed_time, outcome}]"
+    )
+    initial_condition: Optional[str] = Field(
+        None,
+        description="暖啟動所用結果的 job_id (由零場開始時為 None)"
     )
 
     class Config:
@@ -56,9 +77,46 @@ class FlowFieldResults(BaseModel):
                 "velocity_v": [[0.0], [0.1]],
                 "x_coords": [0.0, 0.5, 1.0],
                 "y_coords": [0.0, 0.5, 1.0],
-                "convergence_history": [
-                    {"iteration": 100, "residual_u": 0.01, "residual_v": 0.01}
-                ],
-                "final_residuals": {"u": 1e-6, "v": 1e-6}
+                "history_length": 120,
+                "final_residuals": {"u": 1e-6, "v": 1e-6, "continuity": 1e-7},
+                "outcome": "CONVERGED"
             }
         }
+
+
+class ConvergenceHistoryPage(BaseModel):
+    """收斂歷史的一頁 (依迭代次數遞增, 以欄位表示)"""
+
+    job_id: str = Field(..., description="任務 ID")
+    total: int = Field(..., description="取樣總數")
+    offset: int = Field(..., description="本頁第一筆的索引")
+    limit: int = Field(..., description="每頁最多筆數")
+    iteration: List[int] = Field(..., description="外迭代次數")
+    residual_u: List[float] = Field(..., description="u 速度殘差")
+    residual_v: List[float] = Field(..., description="v 速度殘差")
+    continuity: List[float] = Field(..., description="連續方程式 (質量不平衡) 殘差")
+    pressure_iterations: List[int] = Field(..., description="壓力修正的內迭代次數")
+    pressure_residual: List[float] = Field(
+        default_factory=list, description="壓力修正結束時的相對殘差 (舊版結果無此欄位時為空)"
+    )
+
+
+class CacheStats(BaseModel):
+    """結果快取統計"""
+
+    hits: int = Field(..., description="快取命中次數")
+    misses: int = Field(..., description="快取未命中次數")
+    coalesced: int = Field(..., description="併入執行中相同任務的提交次數")
+    entries: int = Field(..., description="快取中的結果數")
+    nbytes: int = Field(..., description="快取佔用位元組數")
+    max_bytes: int = Field(..., description="快取記憶體預算 (位元組)")
+
+
+class SnapshotOptions(BaseModel):
+    """WebSocket 即時流場快照的訂閱選項 (客戶端以 {"type": "snapshots", ...} 送出)"""
+
+    enabled: bool = Field(True, description="是否接收快照 (False 為取消訂閱)")
+    every: int = Field(10, ge=1, description="兩次快照之間至少相隔的外迭代次數")
+    max_points: int = Field(32, ge=2, description="每軸最多點數 (不超過伺服器的取樣解析度)")
+    dtype: Literal["float16", "float32"] = Field("float16", description="快照的浮點精度")
+    max_rate: float = Field(2.0, gt=0, description="每秒最多快照數")
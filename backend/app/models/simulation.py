@@ -1,7 +1,7 @@
 """模擬任務相關資料模型"""
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, validator
 
@@ -9,9 +9,18 @@ from pydantic import BaseModel, Field, validator
 class JobStatus(str, Enum):
     """任務狀態列舉"""
     PENDING = "PENDING"      # 已建立,等待執行
+    QUEUED = "QUEUED"        # 已進入排程佇列
     RUNNING = "RUNNING"      # 正在執行
     COMPLETED = "COMPLETED"  # 成功完成
     FAILED = "FAILED"        # 執行失敗
+    CANCELLED = "CANCELLED"  # 已取消
+
+
+class SolverOutcome(str, Enum):
+    """求解結束原因"""
+    CONVERGED = "CONVERGED"  # 殘差達收斂標準
+    STAGNATED = "STAGNATED"  # 殘差停滯, 提前結束
+    MAX_ITER = "MAX_ITER"    # 達最大迭代次數
 
 
 class SimulationParameters(BaseModel):
@@ -59,11 +68,122 @@ class SimulationParameters(BaseModel):
         lt=1.0,
         description="收斂標準"
     )
+    convergence_criterion: Literal["velocity", "continuity", "all"] = Field(
+        "velocity",
+        description="收斂判斷: velocity (u、v 相對變化量 < tolerance)、"
+                    "continuity (連續方程式殘差 < continuity_tolerance) 或 all (兩者皆須滿足)"
+    )
+    continuity_tolerance: float = Field(
+        1e-4,
+        gt=0,
+        lt=1.0,
+        description="連續方程式 (質量不平衡) 殘差收斂標準, 以頂蓋質量通量正規化"
+    )
+    stagnation_window: int = Field(
+        0,
+        ge=0,
+        le=100000,
+        description="停滯判定窗口: 殘差在此外迭代次數內未明顯下降時提前結束 (0 為不偵測)"
+    )
+    stagnation_min_improvement: float = Field(
+        0.01,
+        ge=0,
+        lt=1.0,
+        description="停滯判定: 窗口內殘差須降低的最小比例"
+    )
     lid_velocity: float = Field(
         1.0,
         gt=0,
         description="上蓋速度"
     )
+    pressure_solver: Literal["gauss_seidel", "sor", "multigrid", "pcg"] = Field(
+        "pcg",
+        description="壓力修正方程式求解器"
+    )
+    pcg_preconditioner: Literal["jacobi", "ssor"] = Field(
+        "jacobi",
+        description="共軛梯度法預條件子 (ssor 迭代次數約減半, 但每次迭代的成本約為 jacobi 的數倍)"
+    )
+    sor_omega: float = Field(
+        1.5,
+        gt=0,
+        lt=2.0,
+        description="紅黑 SOR 過鬆弛因子 (亦用於 SSOR 預條件子)"
+    )
+    priority: Literal["interactive", "normal", "batch"] = Field(
+        "normal",
+        description="排程優先權"
+    )
+    cancel_on_disconnect: bool = Field(
+        False,
+        description="最後一個 WebSocket 連線中斷時是否取消任務"
+    )
+    initial_condition: Optional[str] = Field(
+        None,
+        description="暖啟動初始流場: 已完成任務的 job_id, 或 'auto' 選擇參數最接近的已收斂結果"
+    )
+    multigrid_cycle: Literal["V", "W"] = Field(
+        "V",
+        description="多重網格循環型式"
+    )
+    pressure_tolerance: float = Field(
+        1e-3,
+        gt=0,
+        lt=1.0,
+        description="壓力修正方程式相對殘差收斂標準"
+    )
+    pressure_max_cycles: int = Field(
+        50,
+        ge=1,
+        le=1000,
+        description="壓力修正方程式最大內迭代 (循環) 次數"
+    )
+    grid_sequencing: bool = Field(
+        False,
+        description="網格序列: 先在較粗的網格收斂, 再插值到下一層, 直到 nx x ny"
+    )
+    sequencing_coarsest: int = Field(
+        21,
+        ge=10,
+        le=200,
+        description="網格序列最粗層的最少點數 (每層點數約減半)"
+    )
+    sequencing_tolerance_factor: float = Field(
+        10.0,
+        ge=1.0,
+        le=1000.0,
+        description="網格序列每粗一層放寬收斂標準的倍數"
+    )
+    anderson_depth: int = Field(
+        0,
+        ge=0,
+        le=20,
+        description="外迭代 Anderson 加速的歷史深度 (0 為不加速)"
+    )
+    anderson_start: int = Field(
+        50,
+        ge=0,
+        le=10000,
+        description="Anderson 加速開始前的未加速外迭代次數 (避開初期的非線性暫態)"
+    )
+    anderson_restart_factor: float = Field(
+        2.0,
+        ge=1.0,
+        le=100.0,
+        description="Anderson 加速重新開始的門檻: 殘差超過前一次的此倍數時清除歷史並改用未加速的更新"
+    )
+    history_every: int = Field(
+        10,
+        ge=1,
+        le=10000,
+        description="收斂歷史取樣間隔 (外迭代次數)"
+    )
+    history_max_samples: int = Field(
+        1000,
+        ge=10,
+        le=100000,
+        description="收斂歷史最多保留的取樣數 (超過時以對數間隔稀疏化較舊的取樣)"
+    )
 
     @validator('nx', 'ny')
     def check_grid_size(cls, v):
@@ -83,7 +203,28 @@ class SimulationParameters(BaseModel):
                 "alpha_p": 1.0,
                 "max_iter": 10000,
                 "tolerance": 1e-5,
-                "lid_velocity": 1.0
+                "convergence_criterion": "velocity",
+                "continuity_tolerance": 1e-4,
+                "stagnation_window": 0,
+                "stagnation_min_improvement": 0.01,
+                "lid_velocity": 1.0,
+                "pressure_solver": "pcg",
+                "multigrid_cycle": "V",
+                "pcg_preconditioner": "jacobi",
+                "sor_omega": 1.5,
+                "priority": "normal",
+                "cancel_on_disconnect": False,
+                "initial_condition": None,
+                "pressure_tolerance": 1e-3,
+                "pressure_max_cycles": 50,
+                "grid_sequencing": False,
+                "sequencing_coarsest": 21,
+                "sequencing_tolerance_factor": 10.0,
+                "anderson_depth": 0,
+                "anderson_start": 50,
+                "anderson_restart_factor": 2.0,
+                "history_every": 10,
+                "history_max_samples": 1000
             }
         }
 
@@ -98,6 +239,11 @@ class SimulationJob(BaseModel):
     started_at: Optional[datetime] = Field(None, description="開始執行時間")
     completed_at: Optional[datetime] = Field(None, description="完成時間")
     error_message: Optional[str] = Field(None, description="錯誤訊息 (若失敗)")
+    queue_position: Optional[int] = Field(None, description="排程佇列位置 (QUEUED 時)")
+    estimated_wait: Optional[float] = Field(None, description="預估開始前等待時間 (秒, QUEUED 時)")
+    estimated_remaining: Optional[float] = Field(None, description="預估剩餘執行時間 (秒, RUNNING 時)")
+    cached: bool = Field(False, description="結果是否取自快取")
+    outcome: Optional[SolverOutcome] = Field(None, description="求解結束原因 (COMPLETED 時)")
 
     class Config:
         schema_extra = {
@@ -112,6 +258,11 @@ class SimulationJob(BaseModel):
                 "created_at": "2025-11-02T10:00:00",
                 "started_at": "2025-11-02T10:00:01",
                 "completed_at": None,
-                "error_message": None
+                "error_message": None,
+                "queue_position": None,
+                "estimated_wait": None,
+                "estimated_remaining": 42.0,
+                "cached": False,
+                "outcome": None
             }
         }
@@ -0,0 +1,195 @@
+"""求解器執行後端 - 執行緒池或行程池"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.solver import FIELD_KEYS, Checkpointer, SnapshotEmitter, solve_cavity_flow
+from app.models.simulation import SimulationParameters
+
+
+ProgressCallback = Callable[[Dict], None]
+SnapshotCallback = Callable[[Dict], None]
+
+
+class SolverExecutor:
+    """求解器執行後端介面"""
+
+    async def run(
+        self,
+        parameters: SimulationParameters,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[Any] = None,
+        initial_state: Optional[Dict] = None,
+        checkpointer: Optional[Checkpointer] = None,
+        snapshots: Optional[SnapshotEmitter] = None,
+        snapshot_callback: Optional[SnapshotCallback] = None
+    ) -> Dict:
+        """
+        執行求解器並返回結果 (流場欄位為 ndarray)
+
+        cancel_event 須由 create_event() 建立; 設定後求解器拋出 SolverCancelled。
+        initial_state 與 checkpointer 見 solve_cavity_flow。
+        snapshots 的啟用旗標同樣須由 create_event() 建立, 快照交給 snapshot_callback
+        """
+        raise NotImplementedError
+
+    def create_event(self) -> Any:
+        """建立此後端可跨執行緒/行程使用的旗標 (取消、快照啟用)"""
+        return threading.Event()
+
+    def shutdown(self) -> None:
+        """釋放後端資源"""
+
+
+class ThreadSolverExecutor(SolverExecutor):
+    """在事件迴圈的預設執行緒池中執行 (所有任務共用同一個 GIL)"""
+
+    async def run(
+        self, parameters, progress_callback=None, cancel_event=None,
+        initial_state=None, checkpointer=None, snapshots=None, snapshot_callback=None
+    ):
+        loop = asyncio.get_running_loop()
+        if snapshots is not None:
+            snapshots.callback = snapshot_callback
+        return await loop.run_in_executor(
+            None,
+            lambda: solve_cavity_flow(
+                parameters, progress_callback, as_arrays=True,
+                cancel_event=cancel_event, initial_state=initial_state,
+                checkpointer=checkpointer, snapshots=snapshots
+            )
+        )
+
+
+def _export_to_shared_memory(array: np.ndarray) -> Dict:
+    """將陣列複製到共享記憶體, 返回描述資訊 (由接收端負責 unlink)"""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        return {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+    finally:
+        shm.close()
+
+
+def _import_from_shared_memory(descriptor: Dict) -> np.ndarray:
+    """由共享記憶體取回陣列並釋放該區塊"""
+    shm = shared_memory.SharedMemory(name=descriptor["name"])
+    try:
+        view = np.ndarray(descriptor["shape"], dtype=descriptor["dtype"], buffer=shm.buf)
+        return view.copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _solve_in_worker(
+    parameters: SimulationParameters,
+    progress_queue,
+    cancel_event,
+    initial_state: Optional[Dict] = None,
+    checkpointer: Optional[Checkpointer] = None,
+    snapshots: Optional[SnapshotEmitter] = None
+) -> Dict:
+    """
+    行程池工作函式: 進度與快照經由佇列回傳 (以 ("progress"|"snapshot", data) 區分),
+    流場經由共享記憶體回傳
+    """
+    if snapshots is not None:
+        snapshots.callback = lambda data: progress_queue.put(("snapshot", data))
+    result = solve_cavity_flow(
+        parameters, lambda data: progress_queue.put(("progress", data)), as_arrays=True,
+        cancel_event=cancel_event, initial_state=initial_state,
+        checkpointer=checkpointer, snapshots=snapshots
+    )
+    for key in FIELD_KEYS:
+        result[key] = _export_to_shared_memory(result[key])
+    return result
+
+
+class ProcessSolverExecutor(SolverExecutor):
+    """
+    在獨立行程中執行求解器, 不與事件迴圈爭用 GIL
+
+    進度與快照經由 Manager 佇列送回, 由每個任務的轉送執行緒呼叫對應的回調;
+    流場陣列以共享記憶體傳回, 不經 pickle; 取消旗標為 Manager 的 Event 代理。
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._context = multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pool is None:
+                self._manager = self._context.Manager()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self._context
+                )
+            return self._pool, self._manager
+
+    def create_event(self):
+        _, manager = self._ensure_started()
+        return manager.Event()
+
+    async def run(
+        self, parameters, progress_callback=None, cancel_event=None,
+        initial_state=None, checkpointer=None, snapshots=None, snapshot_callback=None
+    ):
+        pool, manager = self._ensure_started()
+        loop = asyncio.get_running_loop()
+        progress_queue = manager.Queue()
+
+        def forward_progress():
+            while True:
+                item = progress_queue.get()
+                if item is None:
+                    return
+                kind, data = item
+                callback = progress_callback if kind == "progress" else snapshot_callback
+                if callback:
+                    callback(data)
+
+        forwarder = threading.Thread(target=forward_progress, daemon=True)
+        forwarder.start()
+        try:
+            result = await loop.run_in_executor(
+                pool, _solve_in_worker, parameters, progress_queue, cancel_event,
+                initial_state, checkpointer, snapshots
+            )
+        finally:
+            # 工作行程的進度訊息皆已入列, 以 None 結束轉送執行緒
+            progress_queue.put(None)
+            await loop.run_in_executor(None, forwarder.join)
+
+        for key in FIELD_KEYS:
+            result[key] = _import_from_shared_memory(result[key])
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._manager.shutdown()
+                self._pool = None
+                self._manager = None
+
+
+def create_executor() -> SolverExecutor:
+    """依設定建立執行後端"""
+    if settings.SOLVER_EXECUTOR == "process":
+        return ProcessSolverExecutor(settings.SOLVER_WORKERS)
+    return ThreadSolverExecutor()
+
+
+# 全域單例
+solver_executor = create_executor()
@@ -0,0 +1,177 @@
+"""任務登錄 - 以 SQLite 保存任務資訊, 寫入由背景執行緒批次提交"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.simulation import SimulationJob
+
+
+# 單一交易最多提交的寫入數
+MAX_BATCH = 256
+# 收集同一批寫入的等待秒數
+BATCH_WINDOW = 0.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    job TEXT NOT NULL,
+    result_summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+
+class JobRegistry:
+    """
+    任務登錄 (以 job_id 為鍵的對應表介面)
+
+    讀取一律由記憶體中的任務物件提供; save() 與刪除會排入佇列,
+    由寫入執行緒合併為批次交易寫入 SQLite, 不阻塞事件迴圈。
+    啟動時由資料庫載入所有任務。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self._jobs: Dict[str, SimulationJob] = {}
+        for (data,) in self._conn.execute("SELECT job FROM jobs ORDER BY created_at"):
+            job = SimulationJob.model_validate_json(data)
+            self._jobs[job.job_id] = job
+
+        self._pending: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    # === 對應表介面 (記憶體) ===
+
+    def __getitem__(self, job_id: str) -> SimulationJob:
+        return self._jobs[job_id]
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._jobs))
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __delitem__(self, job_id: str) -> None:
+        del self._jobs[job_id]
+        self._pending.put(("delete", job_id))
+
+    def get(self, job_id: str, default=None) -> Optional[SimulationJob]:
+        return self._jobs.get(job_id, default)
+
+    def items(self) -> List[Tuple[str, SimulationJob]]:
+        return list(self._jobs.items())
+
+    def values(self) -> List[SimulationJob]:
+        return list(self._jobs.values())
+
+    # === 寫入 ===
+
+    def save(self, job: SimulationJob, result_summary: Optional[Dict] = None) -> None:
+        """登錄或更新任務 (排入批次寫入); result_summary 為結果摘要, 省略時保留原值"""
+        self._jobs[job.job_id] = job
+        self._pending.put((
+            "save",
+            job.job_id,
+            job.status.value,
+            job.created_at.isoformat(),
+            datetime.now().isoformat(),
+            job.model_dump_json(),
+            json.dumps(result_summary) if result_summary is not None else None
+        ))
+
+    def flush(self) -> None:
+        """等待已排入的寫入全部提交"""
+        self._pending.join()
+
+    def close(self) -> None:
+        """提交剩餘寫入並結束寫入執行緒"""
+        if self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join()
+        with self._db_lock:
+            self._conn.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            # 在短時間內收集更多寫入, 合併為同一交易
+            while len(batch) < MAX_BATCH and batch[-1] is not None:
+                try:
+                    batch.append(self._pending.get(timeout=BATCH_WINDOW))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            operations = [item for item in batch if item is not None]
+            try:
+                if operations:
+                    self._commit(operations)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+            if stop:
+                return
+
+    def _commit(self, operations: List[Tuple]) -> None:
+        with self._db_lock, self._conn:
+            for operation in operations:
+                if operation[0] == "delete":
+                    self._conn.execute("DELETE FROM jobs WHERE job_id = ?", operation[1:])
+                else:
+                    self._conn.execute(
+                        """
+                        INSERT INTO jobs (job_id, status, created_at, updated_at, job, result_summary)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (job_id) DO UPDATE SET
+                            status = excluded.status,
+                            updated_at = excluded.updated_at,
+                            job = excluded.job,
+                            result_summary = COALESCE(excluded.result_summary, jobs.result_summary)
+                        """,
+                        operation[1:]
+                    )
+
+    # === 查詢 (資料庫) ===
+
+    def ids_by_status(self, *statuses: str) -> List[str]:
+        """依狀態查詢任務 ID (使用 status 索引)"""
+        self.flush()
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                [str(getattr(status, "value", status)) for status in statuses]
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def result_summary(self, job_id: str) -> Optional[Dict]:
+        """取得結果摘要 (總迭代次數、是否收斂、最終殘差與求解時間)"""
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT result_summary FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+
+# 全域單例
+job_registry = JobRegistry(os.path.join(settings.DATA_DIR, "jobs.db"))
@@ -0,0 +1,89 @@
+"""進度傳遞 - 每個任務一個最新值槽位, 由單一非同步任務依速率上限送出"""
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class ProgressChannel:
+    """
+    求解器執行緒到 WebSocket 的進度管道
+
+    publish() 可在任意執行緒呼叫, 只覆寫最新值; 每個傳送週期最多喚醒事件迴圈一次。
+    排空任務每送出一筆後等待 min_interval 秒, 期間的中間值被合併 (只送最新者)。
+    第一筆立即送出; close() 會送出尚未送出的最後一筆後結束。
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[Dict], Awaitable[None]],
+        min_interval: float
+    ):
+        self._loop = loop
+        self._send = send
+        self.min_interval = min_interval
+        self.published = 0
+        self.sent = 0
+
+        self._first: Optional[Dict] = None
+        self._latest: Optional[Dict] = None
+        self._signalled = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._drain())
+
+    def publish(self, data: Dict) -> None:
+        """更新最新進度 (執行緒安全)"""
+        with self._lock:
+            if self.published == 0:
+                # 第一筆保留於獨立槽位, 不被後續進度覆寫
+                self._first = data
+            else:
+                self._latest = data
+            self.published += 1
+            if self._signalled:
+                return
+            self._signalled = True
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def close(self) -> None:
+        """送出最後一筆進度並結束排空任務"""
+        self._closed = True
+        self._wakeup.set()
+        await self._task
+
+    def _take(self) -> Optional[Dict]:
+        with self._lock:
+            if self._first is not None:
+                data, self._first = self._first, None
+                # 槽位中仍有較新的進度時, 保持喚醒狀態
+                if self._latest is not None:
+                    self._wakeup.set()
+            else:
+                data, self._latest = self._latest, None
+            self._signalled = self._latest is not None
+            return data
+
+    async def _drain(self) -> None:
+        while True:
+            if not self._closed:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+
+            data = self._take()
+            if data is None:
+                if self._closed:
+                    return
+                continue
+
+            try:
+                await self._send(data)
+                self.sent += 1
+            except Exception:
+                # 傳送失敗 (如連線已中斷) 不影響求解
+                pass
+
+            # 速率限制: 等待期間到達的進度留在槽位中, 下一輪只送最新者
+            if not self._closed:
+                await asyncio.sleep(self.min_interval)
@@ -0,0 +1,122 @@
+"""結果快取 - 以參數的正規化雜湊為鍵, 依記憶體預算做 LRU 淘汰"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.solver import FIELD_KEYS
+from app.models.simulation import SimulationParameters
+
+
+# 不影響收斂解的參數 (不納入快取鍵; 暖啟動只改變起始值)
+NON_PHYSICAL_FIELDS = {"priority", "cancel_on_disconnect", "initial_condition"}
+
+
+def canonical_key(parameters: SimulationParameters) -> str:
+    """參數的正規化雜湊 (鍵排序、浮點數以 repr 表示)"""
+    data = {
+        name: value for name, value in parameters.model_dump().items()
+        if name not in NON_PHYSICAL_FIELDS
+    }
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def result_nbytes(result: Dict) -> int:
+    """估計結果佔用的位元組數 (僅計流場欄位)"""
+    total = 0
+    for key in FIELD_KEYS:
+        value = result.get(key)
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif value:
+            # 巢狀 list: 以每個數值 8 位元組估計
+            rows = len(value)
+            cols = len(value[0]) if isinstance(value[0], list) else 1
+            total += rows * cols * 8
+    return total
+
+
+class ResultCache:
+    """
+    求解結果的 LRU 快取
+
+    以 canonical_key 為鍵保存產生該結果的 job_id (結果本身留在 results_store,
+    命中時以別名引用, 快取不持有 memmap); 所引用結果的總大小超過 max_bytes 時
+    淘汰最久未使用者, 結果被刪除時由 discard_job() 移除對應項目。
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, key: str) -> Optional[str]:
+        """查詢快取並更新命中統計; 命中時返回結果所屬的 job_id"""
+        with self._lock:
+            job_id = self._entries.get(key)
+            if job_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return job_id
+
+    def put(self, key: str, job_id: str, result: Dict) -> None:
+        """加入 job_id 的結果; 單一結果超過預算時不快取"""
+        size = result_nbytes(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._entries[key] = job_id
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            while sum(self._sizes.values()) > self.max_bytes:
+                oldest, _ = self._entries.popitem(last=False)
+                del self._sizes[oldest]
+
+    def discard_job(self, job_id: str) -> None:
+        """移除引用 job_id 結果的項目 (結果被刪除或淘汰時呼叫)"""
+        with self._lock:
+            for key in [key for key, value in self._entries.items() if value == job_id]:
+                del self._entries[key]
+                del self._sizes[key]
+
+    def record_coalesced(self) -> None:
+        """記錄一次併入執行中任務的提交"""
+        with self._lock:
+            self.coalesced += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def stats(self) -> Dict:
+        """快取統計"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+                "nbytes": sum(self._sizes.values()),
+                "max_bytes": self.max_bytes
+            }
+
+
+# 全域單例
+result_cache = ResultCache(settings.RESULT_CACHE_MAX_BYTES)
@@ -0,0 +1,78 @@
+"""結果查詢 - 欄位選擇、間隔取樣與子區域 (皆以 ndarray 檢視實作, 不複製)"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.solver import FIELD_KEYS
+
+
+# 可選擇的欄位 (流場與座標; 收斂歷史由分頁端點提供)
+SELECTABLE_FIELDS = FIELD_KEYS
+
+
+def parse_fields(text: Optional[str]) -> Tuple[str, ...]:
+    """解析 fields=pressure,velocity_u; 未指定時為全部欄位"""
+    if not text:
+        return SELECTABLE_FIELDS
+    names = tuple(name.strip() for name in text.split(",") if name.strip())
+    unknown = [name for name in names if name not in SELECTABLE_FIELDS]
+    if unknown or not names:
+        raise ValueError(f"未知的欄位: {', '.join(unknown) or text}; 可用欄位: {', '.join(SELECTABLE_FIELDS)}")
+    return names
+
+
+def _parse_range(text: str) -> slice:
+    start, sep, stop = text.partition(":")
+    if not sep:
+        raise ValueError(f"範圍格式應為 start:stop: {text}")
+    try:
+        return slice(int(start) if start.strip() else None, int(stop) if stop.strip() else None)
+    except ValueError:
+        raise ValueError(f"範圍須為整數: {text}") from None
+
+
+def parse_window(text: Optional[str]) -> Tuple[slice, slice]:
+    """
+    解析 window=i0:i1,j0:j1 (i 為 x 方向索引, j 為 y 方向索引, 半開區間, 可省略端點)
+
+    返回:
+        (x 方向 slice, y 方向 slice)
+    """
+    if not text:
+        return slice(None), slice(None)
+    parts = text.split(",")
+    if len(parts) != 2:
+        raise ValueError(f"window 格式應為 i0:i1,j0:j1: {text}")
+    return _parse_range(parts[0]), _parse_range(parts[1])
+
+
+def select_fields(
+    data: Dict,
+    fields: Sequence[str] = SELECTABLE_FIELDS,
+    stride: int = 1,
+    window: Tuple[slice, slice] = (slice(None), slice(None))
+) -> Dict[str, Any]:
+    """
+    依查詢條件取出結果欄位
+
+    二維欄位以 [y, x] 索引; x_coords 與 y_coords 套用相同的 x、y 範圍。
+    返回的陣列皆為儲存陣列的檢視 (非連續), 序列化時才複製所選部分。
+    """
+    if stride < 1:
+        raise ValueError(f"stride 須為正整數: {stride}")
+    xs, ys = window
+    xs = slice(xs.start, xs.stop, stride)
+    ys = slice(ys.start, ys.stop, stride)
+
+    selected: Dict[str, Any] = {}
+    for name in fields:
+        value = data[name]
+        if name == "x_coords":
+            selected[name] = np.asarray(value)[xs]
+        elif name == "y_coords":
+            selected[name] = np.asarray(value)[ys]
+        elif name in FIELD_KEYS:
+            selected[name] = np.asarray(value)[ys, xs]
+        else:
+            selected[name] = value
+    return selected
@@ -0,0 +1,339 @@
+"""磁碟結果儲存 - 每個任務一組 .npy 檔, 以 memmap 讀取, 記憶體中只保留有限的熱集合"""
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.solver import FIELD_KEYS, HISTORY_COLUMNS
+
+
+METADATA_FILE = "meta.json"
+# 別名任務的目錄只含此檔, 記錄共用的結果目錄
+ALIAS_FILE = "alias.json"
+# 持有目錄的任務已刪除、目錄只為別名保留時寫入此檔
+RELEASED_FILE = "released"
+# 收斂歷史欄位存為 history.<欄位>.npy
+HISTORY_KEY = "convergence_history"
+
+
+def _array_files(data: Dict):
+    """結果中以 .npy 儲存的陣列: (檔名主體, 陣列)"""
+    for key in FIELD_KEYS:
+        yield key, data[key]
+    for name, column in data.get(HISTORY_KEY, {}).items():
+        yield f"history.{name}", column
+
+
+def _remove_directory(path: Path) -> None:
+    """刪除目錄 (已不存在時略過; 其他錯誤照常拋出)"""
+    if path.exists():
+        shutil.rmtree(path)
+
+
+class _HotEntry:
+    """熱集合中的結果目錄: metadata 與 memmap 陣列, 以及各任務已編碼的回應內容"""
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self.payloads: Dict[str, bytes] = {}
+
+    @property
+    def nbytes(self) -> int:
+        size = sum(array.nbytes for _, array in _array_files(self.data))
+        return size + sum(len(payload) for payload in self.payloads.values())
+
+
+class ResultStore:
+    """
+    以任務 ID 為鍵的結果儲存
+
+    put() 將流場寫入 <root>/<job_id>/<field>.npy、收斂歷史寫入 history.<欄位>.npy
+    (先寫暫存檔再改名), 其餘欄位寫入 meta.json; get() 以 np.load(mmap_mode="r") 返回唯讀 memmap。
+
+    alias() 讓新任務引用既有的結果目錄 (快取命中時使用, 不複製檔案);
+    持有目錄的任務被刪除而仍有別名時, 目錄原地保留 (標記為 released),
+    最後一個引用刪除時才刪除檔案。磁碟操作先於索引更新, 失敗時拋出例外且索引不變。
+
+    兩層上限:
+        hot_bytes: 記憶體中保留的結果 (memmap 與編碼內容) 總量, 超過時以 LRU 卸載
+        max_bytes / ttl: 磁碟總量與閒置秒數, 由 evict() 刪除最久未使用的任務,
+            並呼叫 add_evict_handler() 註冊的處理函式
+    任何結果被刪除 (pop 或淘汰) 時呼叫 add_delete_handler() 註冊的處理函式。
+    """
+
+    def __init__(self, root: str, hot_bytes: int, max_bytes: int, ttl: float):
+        self.root = Path(root)
+        self.hot_bytes = hot_bytes
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evict_handlers: List[Callable[[str], None]] = []
+        self.delete_handlers: List[Callable[[str], None]] = []
+
+        # 熱集合以結果目錄為鍵 (別名共用同一組 memmap)
+        self._hot: "OrderedDict[str, _HotEntry]" = OrderedDict()
+        # 磁碟索引: job_id -> [位元組數, 最後存取時間], 依存取順序排列;
+        # 目錄大小只記在其中一個引用上 (持有者, 持有者刪除後為一個別名), 其餘為 0
+        self._index: "OrderedDict[str, list]" = OrderedDict()
+        # 別名: job_id -> 持有結果目錄的 job_id
+        self._links: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._scan()
+
+    def _scan(self) -> None:
+        """索引既有的結果目錄 (行程重啟後仍可讀取)"""
+        if not self.root.is_dir():
+            return
+        entries = []
+        links = {}
+        released = {}
+        for path in self.root.iterdir():
+            meta = path / METADATA_FILE
+            alias = path / ALIAS_FILE
+            if path.is_dir() and meta.exists():
+                size = sum(f.stat().st_size for f in path.glob("*.npy"))
+                if (path / RELEASED_FILE).exists():
+                    released[path.name] = size
+                else:
+                    entries.append((meta.stat().st_mtime, path.name, size))
+            elif path.is_dir() and alias.exists():
+                links[path.name] = json.loads(alias.read_text(encoding="utf-8"))["target"]
+                entries.append((alias.stat().st_mtime, path.name, 0))
+        owners = {job_id for _, job_id, _ in entries if job_id not in links}
+        unclaimed = dict(released)
+        for accessed, job_id, size in sorted(entries):
+            target = links.get(job_id, job_id)
+            if target in owners or target in released:
+                # 保留目錄的大小記在第一個引用它的別名上
+                self._index[job_id] = [size + unclaimed.pop(target, 0), accessed]
+        self._links = {job_id: target for job_id, target in links.items() if job_id in self._index}
+        # 已無別名引用的保留目錄
+        for storage in unclaimed:
+            shutil.rmtree(self.root / storage)
+
+    def add_evict_handler(self, handler: Callable[[str], None]) -> None:
+        """註冊結果被淘汰時的處理函式 (參數為 job_id)"""
+        self.evict_handlers.append(handler)
+
+    def add_delete_handler(self, handler: Callable[[str], None]) -> None:
+        """註冊任何結果被刪除 (含淘汰) 時的處理函式 (參數為 job_id)"""
+        self.delete_handlers.append(handler)
+
+    def _storage(self, job_id: str) -> str:
+        """持有 job_id 結果檔案的目錄名稱"""
+        return self._links.get(job_id, job_id)
+
+    def _write_alias(self, job_id: str, target: str) -> None:
+        directory = self.root / job_id
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = directory / f"{ALIAS_FILE}.tmp"
+        temporary.write_text(json.dumps({"target": target}), encoding="utf-8")
+        os.replace(temporary, directory / ALIAS_FILE)
+
+    # === 讀寫 ===
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._index
+
+    def put(self, job_id: str, result: Dict) -> Dict:
+        """寫入結果並返回以 memmap 表示的版本 (呼叫端應改用返回值, 釋放原陣列)"""
+        directory = self.root / job_id
+        directory.mkdir(parents=True, exist_ok=True)
+
+        size = 0
+        for name, array in _array_files(result):
+            array = np.asarray(array)
+            temporary = directory / f"{name}.tmp.npy"
+            np.save(temporary, array)
+            os.replace(temporary, directory / f"{name}.npy")
+            size += array.nbytes
+
+        metadata = {
+            key: value for key, value in result.items()
+            if key not in FIELD_KEYS and key != HISTORY_KEY
+        }
+        temporary = directory / f"{METADATA_FILE}.tmp"
+        temporary.write_text(json.dumps(metadata), encoding="utf-8")
+        os.replace(temporary, directory / METADATA_FILE)
+
+        with self._lock:
+            self._index[job_id] = [size, time.time()]
+            self._index.move_to_end(job_id)
+            self._hot.pop(job_id, None)
+        return self.get(job_id)
+
+    def alias(self, job_id: str, source: str) -> Optional[Dict]:
+        """
+        讓 job_id 引用 source 的結果 (不複製檔案) 並返回該結果; source 不存在時返回 None
+        """
+        with self._lock:
+            if source not in self._index:
+                return None
+            target = self._storage(source)
+            self._write_alias(job_id, target)
+            self._links[job_id] = target
+            self._index[job_id] = [0, time.time()]
+            self._index.move_to_end(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """取得結果 (流場為唯讀 memmap); 不存在時返回 None"""
+        entry = self._entry(job_id)
+        return entry.data if entry else None
+
+    def get_payload(self, job_id: str) -> Optional[bytes]:
+        """取得已快取的編碼回應內容"""
+        with self._lock:
+            entry = self._hot.get(self._storage(job_id))
+            return entry.payloads.get(job_id) if entry else None
+
+    def set_payload(self, job_id: str, payload: bytes) -> None:
+        """快取編碼後的回應內容 (計入熱集合大小)"""
+        entry = self._entry(job_id)
+        if entry is not None:
+            with self._lock:
+                entry.payloads[job_id] = payload
+                self._shrink_hot_locked()
+
+    def pop(self, job_id: str, default=None):
+        """刪除結果 (仍有其他任務引用同一目錄時保留檔案)"""
+        with self._lock:
+            found = self._index.get(job_id)
+            if found is None:
+                return default
+            storage = self._storage(job_id)
+            heirs = [
+                other for other, target in self._links.items()
+                if target == storage and other != job_id
+            ]
+
+            # 先完成磁碟操作 (失敗時拋出, 索引不變)
+            if heirs:
+                if storage == job_id:
+                    (self.root / storage / RELEASED_FILE).touch()
+                else:
+                    _remove_directory(self.root / job_id)
+            else:
+                # 最後一個引用: 先卸載 memmap 再刪除檔案
+                self._hot.pop(storage, None)
+                if storage != job_id:
+                    _remove_directory(self.root / job_id)
+                _remove_directory(self.root / storage)
+
+            del self._index[job_id]
+            self._links.pop(job_id, None)
+            if heirs:
+                # 目錄大小改記在仍引用它的別名上
+                self._index[heirs[0]][0] += found[0]
+                entry = self._hot.get(storage)
+                if entry is not None:
+                    entry.payloads.pop(job_id, None)
+
+        for handler in self.delete_handlers:
+            handler(job_id)
+        return default
+
+    def _entry(self, job_id: str) -> Optional[_HotEntry]:
+        with self._lock:
+            if job_id not in self._index:
+                return None
+            self._index[job_id][1] = time.time()
+            self._index.move_to_end(job_id)
+            storage = self._storage(job_id)
+            entry = self._hot.get(storage)
+            if entry is not None:
+                self._hot.move_to_end(storage)
+                return entry
+
+        try:
+            entry = _HotEntry(self._load(storage))
+        except FileNotFoundError:
+            # 讀取期間已被刪除或移交
+            return None
+        with self._lock:
+            entry = self._hot.setdefault(storage, entry)
+            self._shrink_hot_locked()
+        return entry
+
+    def _load(self, job_id: str) -> Dict:
+        directory = self.root / job_id
+        data = json.loads((directory / METADATA_FILE).read_text(encoding="utf-8"))
+        for key in FIELD_KEYS:
+            data[key] = np.load(directory / f"{key}.npy", mmap_mode="r")
+        data[HISTORY_KEY] = {
+            name: np.load(directory / f"history.{name}.npy", mmap_mode="r")
+            for name in HISTORY_COLUMNS
+            if (directory / f"history.{name}.npy").exists()
+        }
+        return data
+
+    def _shrink_hot_locked(self) -> None:
+        # 至少保留最近使用的一筆
+        while len(self._hot) > 1 and sum(e.nbytes for e in self._hot.values()) > self.hot_bytes:
+            self._hot.popitem(last=False)
+
+    # === 淘汰 ===
+
+    @property
+    def nbytes(self) -> int:
+        """磁碟上的結果總位元組數"""
+        with self._lock:
+            return sum(size for size, _ in self._index.values())
+
+    @property
+    def hot_nbytes(self) -> int:
+        """熱集合的位元組數"""
+        with self._lock:
+            return sum(entry.nbytes for entry in self._hot.values())
+
+    def evict(self) -> List[str]:
+        """刪除閒置超過 ttl 的結果, 再依 LRU 刪除至磁碟總量不超過 max_bytes"""
+        now = time.time()
+        evicted = []
+        with self._lock:
+            # 磁碟用量以結果目錄計; 目錄的最後一個引用被淘汰時才釋放
+            references = Counter(self._storage(job_id) for job_id in self._index)
+            sizes = Counter()
+            for job_id, (size, _) in self._index.items():
+                sizes[self._storage(job_id)] += size
+            total = sum(sizes.values())
+            for job_id, (_, accessed) in list(self._index.items()):
+                # 保留最近使用的一筆 (通常為剛寫入的結果)
+                if len(self._index) - len(evicted) <= 1:
+                    break
+                if now - accessed <= self.ttl and total <= self.max_bytes:
+                    break
+                evicted.append(job_id)
+                storage = self._storage(job_id)
+                references[storage] -= 1
+                if references[storage] == 0:
+                    total -= sizes[storage]
+
+        for job_id in evicted:
+            self.pop(job_id)
+            for handler in self.evict_handlers:
+                handler(job_id)
+        return evicted
+
+    def clear(self) -> None:
+        """刪除所有結果"""
+        with self._lock:
+            job_ids = list(self._index)
+        for job_id in job_ids:
+            self.pop(job_id)
+
+
+# 全域單例
+results_store = ResultStore(
+    root=os.path.join(settings.DATA_DIR, "results"),
+    hot_bytes=settings.RESULT_STORE_HOT_BYTES,
+    max_bytes=settings.RESULT_STORE_MAX_BYTES,
+    ttl=settings.RESULT_TTL
+)
@@ -0,0 +1,227 @@
+"""任務排程器 - 成本估計、優先權佇列與准入控制"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.simulation import SimulationParameters
+
+
+# 優先權等級 (數值小者先執行)
+PRIORITY_LEVELS = {"interactive": 0, "normal": 1, "batch": 2}
+
+
+class SchedulerRejected(Exception):
+    """佇列中的工作量已超過上限, 拒絕新任務"""
+
+
+def estimate_cost(parameters: SimulationParameters) -> float:
+    """估計任務成本 (網格點數 x 最大迭代次數)"""
+    return float(parameters.nx * parameters.ny * parameters.max_iter)
+
+
+class JobScheduler:
+    """
+    以優先權佇列管理等待中的任務, 並限制同時執行的任務數與總成本
+
+    佇列排序依 (優先權等級, 成本, 提交順序), 同等級內小任務優先;
+    等待超過 max_wait 秒的任務依提交順序提前到佇列頭, 持續有小任務提交時大任務仍會執行。
+    佇列頭的任務放不下時不跳過, 避免大任務被持續插隊。
+    所有狀態以執行緒鎖保護, 等待者可位於任意事件迴圈。
+    """
+
+    def __init__(
+        self,
+        max_running: int,
+        max_running_cost: float,
+        max_queued_cost: float,
+        throughput: float,
+        max_wait: float = 600.0
+    ):
+        self.max_running = max_running
+        self.max_running_cost = max_running_cost
+        self.max_queued_cost = max_queued_cost
+        # 單一任務的處理速率估計 (網格點·迭代 / 秒), 隨完成的任務更新
+        self.throughput = throughput
+        self.max_wait = max_wait
+
+        # (優先權等級, 成本, 提交順序, job_id, 排入時間)
+        self._queue: List[Tuple[int, float, int, str, float]] = []
+        self._waiters: Dict[str, asyncio.Future] = {}
+        # 等待中工作量: 已預留 (check_admission) 或已排入佇列的任務成本
+        self._queued_cost: Dict[str, float] = {}
+        self._running: Dict[str, Tuple[float, float]] = {}
+        # 執行中任務回報的預估: job_id -> (剩餘工作量, 剩餘秒數, 回報時間)
+        self._estimates: Dict[str, Tuple[float, float, float]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    # === 准入控制 ===
+
+    def check_admission(self, job_id: str, parameters: SimulationParameters) -> None:
+        """
+        預留新任務的成本; 會使佇列工作量超過上限時拋出 SchedulerRejected
+
+        檢查與預留在同一次鎖定內完成, 連續提交的任務不會都通過檢查;
+        預留的成本於 acquire() 排入佇列時沿用, 或於 release() 時釋放
+        """
+        cost = estimate_cost(parameters)
+        with self._lock:
+            queued = sum(self._queued_cost.values())
+            if queued + cost > self.max_queued_cost:
+                raise SchedulerRejected(
+                    f"排程佇列已滿 (等待中工作量 {queued:.3g}, 新任務 {cost:.3g}, 上限 {self.max_queued_cost:.3g})"
+                )
+            self._queued_cost[job_id] = cost
+
+    # === 執行槽位 ===
+
+    async def acquire(self, job_id: str, parameters: SimulationParameters) -> bool:
+        """
+        排入佇列並等待執行槽位
+
+        返回:
+            取得槽位時為 True; 等待期間被 release() 撤回時為 False
+        """
+        cost = estimate_cost(parameters)
+        priority = PRIORITY_LEVELS[parameters.priority]
+        future = asyncio.get_running_loop().create_future()
+
+        with self._lock:
+            heapq.heappush(self._queue, (priority, cost, next(self._seq), job_id, time.monotonic()))
+            self._queued_cost[job_id] = cost
+            self._waiters[job_id] = future
+            self._dispatch_locked()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self.release(job_id)
+            raise
+
+    def release(self, job_id: str, work: Optional[float] = None, elapsed: Optional[float] = None) -> None:
+        """
+        任務結束時釋放槽位; 對仍在佇列中的任務則將其撤回 (含尚未排入佇列的預留成本)
+
+        參數:
+            work: 實際完成的工作量 (網格點·迭代), 用於更新處理速率估計
+            elapsed: 實際執行秒數
+        """
+        with self._lock:
+            self._running.pop(job_id, None)
+            self._estimates.pop(job_id, None)
+            self._remove_queued_locked(job_id)
+            if work and elapsed and elapsed > 0:
+                self.throughput = 0.8 * self.throughput + 0.2 * (work / elapsed)
+            self._dispatch_locked()
+
+    def report_progress(
+        self, job_id: str, done_work: float, remaining_work: float, remaining_seconds: float
+    ) -> None:
+        """
+        執行中任務回報求解器的剩餘量預估 (依殘差衰減率)
+
+        任務成本改為預估的總工作量 (已完成 + 剩餘), 取代以 max_iter 估計的上限,
+        槽位分配與等待時間估計皆使用此值
+        """
+        with self._lock:
+            if job_id not in self._running:
+                return
+            _, started = self._running[job_id]
+            self._running[job_id] = (done_work + remaining_work, started)
+            self._estimates[job_id] = (remaining_work, remaining_seconds, time.monotonic())
+            self._dispatch_locked()
+
+    def estimated_remaining(self, job_id: str) -> Optional[float]:
+        """執行中任務的預估剩餘秒數 (尚未回報時為 None)"""
+        with self._lock:
+            estimate = self._estimates.get(job_id)
+        if estimate is None:
+            return None
+        _, seconds, reported = estimate
+        return max(seconds - (time.monotonic() - reported), 0.0)
+
+    def _remove_queued_locked(self, job_id: str) -> None:
+        if self._queued_cost.pop(job_id, None) is None:
+            return
+        self._queue = [entry for entry in self._queue if entry[3] != job_id]
+        heapq.heapify(self._queue)
+        future = self._waiters.pop(job_id, None)
+        if future is not None:
+            future.get_loop().call_soon_threadsafe(_resolve_future, future, False)
+
+    def _ordered_locked(self) -> List[Tuple[int, float, int, str, float]]:
+        """依執行順序排列的佇列: 等待逾時者依提交順序在前, 其餘依 (優先權, 成本, 提交順序)"""
+        deadline = time.monotonic() - self.max_wait
+        overdue = sorted((entry for entry in self._queue if entry[4] <= deadline), key=lambda e: e[2])
+        waiting = sorted(entry for entry in self._queue if entry[4] > deadline)
+        return overdue + waiting
+
+    def _dispatch_locked(self) -> None:
+        while self._queue:
+            head = self._ordered_locked()[0]
+            _, cost, _, job_id, _ = head
+            running_cost = sum(c for c, _ in self._running.values())
+            if len(self._running) >= self.max_running:
+                break
+            if self._running and running_cost + cost > self.max_running_cost:
+                break
+
+            if head is self._queue[0]:
+                heapq.heappop(self._queue)
+            else:
+                self._queue.remove(head)
+                heapq.heapify(self._queue)
+            self._queued_cost.pop(job_id, None)
+            self._running[job_id] = (cost, time.monotonic())
+            future = self._waiters.pop(job_id)
+            future.get_loop().call_soon_threadsafe(_resolve_future, future, True)
+
+    # === 佇列資訊 ===
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """佇列中的位置 (1 起算), 不在佇列中時為 None"""
+        with self._lock:
+            order = [entry[3] for entry in self._ordered_locked()]
+        if job_id not in order:
+            return None
+        return order.index(job_id) + 1
+
+    def estimated_wait(self, job_id: str) -> Optional[float]:
+        """預估開始執行前的等待秒數"""
+        with self._lock:
+            ahead = self._ordered_locked()
+            running = [(self._running[key], self._estimates.get(key)) for key in self._running]
+        ids = [entry[3] for entry in ahead]
+        if job_id not in ids:
+            return None
+
+        # 執行中任務的剩餘工作量: 有回報時以回報值為準, 否則以成本扣除已執行時間估計
+        now = time.monotonic()
+        remaining = 0.0
+        for (cost, started), estimate in running:
+            if estimate is not None:
+                work, _, reported = estimate
+                remaining += max(work - (now - reported) * self.throughput, 0.0)
+            else:
+                remaining += max(cost - (now - started) * self.throughput, 0.0)
+        remaining += sum(entry[1] for entry in ahead[:ids.index(job_id)])
+        return remaining / (self.throughput * self.max_running)
+
+
+def _resolve_future(future: asyncio.Future, started: bool) -> None:
+    if not future.done():
+        future.set_result(started)
+
+
+# 全域單例
+job_scheduler = JobScheduler(
+    max_running=settings.SCHEDULER_MAX_RUNNING,
+    max_running_cost=settings.SCHEDULER_MAX_RUNNING_COST,
+    max_queued_cost=settings.SCHEDULER_MAX_QUEUED_COST,
+    throughput=settings.SCHEDULER_THROUGHPUT,
+    max_wait=settings.SCHEDULER_MAX_WAIT
+)
@@ -0,0 +1,142 @@
+"""結果序列化 (JSON、原始緩衝區與 .npz) 與內容協商"""
+import io
+import json
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
+
+
+# 支援的回應格式
+JSON_MEDIA_TYPE = "application/json"
+RAW_MEDIA_TYPE = "application/octet-stream"
+NPZ_MEDIA_TYPE = "application/x-npz"
+SUPPORTED_MEDIA_TYPES = (JSON_MEDIA_TYPE, RAW_MEDIA_TYPE, NPZ_MEDIA_TYPE)
+
+# 原始格式: 魔術字串 + 標頭長度 (uint32, 小端序) + JSON 標頭 + 各欄位緩衝區
+RAW_MAGIC = b"CFDR"
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def negotiate(accept: Optional[str], supported: Iterable[str] = SUPPORTED_MEDIA_TYPES) -> Optional[str]:
+    """
+    依 Accept 標頭選擇回應格式
+
+    依 q 值排序 (同 q 值保持原順序), 萬用字元對應到 supported 的第一項;
+    Accept 為空時返回 supported 的第一項, 沒有可接受的格式時返回 None
+    """
+    supported = list(supported)
+    if not accept:
+        return supported[0]
+
+    candidates = []
+    for index, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, index, media_type.lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in supported:
+            return media_type
+        if media_type == "*/*":
+            return supported[0]
+        if media_type.endswith("/*"):
+            prefix = media_type[:-1]
+            for option in supported:
+                if option.startswith(prefix):
+                    return option
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    """標準 json 無法處理的 numpy 型別"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"無法序列化為 JSON: {type(value).__name__}")
+
+
+def encode_json(payload: Dict) -> bytes:
+    """
+    將含 ndarray 的結果編碼為 JSON (不經 Pydantic 驗證)
+
+    有 orjson 時直接由 ndarray 緩衝區輸出, 否則經 tolist() 以標準 json 輸出
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY, default=_json_default)
+    return json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _little_endian(array: np.ndarray, dtype: str) -> np.ndarray:
+    """轉為指定精度的小端序連續陣列 (已符合時不複製)"""
+    return np.ascontiguousarray(array, dtype=np.dtype(dtype).newbyteorder("<"))
+
+
+def encode_raw(fields: Dict[str, np.ndarray], metadata: Dict, dtype: str = "float64") -> bytes:
+    """
+    編碼為原始二進位格式
+
+    標頭 JSON 包含 metadata 與各欄位的 {name, dtype, shape, offset, nbytes},
+    offset 以緩衝區區段的起點 (標頭之後) 起算
+    """
+    arrays = {name: _little_endian(value, dtype) for name, value in fields.items()}
+    entries = []
+    offset = 0
+    for name, array in arrays.items():
+        entries.append({
+            "name": name,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+            "nbytes": array.nbytes
+        })
+        offset += array.nbytes
+
+    header = json.dumps({"metadata": metadata, "fields": entries}).encode("utf-8")
+    buffer = io.BytesIO()
+    buffer.write(RAW_MAGIC)
+    buffer.write(_HEADER_LENGTH.pack(len(header)))
+    buffer.write(header)
+    for array in arrays.values():
+        buffer.write(memoryview(array).cast("B"))
+    return buffer.getvalue()
+
+
+def decode_raw(data: bytes) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """解碼原始二進位格式, 返回 (欄位, metadata); 欄位為指向 data 的唯讀檢視"""
+    if data[:4] != RAW_MAGIC:
+        raise ValueError("不是有效的結果二進位格式")
+    (length,) = _HEADER_LENGTH.unpack_from(data, 4)
+    start = 4 + _HEADER_LENGTH.size
+    header = json.loads(data[start:start + length].decode("utf-8"))
+    body = start + length
+
+    fields = {}
+    for entry in header["fields"]:
+        count = int(np.prod(entry["shape"]))
+        fields[entry["name"]] = np.frombuffer(
+            data, dtype=entry["dtype"], count=count, offset=body + entry["offset"]
+        ).reshape(entry["shape"])
+    return fields, header["metadata"]
+
+
+def encode_npz(fields: Dict[str, np.ndarray], metadata: Dict, dtype: str = "float64") -> bytes:
+    """編碼為 .npz (未壓縮); metadata 以 JSON 字串存於 'metadata' 項目"""
+    arrays = {name: _little_endian(value, dtype) for name, value in fields.items()}
+    buffer = io.BytesIO()
+    np.savez(buffer, metadata=np.array(json.dumps(metadata)), **arrays)
+    return buffer.getvalue()
@@ -1,18 +1,42 @@
 """求解器服務 - 管理模擬任務"""
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+import os
 import uuid
 import asyncio
 
-from app.models.simulation import SimulationJob, SimulationParameters, JobStatus
-from app.models.results import FlowFieldResults
-from app.core.solver import solve_cavity_flow
+import numpy as np
+
+from app.models.simulation import SimulationJob, SimulationParameters, JobStatus, SolverOutcome
+from app.models.results import ConvergenceHistoryPage, FlowFieldResults
+from app.core.config import settings
+from app.core.solver import FIELD_KEYS, HISTORY_COLUMNS, Checkpointer, SnapshotEmitter, SolverCancelled
 from app.api.websocket import manager
+from app.services.executor import solver_executor
+from app.services.job_registry import job_registry
+from app.services.progress import ProgressChannel
+from app.services.result_cache import canonical_key, result_cache
+from app.services.result_query import SELECTABLE_FIELDS, select_fields
+from app.services.result_store import results_store
+from app.services.serialization import encode_json
+from app.services.scheduler import estimate_cost, job_scheduler
+
+
+# 任務資訊由 SQLite 任務登錄保存 (狀態變更後須呼叫 save); 結果由 results_store 寫入磁碟
+jobs_store = job_registry
+# 排隊中或執行中任務的取消旗標
+cancel_events: Dict[str, Any] = {}
+# 執行中任務的快照啟用旗標 (有 WebSocket 連線訂閱快照時設定)
+snapshot_flags: Dict[str, Any] = {}
+# 參數快取鍵 -> 尚未結束的任務 ID (用於合併相同的提交)
+inflight_jobs: Dict[str, str] = {}
 
+# 不裁切的子區域 (x 方向, y 方向)
+FULL_WINDOW = (slice(None), slice(None))
 
-# 記憶體儲存 (MVP 階段)
-jobs_store: Dict[str, SimulationJob] = {}
-results_store: Dict[str, Dict] = {}
+# 尚未結束的任務狀態
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING)
 
 
 class SolverService:
@@ -20,82 +44,530 @@ class SolverService:
 
     @staticmethod
     def create_job(parameters: SimulationParameters) -> SimulationJob:
-        """建立新的模擬任務"""
+        """
+        建立新的模擬任務
+
+        相同參數的任務尚未結束時直接返回該任務;
+        快取中已有結果時建立狀態為 COMPLETED 的任務, 不再求解。
+        佇列工作量超過上限時拋出 SchedulerRejected;
+        initial_condition 指定的任務不存在或無結果時拋出 ValueError
+        """
+        results_store.evict()
+        _prune_finished_jobs()
+        source = parameters.initial_condition
+        if source not in (None, "auto") and source not in results_store:
+            raise ValueError(f"初始條件任務不存在或尚無結果: {source}")
+
+        key = canonical_key(parameters)
+        running = jobs_store.get(inflight_jobs.get(key, ""))
+        if running and running.status in ACTIVE_STATUSES:
+            result_cache.record_coalesced()
+            return running
+
         job_id = str(uuid.uuid4())
+        source_id = result_cache.get(key)
+        # 命中時以別名引用既有結果 (不重寫檔案); 結果已被刪除時視同未命中
+        cached = results_store.alias(job_id, source_id) if source_id is not None else None
+        if cached is None:
+            job_scheduler.check_admission(job_id, parameters)
+
+        now = datetime.now()
         job = SimulationJob(
             job_id=job_id,
             parameters=parameters,
             status=JobStatus.PENDING,
-            created_at=datetime.now()
+            created_at=now
         )
-        jobs_store[job_id] = job
+        if cached is not None:
+            job.status = JobStatus.COMPLETED
+            job.started_at = now
+            job.completed_at = now
+            job.cached = True
+            job.outcome = _outcome(cached)
+        else:
+            inflight_jobs[key] = job_id
+        jobs_store.save(job, _result_summary(cached) if cached is not None else None)
         return job
 
+    @staticmethod
+    def recover_jobs() -> List[str]:
+        """
+        重新排入上次行程結束時尚未完成的任務 (啟動時呼叫)
+
+        RUNNING、QUEUED 與 PENDING 的任務重設為 PENDING;
+        返回須以 run_simulation 重新執行的任務 ID
+        """
+        recovered = jobs_store.ids_by_status(*ACTIVE_STATUSES)
+        for job_id in recovered:
+            job = jobs_store[job_id]
+            job.status = JobStatus.PENDING
+            job.started_at = None
+            job.queue_position = None
+            job.estimated_wait = None
+            inflight_jobs[canonical_key(job.parameters)] = job_id
+            jobs_store.save(job)
+        return recovered
+
+    @staticmethod
+    def resolve_initial_state(job: SimulationJob) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        取得暖啟動初始流場
+
+        "auto" 時由已收斂 (COMPLETED 且 outcome 為 CONVERGED) 的結果中選參數最接近者;
+        流場含 NaN/inf 的結果不使用。
+
+        返回:
+            (initial_state, 來源 job_id); 未指定或找不到可用結果時為 (None, None)
+        """
+        source = job.parameters.initial_condition
+        if source is None:
+            return None, None
+        if source != "auto":
+            return _warm_start_state(source)
+
+        # 只考慮已收斂的結果, 依參數距離由近到遠取第一個流場皆為有限值者
+        candidates = [
+            other for other_id, other in jobs_store.items()
+            if other_id != job.job_id and other_id in results_store
+            and other.status == JobStatus.COMPLETED and other.outcome == SolverOutcome.CONVERGED
+        ]
+        candidates.sort(key=lambda other: _parameter_distance(job.parameters, other.parameters))
+        for candidate in candidates:
+            state, source = _warm_start_state(candidate.job_id)
+            if state is not None:
+                return state, source
+        return None, None
+
+    @staticmethod
+    def cache_stats() -> Dict:
+        """結果快取統計"""
+        return result_cache.stats()
+
     @staticmethod
     def get_job(job_id: str) -> Optional[SimulationJob]:
-        """取得任務資訊"""
-        return jobs_store.get(job_id)
+        """取得任務資訊 (排隊中的任務附上佇列位置與預估等待時間, 執行中的任務附上預估剩餘時間)"""
+        job = jobs_store.get(job_id)
+        if job and job.status == JobStatus.QUEUED:
+            job.queue_position = job_scheduler.queue_position(job_id)
+            job.estimated_wait = job_scheduler.estimated_wait(job_id)
+        elif job and job.status == JobStatus.RUNNING:
+            job.estimated_remaining = job_scheduler.estimated_remaining(job_id)
+        return job
 
     @staticmethod
     def get_results(job_id: str) -> Optional[FlowFieldResults]:
-        """取得模擬結果"""
+        """取得模擬結果 (流場轉為巢狀 list)"""
         if job_id not in results_store:
             return None
 
-        data = results_store[job_id]
+        data = dict(results_store.get(job_id))
+        for key in FIELD_KEYS:
+            data[key] = data[key].tolist()
+        data["history_length"] = _history_length(data)
+        data.pop("convergence_history", None)
         return FlowFieldResults(
             job_id=job_id,
             **data
         )
 
+    @staticmethod
+    def get_results_json(
+        job_id: str,
+        fields: Sequence[str] = SELECTABLE_FIELDS,
+        stride: int = 1,
+        window: Tuple[slice, slice] = FULL_WINDOW,
+        dtype: str = "float64"
+    ) -> Optional[bytes]:
+        """
+        取得 JSON 編碼的模擬結果 (未指定查詢條件時內容同 FlowFieldResults)
+
+        儲存的結果由求解器產生, 不再經 Pydantic 驗證; 直接由 ndarray 序列化。
+        完整結果的編碼快取供重複查詢使用; 帶查詢條件時只複製所選部分。
+        """
+        full = (tuple(fields), stride, window, dtype) == (SELECTABLE_FIELDS, 1, FULL_WINDOW, "float64")
+        if full:
+            cached = results_store.get_payload(job_id)
+            if cached is not None:
+                return cached
+
+        data = results_store.get(job_id)
+        if data is None:
+            return None
+        selected = select_fields(data, fields, stride, window)
+        for name, value in selected.items():
+            if isinstance(value, np.ndarray):
+                selected[name] = np.ascontiguousarray(value, dtype=dtype)
+
+        payload = {"job_id": job_id, **selected}
+        payload["final_residuals"] = data["final_residuals"]
+        payload["initial_condition"] = data.get("initial_condition")
+        payload["outcome"] = data.get("outcome")
+        payload["levels"] = data.get("levels")
+        payload["history_length"] = _history_length(data)
+        if not full:
+            payload["query"] = _describe_query(stride, window, dtype)
+        encoded = encode_json(payload)
+        if full:
+            results_store.set_payload(job_id, encoded)
+        return encoded
+
+    @staticmethod
+    def get_result_arrays(
+        job_id: str,
+        fields: Sequence[str] = FIELD_KEYS,
+        stride: int = 1,
+        window: Tuple[slice, slice] = FULL_WINDOW
+    ) -> Optional[Tuple[Dict[str, np.ndarray], Dict]]:
+        """
+        取得流場陣列與摘要資訊 (供二進位格式使用, 返回儲存陣列的檢視)
+
+        返回:
+            (欄位, metadata); 無結果時為 None
+        """
+        data = results_store.get(job_id)
+        if data is None:
+            return None
+        selected = select_fields(data, [name for name in fields if name in FIELD_KEYS], stride, window)
+        metadata = {
+            "job_id": job_id,
+            "final_residuals": data["final_residuals"],
+            "total_iterations": data["total_iterations"],
+            "elapsed_time": data["elapsed_time"],
+            "converged": data["converged"],
+            "outcome": data.get("outcome"),
+            "levels": data.get("levels"),
+            "initial_condition": data.get("initial_condition"),
+            "history_length": _history_length(data),
+            "query": _describe_query(stride, window)
+        }
+        return selected, metadata
+
+    @staticmethod
+    def get_history(job_id: str, offset: int = 0, limit: int = 1000) -> Optional[ConvergenceHistoryPage]:
+        """取得收斂歷史的一頁 (只讀取所需範圍); 無結果時返回 None"""
+        data = results_store.get(job_id)
+        if data is None:
+            return None
+        columns = data.get("convergence_history", {})
+        page = {
+            name: columns[name][offset:offset + limit].tolist()
+            for name in HISTORY_COLUMNS if name in columns
+        }
+        return ConvergenceHistoryPage(
+            job_id=job_id,
+            total=_history_length(data),
+            offset=offset,
+            limit=limit,
+            **page
+        )
+
+    @staticmethod
+    def cancel_job(job_id: str) -> bool:
+        """
+        取消任務
+
+        執行中的任務設定取消旗標, 求解器於下一次外迭代開始時停止;
+        尚在排隊的任務直接標記為 CANCELLED 並自佇列撤回。
+
+        返回:
+            任務存在且尚未結束時為 True
+        """
+        job = jobs_store.get(job_id)
+        if not job or job.status not in ACTIVE_STATUSES:
+            return False
+
+        event = cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+        if job.status != JobStatus.RUNNING:
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.now()
+            job.queue_position = None
+            job.estimated_wait = None
+            jobs_store.save(job)
+            job_scheduler.release(job_id)
+            _release_inflight(job)
+        results_store.pop(job_id, None)
+        return True
+
+    @staticmethod
+    def delete_job(job_id: str) -> bool:
+        """刪除已結束的任務及其結果"""
+        job = jobs_store.get(job_id)
+        if not job or job.status in ACTIVE_STATUSES:
+            return False
+        del jobs_store[job_id]
+        _release_inflight(job)
+        results_store.pop(job_id, None)
+        _checkpointer(job_id).remove()
+        return True
+
+    @staticmethod
+    def resume_job(job_id: str) -> Optional[SimulationJob]:
+        """
+        重新執行已取消或失敗的任務 (有檢查點時由檢查點續算)
+
+        返回:
+            重設為 PENDING 的任務; 任務不存在或狀態不可續算時為 None。
+            佇列工作量超過上限時拋出 SchedulerRejected
+        """
+        job = jobs_store.get(job_id)
+        if not job or job.status not in (JobStatus.CANCELLED, JobStatus.FAILED):
+            return None
+        job_scheduler.check_admission(job_id, job.parameters)
+
+        job.status = JobStatus.PENDING
+        job.started_at = None
+        job.completed_at = None
+        job.error_message = None
+        inflight_jobs.setdefault(canonical_key(job.parameters), job_id)
+        jobs_store.save(job)
+        return job
+
+    @staticmethod
+    def handle_disconnect(job_id: str) -> None:
+        """任務的最後一個 WebSocket 連線中斷時, 依任務設定取消任務"""
+        job = jobs_store.get(job_id)
+        if job and job.parameters.cancel_on_disconnect:
+            SolverService.cancel_job(job_id)
+
+    @staticmethod
+    def handle_snapshot_demand(job_id: str, wanted: bool) -> None:
+        """任務的快照訂閱者出現或全部離開時, 啟用或停用求解器端的快照取樣"""
+        flag = snapshot_flags.get(job_id)
+        if flag is None:
+            return
+        if wanted:
+            flag.set()
+        else:
+            flag.clear()
+
     @staticmethod
     async def run_simulation(job_id: str):
         """執行模擬 (背景任務)"""
         job = jobs_store.get(job_id)
-        if not job:
+        if not job or job.status != JobStatus.PENDING:
+            # 排隊前已取消或刪除: 不留下指向已結束任務的合併項目
+            if job is not None:
+                _release_inflight(job)
             return
 
-        # 更新狀態為 RUNNING
-        job.status = JobStatus.RUNNING
-        job.started_at = datetime.now()
+        cancel_event = solver_executor.create_event()
+        cancel_events[job_id] = cancel_event
+        work = elapsed = None
 
         try:
-            # 定義同步進度回調 (在執行緒中呼叫)
-            def progress_callback(progress_data: dict):
-                """進度回調 - 透過 WebSocket 發送進度"""
-                # 使用 asyncio.run_coroutine_threadsafe 從執行緒安全地呼叫協程
-                asyncio.run_coroutine_threadsafe(
-                    manager.send_progress(job_id, progress_data),
-                    loop
-                )
+            # 排入排程佇列, 等待執行槽位 (被撤回時返回 False)
+            job.status = JobStatus.QUEUED
+            jobs_store.save(job)
+            started = await job_scheduler.acquire(job_id, job.parameters)
+            if not started or cancel_event.is_set():
+                raise SolverCancelled(0)
 
-            # 在執行緒池中執行求解器
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                solve_cavity_flow,
-                job.parameters,
-                progress_callback
+            # 更新狀態為 RUNNING
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now()
+            job.queue_position = None
+            job.estimated_wait = None
+            jobs_store.save(job)
+
+            # 進度經由最新值槽位合併, 依速率上限送到 WebSocket (求解器執行緒只覆寫槽位)
+            progress = ProgressChannel(
+                asyncio.get_running_loop(),
+                lambda data: _publish_progress(job, data),
+                1.0 / settings.PROGRESS_MAX_RATE
+            )
+
+            # 快照只在有連線訂閱時取樣, 同樣經由最新值槽位合併
+            snapshot_flag = solver_executor.create_event()
+            snapshot_flags[job_id] = snapshot_flag
+            SolverService.handle_snapshot_demand(job_id, manager.wants_snapshots(job_id))
+            snapshots = SnapshotEmitter(
+                snapshot_flag, settings.SNAPSHOT_EVERY, settings.SNAPSHOT_MAX_POINTS
             )
+            snapshot_channel = ProgressChannel(
+                asyncio.get_running_loop(),
+                lambda data: manager.send_snapshot(job_id, data),
+                1.0 / settings.SNAPSHOT_MAX_RATE
+            )
+
+            # 在執行後端 (行程池或執行緒池) 中執行求解器
+            initial_state, source = SolverService.resolve_initial_state(job)
+            checkpointer = _checkpointer(job_id)
+            try:
+                result = await solver_executor.run(
+                    job.parameters, progress.publish, cancel_event, initial_state, checkpointer,
+                    snapshots, snapshot_channel.publish
+                )
+            finally:
+                await progress.close()
+                await snapshot_channel.close()
+            checkpointer.remove()
+            result["initial_condition"] = source
+            work = estimate_cost(job.parameters) * result["total_iterations"] / job.parameters.max_iter
+            elapsed = result["elapsed_time"]
 
-            # 儲存結果
-            results_store[job_id] = result
+            # 寫入結果檔案, 之後改由 memmap 讀取 (回應時才序列化)
+            stored = await asyncio.to_thread(results_store.put, job_id, result)
+            results_store.evict()
+            result_cache.put(canonical_key(job.parameters), job_id, stored)
 
-            # 更新狀態為 COMPLETED
+            # 更新狀態為 COMPLETED (停滯提前結束的任務同樣為 COMPLETED, 以 outcome 區分)
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.now()
+            job.estimated_remaining = None
+            job.outcome = _outcome(result)
+            jobs_store.save(job, _result_summary(result))
 
             # 發送完成訊息
-            await manager.send_completion(job_id, True, "模擬已完成")
+            await manager.send_completion(job_id, True, _COMPLETION_MESSAGES[job.outcome])
+
+        except SolverCancelled:
+            # 取消的任務不保留結果
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.now()
+            job.queue_position = None
+            job.estimated_wait = None
+            job.estimated_remaining = None
+            jobs_store.save(job)
+            results_store.pop(job_id, None)
+            await manager.send_completion(job_id, False, "模擬已取消")
 
         except Exception as e:
             # 更新狀態為 FAILED
             job.status = JobStatus.FAILED
             job.error_message = str(e)
             job.completed_at = datetime.now()
+            job.estimated_remaining = None
+            jobs_store.save(job)
 
             # 發送錯誤訊息
             await manager.send_completion(job_id, False, f"模擬失敗: {str(e)}")
 
+        finally:
+            cancel_events.pop(job_id, None)
+            snapshot_flags.pop(job_id, None)
+            _release_inflight(job)
+            job_scheduler.release(job_id, work, elapsed)
+
+
+async def _publish_progress(job: SimulationJob, data: Dict) -> None:
+    """將求解器的剩餘量預估回報給排程器 (網格序列時只回報最細層), 並送出進度訊息"""
+    final_level = data.get("level", 0) == data.get("levels", 1) - 1
+    if final_level and data.get("estimated_iterations") is not None:
+        points = job.parameters.nx * job.parameters.ny
+        job_scheduler.report_progress(
+            job.job_id,
+            points * (data["iteration"] + 1),
+            points * data["estimated_iterations"],
+            data["estimated_remaining"]
+        )
+    await manager.send_progress(job.job_id, data)
+
+
+def _checkpointer(job_id: str) -> Checkpointer:
+    """任務的檢查點 (DATA_DIR/checkpoints/<job_id>.npz)"""
+    return Checkpointer(
+        os.path.join(settings.DATA_DIR, "checkpoints", f"{job_id}.npz"),
+        every_iterations=settings.CHECKPOINT_EVERY_ITERATIONS,
+        every_seconds=settings.CHECKPOINT_EVERY_SECONDS
+    )
+
+
+def _result_summary(result: Dict) -> Dict:
+    """登錄於任務資料庫的結果摘要"""
+    return {
+        "total_iterations": result["total_iterations"],
+        "converged": result["converged"],
+        "outcome": result.get("outcome"),
+        "final_residuals": result["final_residuals"],
+        "elapsed_time": result["elapsed_time"]
+    }
+
+
+# 各結束原因的完成訊息
+_COMPLETION_MESSAGES = {
+    SolverOutcome.CONVERGED: "模擬已完成",
+    SolverOutcome.STAGNATED: "模擬已完成 (殘差停滯, 提前結束)",
+    SolverOutcome.MAX_ITER: "模擬已完成 (達最大迭代次數, 未收斂)",
+}
+
+
+def _outcome(result: Dict) -> SolverOutcome:
+    """結果的結束原因 (舊版結果只記錄是否收斂)"""
+    if result.get("outcome"):
+        return SolverOutcome(result["outcome"])
+    return SolverOutcome.CONVERGED if result["converged"] else SolverOutcome.MAX_ITER
+
+
+def _warm_start_state(source: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """讀取 source 的流場作為暖啟動初始值; 無結果或含 NaN/inf 時為 (None, None)"""
+    result = results_store.get(source)
+    source_job = jobs_store.get(source)
+    if result is None or source_job is None:
+        return None, None
+    state = {key: np.asarray(result[key]) for key in ("pressure", "velocity_u", "velocity_v")}
+    if not all(np.isfinite(field).all() for field in state.values()):
+        return None, None
+    state["lid_velocity"] = source_job.parameters.lid_velocity
+    return state, source
+
+
+def _release_inflight(job: SimulationJob) -> None:
+    """任務結束時移除相同參數提交的合併項目 (仍指向此任務時)"""
+    key = canonical_key(job.parameters)
+    if inflight_jobs.get(key) == job.job_id:
+        del inflight_jobs[key]
+
+
+def _history_length(data: Dict) -> int:
+    """儲存結果中的收斂歷史取樣數"""
+    iterations = data.get("convergence_history", {}).get("iteration")
+    return 0 if iterations is None else len(iterations)
+
+
+def _prune_finished_jobs() -> None:
+    """移除結束超過 RESULT_TTL 且已無結果的任務記錄"""
+    cutoff = datetime.now() - timedelta(seconds=settings.RESULT_TTL)
+    expired = [
+        job_id for job_id, job in jobs_store.items()
+        if job.status not in ACTIVE_STATUSES
+        and job.completed_at is not None and job.completed_at < cutoff
+        and job_id not in results_store
+    ]
+    for job_id in expired:
+        del jobs_store[job_id]
+        _checkpointer(job_id).remove()
+
+
+def _forget_job(job_id: str) -> None:
+    """結果被淘汰時一併移除已結束的任務記錄"""
+    job = jobs_store.get(job_id)
+    if job is not None and job.status not in ACTIVE_STATUSES:
+        del jobs_store[job_id]
+        _checkpointer(job_id).remove()
+
+
+def _describe_query(stride: int, window: Tuple[slice, slice], dtype: Optional[str] = None) -> Dict:
+    """查詢條件摘要 (window 為 [i0, i1, j0, j1], 未指定的端點為 None)"""
+    xs, ys = window
+    description = {"stride": stride, "window": [xs.start, xs.stop, ys.start, ys.stop]}
+    if dtype is not None:
+        description["dtype"] = dtype
+    return description
+
+
+def _parameter_distance(a: SimulationParameters, b: SimulationParameters) -> float:
+    """暖啟動候選的參數距離 (Reynolds 數與網格尺寸的對數差)"""
+    return (
+        abs(math.log(a.reynolds_number / b.reynolds_number))
+        + abs(math.log(a.nx / b.nx))
+        + abs(math.log(a.ny / b.ny))
+    )
+
 
 solver_service = SolverService()
+manager.add_disconnect_handler(solver_service.handle_disconnect)
+manager.add_snapshot_handler(solver_service.handle_snapshot_demand)
+results_store.add_evict_handler(_forget_job)
+results_store.add_delete_handler(result_cache.discard_job)
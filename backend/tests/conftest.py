@@ -0,0 +1,5 @@
+"""測試設定: 結果檔案寫入暫存目錄"""
+import os
+import tempfile
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="cfd-test-"))
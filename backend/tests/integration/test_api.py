@@ -63,7 +63,7 @@ def test_get_simulation_status():
 
     data = response.json()
     assert data["job_id"] == job_id
-    assert data["status"] in ["PENDING", "RUNNING", "COMPLETED", "FAILED"]
+    assert data["status"] in ["PENDING", "QUEUED", "RUNNING", "COMPLETED", "FAILED", "CANCELLED"]
 
 
 def test_get_simulation_not_found():
@@ -82,3 +82,238 @@ def test_create_simulation_invalid_parameters():
 
     response = client.post("/api/simulations", json=parameters)
     assert response.status_code == 422  # Validation error
+
+
+def test_create_simulation_rejected_when_queue_full(monkeypatch):
+    """測試排程佇列工作量超過上限時返回 429"""
+    from app.services.scheduler import job_scheduler
+    monkeypatch.setattr(job_scheduler, "max_queued_cost", 1.0)
+
+    response = client.post("/api/simulations", json={"reynolds_number": 100.0})
+    assert response.status_code == 429
+
+
+def test_delete_finished_simulation():
+    """測試刪除已結束的任務後查詢返回 404"""
+    create_response = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 100.0, "nx": 11, "ny": 11, "max_iter": 100}
+    )
+    job_id = create_response.json()["job_id"]
+
+    response = client.delete(f"/api/simulations/{job_id}")
+    assert response.status_code == 204
+    assert client.get(f"/api/simulations/{job_id}").status_code == 404
+    assert client.delete(f"/api/simulations/{job_id}").status_code == 404
+
+
+def test_identical_submission_served_from_cache():
+    """測試相同參數的第二次提交直接取用快取結果"""
+    parameters = {"reynolds_number": 123.0, "nx": 11, "ny": 11, "max_iter": 100}
+    first = client.post("/api/simulations", json=parameters).json()
+    hits = client.get("/api/simulations/cache/stats").json()["hits"]
+
+    second = client.post("/api/simulations", json={**parameters, "priority": "batch"})
+    assert second.status_code == 201
+    data = second.json()
+    assert data["job_id"] != first["job_id"]
+    assert data["status"] == "COMPLETED"
+    assert data["cached"] is True
+    assert client.get("/api/simulations/cache/stats").json()["hits"] == hits + 1
+
+    first_results = client.get(f"/api/simulations/{first['job_id']}/results").json()
+    second_results = client.get(f"/api/simulations/{data['job_id']}/results").json()
+    assert first_results["pressure"] == second_results["pressure"]
+
+    # 原任務刪除後別名仍可讀取; 快取項目隨原結果移除
+    assert client.delete(f"/api/simulations/{first['job_id']}").status_code == 204
+    assert client.get(f"/api/simulations/{data['job_id']}/results").json()["pressure"] == first_results["pressure"]
+    third = client.post("/api/simulations", json=parameters).json()
+    assert third["cached"] is False
+
+
+def test_create_simulation_unknown_initial_condition():
+    """測試 initial_condition 指定不存在的任務時返回 400"""
+    response = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 100.0, "initial_condition": "non-existent-id"}
+    )
+    assert response.status_code == 400
+
+
+def test_simulation_warm_start_auto():
+    """測試 initial_condition='auto' 由最接近的已完成結果暖啟動"""
+    source = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 150.0, "nx": 11, "ny": 11, "max_iter": 500}
+    ).json()
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 160.0, "nx": 11, "ny": 11, "max_iter": 500, "initial_condition": "auto"}
+    ).json()
+
+    results = client.get(f"/api/simulations/{job['job_id']}/results").json()
+    assert results["initial_condition"] == source["job_id"]
+
+
+def test_get_results_binary_formats():
+    """測試結果的原始二進位與 npz 格式和 JSON 一致"""
+    import io
+    import numpy as np
+    from app.services.serialization import decode_raw
+
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 100.0, "nx": 13, "ny": 11, "max_iter": 100}
+    ).json()
+    url = f"/api/simulations/{job['job_id']}/results"
+    reference = client.get(url).json()
+
+    raw = client.get(url, headers={"Accept": "application/octet-stream"})
+    assert raw.headers["content-type"] == "application/octet-stream"
+    fields, metadata = decode_raw(raw.content)
+    assert metadata["job_id"] == job["job_id"]
+    assert fields["velocity_u"].shape == (11, 12)
+    np.testing.assert_array_equal(fields["pressure"], reference["pressure"])
+
+    npz = client.get(url, params={"dtype": "float32"}, headers={"Accept": "application/x-npz"})
+    with np.load(io.BytesIO(npz.content)) as archive:
+        assert archive["velocity_v"].dtype == np.float32
+        np.testing.assert_allclose(archive["velocity_v"], reference["velocity_v"], rtol=1e-6, atol=1e-7)
+
+    assert client.get(url, headers={"Accept": "text/html"}).status_code == 406
+
+
+def test_get_results_json_matches_model():
+    """測試快速 JSON 路徑與 FlowFieldResults 模型輸出一致, 且重複查詢使用快取"""
+    from app.services.result_store import results_store
+    from app.services.solver_service import solver_service
+
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 110.0, "nx": 11, "ny": 11, "max_iter": 100}
+    ).json()
+    url = f"/api/simulations/{job['job_id']}/results"
+
+    first = client.get(url)
+    assert first.headers["content-type"] == "application/json"
+    assert first.json() == solver_service.get_results(job["job_id"]).model_dump(mode="json")
+    assert results_store.get_payload(job["job_id"]) == first.content
+    assert client.get(url).content == first.content
+
+
+def test_get_results_query_parameters():
+    """測試結果查詢的欄位選擇、間隔取樣、子區域與精度"""
+    import numpy as np
+
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 120.0, "nx": 13, "ny": 11, "max_iter": 100}
+    ).json()
+    url = f"/api/simulations/{job['job_id']}/results"
+    full = client.get(url).json()
+
+    response = client.get(url, params={
+        "fields": "pressure,x_coords", "stride": 2, "window": "2:10,1:9", "dtype": "float32"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert "velocity_u" not in data and "convergence_history" not in data
+    assert data["query"] == {"stride": 2, "window": [2, 10, 1, 9], "dtype": "float32"}
+    expected = np.asarray(full["pressure"])[1:9:2, 2:10:2].astype(np.float32)
+    np.testing.assert_array_equal(np.asarray(data["pressure"], dtype=np.float32), expected)
+    assert len(data["x_coords"]) == 4
+
+    assert client.get(url, params={"fields": "temperature"}).status_code == 400
+    assert client.get(url, params={"stride": 0}).status_code == 422
+
+
+def test_get_simulation_history_paginated():
+    """測試收斂歷史由分頁端點提供, 結果中只含取樣數"""
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 130.0, "nx": 11, "ny": 11, "max_iter": 200, "tolerance": 1e-12,
+              "history_every": 5}
+    ).json()
+    results = client.get(f"/api/simulations/{job['job_id']}/results").json()
+    assert "convergence_history" not in results
+    assert results["history_length"] == 41
+
+    url = f"/api/simulations/{job['job_id']}/history"
+    page = client.get(url, params={"offset": 10, "limit": 15}).json()
+    assert page["total"] == 41
+    assert page["iteration"] == list(range(50, 125, 5))
+    assert len(page["continuity"]) == len(page["residual_u"]) == len(page["pressure_residual"]) == 15
+
+    last = client.get(url, params={"offset": 40}).json()
+    assert last["iteration"] == [199]
+    assert client.get(url, params={"limit": 0}).status_code == 422
+    assert client.get("/api/simulations/nonexistent/history").status_code == 404
+
+
+def test_stagnated_simulation_outcome():
+    """測試停滯提前結束的任務為 COMPLETED 並記錄 outcome"""
+    job = client.post(
+        "/api/simulations",
+        json={"reynolds_number": 140.0, "nx": 11, "ny": 11, "max_iter": 5000, "tolerance": 1e-12,
+              "stagnation_window": 20, "stagnation_min_improvement": 0.99}
+    ).json()
+    status = client.get(f"/api/simulations/{job['job_id']}").json()
+    assert status["status"] == "COMPLETED"
+    assert status["outcome"] == "STAGNATED"
+
+    results = client.get(f"/api/simulations/{job['job_id']}/results").json()
+    assert results["outcome"] == "STAGNATED"
+    assert "continuity" in results["final_residuals"]
+
+
+def test_resume_cancelled_simulation():
+    """測試已取消的任務可續算至完成, 已完成的任務不可續算"""
+    from app.models.simulation import SimulationParameters
+    from app.services.solver_service import solver_service
+
+    job = solver_service.create_job(
+        SimulationParameters(reynolds_number=130.0, nx=11, ny=11, max_iter=100)
+    )
+    assert solver_service.cancel_job(job.job_id)
+    assert client.get(f"/api/simulations/{job.job_id}").json()["status"] == "CANCELLED"
+
+    response = client.post(f"/api/simulations/{job.job_id}/resume")
+    assert response.status_code == 200
+    assert client.get(f"/api/simulations/{job.job_id}").json()["status"] == "COMPLETED"
+    assert client.post(f"/api/simulations/{job.job_id}/resume").status_code == 400
+
+
+def test_websocket_multiple_subscribers():
+    """測試同一任務的多個 WebSocket 連線皆收到廣播"""
+    from app.api.websocket import manager
+
+    with client.websocket_connect("/ws/simulation/shared-job") as first, \
+            client.websocket_connect("/ws/simulation/shared-job") as second:
+        for ws in (first, second):
+            ws.send_text("ping")
+            assert ws.receive_json() == {"type": "pong"}
+        assert len(manager.subscribers["shared-job"]) == 2
+
+        manager.broadcast_json("shared-job", {"type": "progress", "data": {"iteration": 7}})
+        for ws in (first, second):
+            assert ws.receive_json()["data"]["iteration"] == 7
+
+
+def test_websocket_snapshot_subscription():
+    """測試 WebSocket 快照訂閱的確認與選項驗證"""
+    from app.api.websocket import manager
+
+    with client.websocket_connect("/ws/simulation/snapshot-job") as ws:
+        ws.send_json({"type": "snapshots", "every": 50, "max_points": 16, "dtype": "float32"})
+        reply = ws.receive_json()
+        assert reply["type"] == "snapshots"
+        assert reply["options"]["max_points"] == 16
+        assert manager.wants_snapshots("snapshot-job")
+
+        ws.send_json({"type": "snapshots", "dtype": "float64"})
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"type": "snapshots", "enabled": False})
+        ws.receive_json()
+        assert not manager.wants_snapshots("snapshot-job")
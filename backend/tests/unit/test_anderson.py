@@ -0,0 +1,93 @@
+"""Anderson 加速單元測試"""
+import numpy as np
+
+from app.core.solver import AndersonAccelerator, solve_cavity_flow
+from app.models.simulation import SimulationParameters
+
+
+def _linear_iterations(accelerator, M, b, tolerance=1e-8, max_iter=5000):
+    """x = Mx + b 的不動點迭代次數"""
+    x = np.zeros(len(b))
+    for k in range(max_iter):
+        g = M @ x + b
+        if np.linalg.norm(g - x) < tolerance:
+            return k, x
+        if accelerator is not None:
+            accelerator.step(g)
+        x = g
+    return max_iter, x
+
+
+def test_accelerates_linear_fixed_point():
+    """測試線性不動點問題的迭代次數大幅減少且收斂到同一解"""
+    rng = np.random.default_rng(0)
+    n = 50
+    Q = np.linalg.qr(rng.normal(size=(n, n)))[0]
+    M = Q @ np.diag(np.linspace(0.5, 0.99, n)) @ Q.T
+    b = rng.normal(size=n)
+    exact = np.linalg.solve(np.eye(n) - M, b)
+
+    plain, _ = _linear_iterations(None, M, b)
+    accelerated, x = _linear_iterations(AndersonAccelerator(n, 5), M, b)
+
+    assert accelerated < plain / 5
+    np.testing.assert_allclose(x, exact, atol=1e-6)
+
+
+def test_restarts_when_residual_grows():
+    """測試殘差成長時清除歷史並返回未加速的 G(x)"""
+    accelerator = AndersonAccelerator(3, 2, restart_factor=2.0)
+    for value in (1.0, 0.5, 0.3):
+        accelerator.step(np.full(3, value))
+    assert accelerator.restarts == 0
+
+    g = np.full(3, 10.0)
+    assert accelerator.step(g) is False
+    assert accelerator.restarts == 1
+    np.testing.assert_array_equal(g, 10.0)
+
+
+def test_non_finite_iterate_falls_back():
+    """測試迭代值含 NaN/inf 時不加速並清除歷史, 之後可重新開始"""
+    accelerator = AndersonAccelerator(3, 2)
+    for value in (1.0, 0.5, 0.3):
+        accelerator.step(np.full(3, value))
+
+    g = np.array([0.2, np.nan, np.inf])
+    assert accelerator.step(g) is False
+    assert accelerator.restarts == 1
+    assert np.isnan(g[1]) and np.isinf(g[2])
+
+    for value in (0.2, 0.1, 0.05):
+        g = np.full(3, value)
+        accelerator.step(g)
+        assert np.all(np.isfinite(g))
+
+
+def test_lstsq_failure_falls_back(monkeypatch):
+    """測試最小平方求解失敗時返回未加速的 G(x)"""
+    accelerator = AndersonAccelerator(3, 2)
+    for value in (1.0, 0.5):
+        accelerator.step(np.full(3, value))
+
+    def fail(*args, **kwargs):
+        raise np.linalg.LinAlgError("SVD did not converge")
+
+    monkeypatch.setattr(np.linalg, "lstsq", fail)
+    g = np.full(3, 0.3)
+    assert accelerator.step(g) is False
+    assert accelerator.restarts == 1
+    np.testing.assert_array_equal(g, 0.3)
+
+
+def test_solver_with_anderson_needs_fewer_iterations():
+    """測試高 Reynolds 數時 Anderson 加速減少外迭代次數"""
+    parameters = SimulationParameters(
+        reynolds_number=1000.0, nx=21, ny=21, max_iter=3000, tolerance=1e-5
+    )
+    plain = solve_cavity_flow(parameters, as_arrays=True)
+    accelerated = solve_cavity_flow(parameters.model_copy(update={"anderson_depth": 5}), as_arrays=True)
+
+    assert plain["converged"] is True and accelerated["converged"] is True
+    assert accelerated["total_iterations"] < 0.75 * plain["total_iterations"]
+    np.testing.assert_allclose(accelerated["velocity_u"], plain["velocity_u"], atol=1e-3)
@@ -0,0 +1,116 @@
+"""收斂判斷單元測試"""
+import pytest
+from app.core.solver import (
+    OUTCOME_CONVERGED, OUTCOME_STAGNATED, ConvergenceMonitor, EtaEstimator, solve_cavity_flow
+)
+from app.models.simulation import SimulationParameters
+
+
+def test_monitor_criteria():
+    """測試各收斂標準的正規化度量"""
+    velocity = ConvergenceMonitor("velocity", tolerance=1e-3, continuity_tolerance=1e-6)
+    continuity = ConvergenceMonitor("continuity", tolerance=1e-3, continuity_tolerance=1e-6)
+    both = ConvergenceMonitor("all", tolerance=1e-3, continuity_tolerance=1e-6)
+
+    assert velocity.measure(5e-4, 2e-4, 1.0) == pytest.approx(0.5)
+    assert continuity.measure(1.0, 1.0, 2e-6) == pytest.approx(2.0)
+    assert both.measure(5e-4, 2e-4, 2e-6) == pytest.approx(2.0)
+    with pytest.raises(ValueError):
+        ConvergenceMonitor("energy")
+
+
+def test_monitor_ignores_first_update_and_detects_convergence():
+    """測試第一次更新不判定收斂"""
+    monitor = ConvergenceMonitor("continuity", continuity_tolerance=1e-4)
+    assert monitor.update(0, 1.0, 1.0, 0.0) is None
+    assert monitor.update(1, 1.0, 1.0, 1e-3) is None
+    assert monitor.update(2, 1.0, 1.0, 1e-5) == OUTCOME_CONVERGED
+
+
+def test_monitor_detects_stagnation():
+    """測試殘差在窗口內未明顯下降時判定停滯, 持續下降時不判定"""
+    monitor = ConvergenceMonitor(tolerance=1e-6, stagnation_window=50, stagnation_min_improvement=0.1)
+    outcomes = [monitor.update(it, 1e-3 * (1 + 0.05 * (it % 2)), 0.0, 0.0) for it in range(100)]
+    assert OUTCOME_STAGNATED in outcomes
+    assert outcomes.index(OUTCOME_STAGNATED) == 51
+
+    improving = ConvergenceMonitor(tolerance=1e-12, stagnation_window=50, stagnation_min_improvement=0.1)
+    assert all(improving.update(it, 0.99 ** it, 0.0, 0.0) is None for it in range(1000))
+
+
+def test_solver_stops_when_stagnated():
+    """測試停滯時求解器提前結束並回報 STAGNATED"""
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=11, ny=11, max_iter=5000, tolerance=1e-12,
+        stagnation_window=20, stagnation_min_improvement=0.99
+    )
+    results = solve_cavity_flow(parameters, as_arrays=True)
+
+    assert results["outcome"] == OUTCOME_STAGNATED
+    assert results["converged"] is False
+    assert results["total_iterations"] < 100
+    assert results["convergence_history"]["iteration"][-1] == results["total_iterations"] - 1
+
+
+def test_stagnation_detection_off_by_default():
+    """測試預設不偵測停滯: 殘差停滯時仍執行到 max_iter"""
+    assert SimulationParameters(reynolds_number=100.0).stagnation_window == 0
+
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=11, ny=11, max_iter=100, tolerance=1e-12,
+        stagnation_min_improvement=0.99
+    )
+    results = solve_cavity_flow(parameters, as_arrays=True)
+    assert results["outcome"] != OUTCOME_STAGNATED
+    assert results["total_iterations"] == 100
+
+
+def test_solver_continuity_criterion():
+    """測試以連續方程式殘差判斷收斂"""
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=11, ny=11, max_iter=2000,
+        convergence_criterion="continuity", continuity_tolerance=1e-5
+    )
+    results = solve_cavity_flow(parameters, as_arrays=True)
+
+    assert results["outcome"] == OUTCOME_CONVERGED
+    assert results["final_residuals"]["continuity"] < 1e-5
+
+
+def test_eta_estimator_exponential_decay():
+    """測試指數衰減的殘差可準確預測剩餘迭代次數與秒數"""
+    eta = EtaEstimator(window=10)
+    assert eta.estimate(1000) is None
+    # 度量每 10 次迭代減半, 每秒 100 次迭代; 第 300 次迭代時度量為 2**10
+    for it in range(210, 310, 10):
+        eta.update(it, it / 100.0, 2.0 ** ((400 - it) / 10))
+
+    iterations, seconds = eta.estimate(10000)
+    assert iterations == pytest.approx(100, abs=1)
+    assert seconds == pytest.approx(1.0, rel=0.02)
+    assert eta.estimate(50)[0] == 50
+
+
+def test_eta_estimator_stalled_residual():
+    """測試殘差未下降時以停滯判定的迭代數為預估"""
+    eta = EtaEstimator(window=10)
+    for it in range(0, 100, 10):
+        eta.update(it, it / 100.0, 5.0)
+    assert eta.estimate(10000, stalled_remaining=300) == (300, pytest.approx(3.0))
+    assert eta.estimate(10000)[0] == 10000
+
+
+def test_solver_progress_reports_estimate():
+    """測試進度訊息附上剩餘迭代次數與秒數的預估"""
+    parameters = SimulationParameters(reynolds_number=100.0, nx=21, ny=21, max_iter=3000, tolerance=1e-6)
+    progress = []
+    results = solve_cavity_flow(parameters, progress.append, as_arrays=True)
+
+    assert progress[0]["estimated_iterations"] is None
+    assert progress[-1]["estimated_iterations"] == 0
+    # 後段的預估與實際剩餘迭代次數相近
+    late = [p for p in progress if p["iteration"] >= results["total_iterations"] // 2]
+    for p in late[:-1]:
+        actual = results["total_iterations"] - 1 - p["iteration"]
+        assert abs(p["estimated_iterations"] - actual) <= max(0.25 * actual, 20)
+        assert p["estimated_remaining"] >= 0
@@ -0,0 +1,73 @@
+"""求解器執行後端單元測試"""
+import asyncio
+import numpy as np
+import pytest
+from app.core.solver import SnapshotEmitter, SolverCancelled
+from app.models.simulation import SimulationParameters
+from app.services.executor import ProcessSolverExecutor, ThreadSolverExecutor
+
+
+@pytest.mark.parametrize("executor_class", [ThreadSolverExecutor, ProcessSolverExecutor])
+def test_executor_returns_arrays_and_progress(executor_class):
+    """測試執行後端回傳 ndarray 流場並轉送進度"""
+    executor = executor_class(1) if executor_class is ProcessSolverExecutor else executor_class()
+    parameters = SimulationParameters(reynolds_number=100.0, nx=11, ny=11, max_iter=100)
+    progress_calls = []
+
+    try:
+        result = asyncio.run(executor.run(parameters, progress_calls.append))
+    finally:
+        executor.shutdown()
+
+    assert isinstance(result["pressure"], np.ndarray)
+    assert result["pressure"].shape == (11, 11)
+    assert result["velocity_u"].shape == (11, 10)
+    assert len(progress_calls) == len(result["convergence_history"]["iteration"])
+    assert progress_calls[0]["iteration"] == 0
+
+
+@pytest.mark.parametrize("executor_class", [ThreadSolverExecutor, ProcessSolverExecutor])
+def test_executor_cancellation(executor_class):
+    """測試設定取消旗標後求解器於下一次外迭代停止"""
+    executor = executor_class(1) if executor_class is ProcessSolverExecutor else executor_class()
+    parameters = SimulationParameters(reynolds_number=100.0, nx=11, ny=11, max_iter=5000, tolerance=1e-12)
+
+    try:
+        cancel_event = executor.create_event()
+        with pytest.raises(SolverCancelled) as info:
+            asyncio.run(executor.run(parameters, lambda data: cancel_event.set(), cancel_event))
+    finally:
+        executor.shutdown()
+
+    assert info.value.iteration < parameters.max_iter
+
+
+@pytest.mark.parametrize("executor_class", [ThreadSolverExecutor, ProcessSolverExecutor])
+def test_executor_forwards_snapshots(executor_class):
+    """測試啟用快照時轉送降採樣流場, 未啟用時不取樣"""
+    executor = executor_class(1) if executor_class is ProcessSolverExecutor else executor_class()
+    parameters = SimulationParameters(reynolds_number=100.0, nx=21, ny=21, max_iter=100, tolerance=1e-12)
+    snapshots_received = []
+
+    try:
+        enabled = executor.create_event()
+        asyncio.run(executor.run(
+            parameters, snapshots=SnapshotEmitter(enabled, every=25, max_points=8),
+            snapshot_callback=snapshots_received.append
+        ))
+        assert snapshots_received == []
+
+        enabled.set()
+        asyncio.run(executor.run(
+            parameters, snapshots=SnapshotEmitter(enabled, every=25, max_points=8),
+            snapshot_callback=snapshots_received.append
+        ))
+    finally:
+        executor.shutdown()
+
+    assert [s["iteration"] for s in snapshots_received] == [0, 25, 50, 75]
+    snapshot = snapshots_received[-1]
+    assert snapshot["pressure"].shape == (7, 7)
+    assert snapshot["velocity_u"].shape == (7, 7)
+    assert snapshot["velocity_v"].shape == (7, 7)
+    assert snapshot["pressure"].dtype == np.float32
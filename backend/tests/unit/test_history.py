@@ -0,0 +1,58 @@
+"""收斂歷史緩衝區單元測試"""
+import numpy as np
+from app.core.solver import ConvergenceHistory
+
+
+def _fill(history, iterations):
+    for it in iterations:
+        history.record(it, 1.0 / (it + 1), 2.0 / (it + 1), 0.5 / (it + 1), 3, 1e-4)
+
+
+def test_history_records_columns():
+    """測試取樣間隔與欄位內容"""
+    history = ConvergenceHistory(every=5, max_samples=100)
+    assert [it for it in range(12) if history.due(it)] == [0, 5, 10]
+
+    _fill(history, [0, 5, 10])
+    columns = history.columns()
+    np.testing.assert_array_equal(columns["iteration"], [0, 5, 10])
+    assert columns["pressure_iterations"].dtype == np.int32
+    assert columns["pressure_residual"].dtype == np.float64
+    np.testing.assert_array_equal(columns["pressure_residual"], [1e-4] * 3)
+    assert history.last()["residual_v"] == 2.0 / 11
+
+
+def test_history_decimates_older_samples():
+    """測試達上限後取樣數有界, 涵蓋完整範圍且近期取樣較密"""
+    history = ConvergenceHistory(every=10, max_samples=200)
+    _fill(history, range(0, 1_000_000, 10))
+
+    iterations = history.columns()["iteration"]
+    assert len(history) <= 200
+    assert iterations[0] == 0 and iterations[-1] == 999_990
+    assert np.all(np.diff(iterations) > 0)
+    # 最近的取樣保持原間隔, 前半段只佔少數
+    assert np.all(np.diff(iterations[-10:]) == 10)
+    assert np.sum(iterations < 500_000) < len(iterations) // 4
+
+
+def test_history_from_columns():
+    """測試由既有欄位重建 (超過上限時保留最新取樣)"""
+    source = ConvergenceHistory(every=1, max_samples=50)
+    _fill(source, range(30))
+
+    restored = ConvergenceHistory.from_columns(source.columns(), every=1, max_samples=20)
+    np.testing.assert_array_equal(restored.columns()["iteration"], np.arange(10, 30))
+    restored.record(30, 0.0, 0.0, 0.0, 1, 0.0)
+    assert len(restored) <= 20 and restored.last()["iteration"] == 30
+
+
+def test_history_from_columns_without_pressure_residual():
+    """測試由缺少 pressure_residual 的舊版欄位重建時以 NaN 填入"""
+    source = ConvergenceHistory(every=1, max_samples=10)
+    _fill(source, range(5))
+    columns = source.columns()
+    del columns["pressure_residual"]
+
+    restored = ConvergenceHistory.from_columns(columns, every=1, max_samples=10)
+    assert np.isnan(restored.columns()["pressure_residual"]).all()
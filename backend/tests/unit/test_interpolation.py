@@ -0,0 +1,33 @@
+"""交錯網格插值單元測試"""
+import numpy as np
+from app.core.solver.interpolation import interpolate_state, staggered_coords
+
+
+def _linear_state(nx, ny):
+    """各欄位皆為座標的線性函數 (雙線性插值可精確重現)"""
+    coords = staggered_coords(nx, ny)
+    fields = []
+    for key in ("pressure", "velocity_u", "velocity_v"):
+        x, y = coords[key]
+        fields.append(2.0 * x[None, :] - 3.0 * y[:, None] + 1.0)
+    return fields
+
+
+def test_interpolate_state_reproduces_linear_fields():
+    """測試線性場在不同解析度之間插值無誤差 (範圍外的邊緣點截斷, 不比較), 且形狀符合交錯網格"""
+    p, u, v = interpolate_state(*_linear_state(11, 21), nx=31, ny=16)
+    expected = _linear_state(31, 16)
+
+    assert p.shape == (16, 31)
+    assert u.shape == (16, 30)
+    assert v.shape == (15, 31)
+    for actual, reference in zip((p, u, v), expected):
+        np.testing.assert_allclose(actual[1:-1, 1:-1], reference[1:-1, 1:-1], atol=1e-12)
+
+
+def test_interpolate_state_same_grid_copies():
+    """測試相同網格時返回複本"""
+    state = _linear_state(11, 11)
+    p, _, _ = interpolate_state(*state, nx=11, ny=11)
+    np.testing.assert_array_equal(p, state[0])
+    assert p is not state[0]
@@ -0,0 +1,137 @@
+"""任務登錄單元測試"""
+from datetime import datetime
+from app.models.simulation import JobStatus, SimulationJob, SimulationParameters
+from app.services.job_registry import JobRegistry
+
+
+def _job(job_id, status):
+    return SimulationJob(
+        job_id=job_id,
+        parameters=SimulationParameters(reynolds_number=100.0),
+        status=status,
+        created_at=datetime.now()
+    )
+
+
+def test_registry_persists_across_instances(tmp_path):
+    """測試任務與結果摘要寫入資料庫, 新實例可載入並依狀態查詢"""
+    path = str(tmp_path / "jobs.db")
+    registry = JobRegistry(path)
+    registry.save(_job("a", JobStatus.RUNNING))
+    registry.save(_job("b", JobStatus.COMPLETED), {"total_iterations": 42})
+    registry.save(_job("c", JobStatus.QUEUED))
+    del registry["c"]
+    registry.close()
+
+    reopened = JobRegistry(path)
+    try:
+        assert sorted(reopened) == ["a", "b"]
+        assert reopened["a"].status == JobStatus.RUNNING
+        assert reopened.ids_by_status(JobStatus.RUNNING, JobStatus.QUEUED) == ["a"]
+        assert reopened.result_summary("b") == {"total_iterations": 42}
+
+        # 更新時未提供摘要則保留原值
+        job = reopened["b"]
+        job.error_message = "note"
+        reopened.save(job)
+        assert reopened.result_summary("b") == {"total_iterations": 42}
+    finally:
+        reopened.close()
+
+
+def test_recover_jobs_requeues_interrupted(monkeypatch, tmp_path):
+    """測試啟動時將中斷的任務重設為 PENDING"""
+    from app.services import solver_service as module
+
+    registry = JobRegistry(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(module, "jobs_store", registry)
+    registry.save(_job("running", JobStatus.RUNNING))
+    registry.save(_job("done", JobStatus.COMPLETED))
+
+    try:
+        assert module.solver_service.recover_jobs() == ["running"]
+        assert registry["running"].status == JobStatus.PENDING
+        assert registry.ids_by_status(JobStatus.PENDING) == ["running"]
+        assert registry["done"].status == JobStatus.COMPLETED
+    finally:
+        module.inflight_jobs.clear()
+        registry.close()
+
+
+def test_cancelled_pending_job_leaves_no_inflight_entry(monkeypatch, tmp_path):
+    """測試排隊前取消的任務不留下合併項目, 背景任務提前返回時亦同"""
+    import asyncio
+    from app.services import solver_service as module
+    from app.services.result_cache import canonical_key
+
+    registry = JobRegistry(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(module, "jobs_store", registry)
+    parameters = SimulationParameters(reynolds_number=321.0, nx=11, ny=11)
+    key = canonical_key(parameters)
+
+    try:
+        job = module.solver_service.create_job(parameters)
+        assert module.inflight_jobs[key] == job.job_id
+        assert module.solver_service.cancel_job(job.job_id)
+        assert key not in module.inflight_jobs
+
+        # 已取消的任務仍被登記時 (例如續算後立即取消), 背景任務開始時清除
+        module.inflight_jobs[key] = job.job_id
+        asyncio.run(module.solver_service.run_simulation(job.job_id))
+        assert key not in module.inflight_jobs
+    finally:
+        module.inflight_jobs.clear()
+        registry.close()
+
+
+def test_auto_warm_start_skips_unconverged_and_non_finite(monkeypatch, tmp_path):
+    """測試自動暖啟動只使用已收斂且流場為有限值的結果"""
+    import numpy as np
+    from app.models.simulation import SolverOutcome
+    from app.services import solver_service as module
+    from app.services.result_store import ResultStore
+
+    registry = JobRegistry(str(tmp_path / "jobs.db"))
+    store = ResultStore(str(tmp_path / "results"), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    monkeypatch.setattr(module, "jobs_store", registry)
+    monkeypatch.setattr(module, "results_store", store)
+
+    def add(job_id, reynolds_number, outcome, value):
+        job = SimulationJob(
+            job_id=job_id,
+            parameters=SimulationParameters(reynolds_number=reynolds_number, nx=11, ny=11),
+            status=JobStatus.COMPLETED,
+            created_at=datetime.now(),
+            outcome=outcome
+        )
+        registry.save(job)
+        store.put(job_id, {
+            "pressure": np.full((11, 11), value),
+            "velocity_u": np.full((11, 10), value),
+            "velocity_v": np.full((10, 11), value),
+            "x_coords": np.linspace(0, 1, 11),
+            "y_coords": np.linspace(0, 1, 11),
+        })
+
+    # 參數距離: diverged < nan < good
+    add("diverged", 101.0, SolverOutcome.MAX_ITER, 1.0)
+    add("nan", 102.0, SolverOutcome.CONVERGED, np.nan)
+    add("good", 150.0, SolverOutcome.CONVERGED, 2.0)
+
+    def target(initial_condition):
+        return SimulationJob(
+            job_id="target",
+            parameters=SimulationParameters(
+                reynolds_number=100.0, nx=11, ny=11, initial_condition=initial_condition
+            ),
+            status=JobStatus.PENDING,
+            created_at=datetime.now()
+        )
+
+    try:
+        state, source = module.solver_service.resolve_initial_state(target("auto"))
+        assert source == "good"
+        np.testing.assert_array_equal(state["pressure"], 2.0)
+        assert module.solver_service.resolve_initial_state(target("nan")) == (None, None)
+    finally:
+        registry.close()
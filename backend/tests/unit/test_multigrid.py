@@ -0,0 +1,87 @@
+"""多重網格壓力修正求解器單元測試"""
+import numpy as np
+import pytest
+from app.core.solver.pressure import PressureOperator
+from app.core.solver.multigrid import MultigridSolver, coarse_shape, prolong, restrict
+
+
+def _random_operator(ny, nx, seed=0):
+    """建立對稱的變係數五點運算子"""
+    rng = np.random.default_rng(seed)
+    a_EW = rng.uniform(0.5, 2.0, (ny, nx + 1))
+    a_NS = rng.uniform(0.5, 2.0, (ny + 1, nx))
+    return PressureOperator(a_EW[:, 1:], a_EW[:, :-1], a_NS[1:, :], a_NS[:-1, :])
+
+
+@pytest.mark.parametrize("shape", [(7, 9), (8, 6)])
+def test_restriction_is_prolongation_transpose(shape):
+    """測試全加權限制等於雙線性延拓的轉置 (奇偶網格數皆適用)"""
+    ny, nx = shape
+    nyc, nxc = coarse_shape(shape)
+    n, n_c = ny * nx, nyc * nxc
+
+    P = np.zeros((n, n_c))
+    for k in range(n_c):
+        padded = np.zeros((nyc + 2, nxc + 2))
+        padded[1:-1, 1:-1].flat[k] = 1.0
+        column = np.zeros(shape)
+        prolong(padded, np.zeros((ny, nxc + 2)), column)
+        P[:, k] = column.ravel()
+
+    R = np.zeros((n_c, n))
+    for k in range(n):
+        fine = np.zeros(shape)
+        fine.flat[k] = 1.0
+        row = np.zeros((nyc, nxc))
+        restrict(fine, np.zeros((ny, nxc)), row)
+        R[:, k] = row.ravel()
+
+    np.testing.assert_array_equal(R, P.T)
+    # 遠離邊界處延拓權重和為 1 (靠近邊界者部分權重落在零邊界上)
+    assert P.sum(axis=1).max() == 1.0
+
+
+@pytest.mark.parametrize("cycle", ["V", "W"])
+def test_multigrid_matches_direct_solve(cycle):
+    """測試多重網格解與直接法一致, 並回報循環次數"""
+    op = _random_operator(23, 30)
+    b = np.random.default_rng(1).standard_normal(op.shape)
+
+    x = np.zeros(op.shape)
+    info = MultigridSolver(cycle=cycle, tolerance=1e-10, max_cycles=100).solve(op, b, x)
+
+    expected = np.linalg.solve(op.to_dense(), b.ravel()).reshape(op.shape)
+    np.testing.assert_allclose(x, expected, rtol=1e-6, atol=1e-7)
+    assert 0 < info["iterations"] < 100
+    assert info["residual"] < 1e-10
+
+
+def test_v_cycles_independent_of_grid_size():
+    """測試 V 循環次數不隨網格加密而增加"""
+    counts = []
+    for n in (23, 47, 95, 190):
+        ones = np.ones((n, n))
+        op = PressureOperator(ones, ones, ones, ones)
+        b = np.random.default_rng(2).standard_normal(op.shape)
+        counts.append(MultigridSolver(tolerance=1e-6).solve(op, b, np.zeros(op.shape))["iterations"])
+
+    assert max(counts) <= 7
+    assert counts[-1] <= counts[0] + 1
+
+
+def test_hierarchy_reused_across_solves():
+    """測試網格階層只建立一次, 之後的求解只更新係數"""
+    solver = MultigridSolver(tolerance=1e-10, max_cycles=100)
+    op = _random_operator(15, 15, seed=3)
+    levels = solver.setup(op)
+    coarse = levels[1].op
+
+    changed = _random_operator(15, 15, seed=4)
+    b = np.random.default_rng(5).standard_normal(op.shape)
+    x = np.zeros(op.shape)
+    solver.solve(changed, b, x)
+
+    assert solver.setup(changed)[1].op is coarse
+    np.testing.assert_allclose(
+        x, np.linalg.solve(changed.to_dense(), b.ravel()).reshape(op.shape), rtol=1e-6, atol=1e-7
+    )
@@ -0,0 +1,117 @@
+"""壓力修正求解器介面單元測試"""
+import numpy as np
+import pytest
+from app.models.simulation import SimulationParameters
+from app.core.solver.pressure import PressureOperator
+from app.core.solver.pressure_solvers import (
+    ConjugateGradientSolver,
+    RedBlackSORSolver,
+    create_pressure_solver,
+)
+
+
+def _red_black_masks(shape):
+    """紅黑著色遮罩 ((i + j) 為偶數者為紅)"""
+    red = (np.add.outer(np.arange(shape[0]), np.arange(shape[1])) % 2) == 0
+    return red, ~red
+
+
+def _random_operator(ny, nx, seed=0):
+    """建立對稱的變係數五點運算子"""
+    rng = np.random.default_rng(seed)
+    a_EW = rng.uniform(0.5, 2.0, (ny, nx + 1))
+    a_NS = rng.uniform(0.5, 2.0, (ny + 1, nx))
+    return PressureOperator(a_EW[:, 1:], a_EW[:, :-1], a_NS[1:, :], a_NS[:-1, :])
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", "ssor"])
+def test_pcg_matches_direct_solve(preconditioner):
+    """測試預條件共軛梯度法收斂到直接解"""
+    op = _random_operator(17, 21)
+    b = np.random.default_rng(1).standard_normal(op.shape)
+
+    x = np.zeros(op.shape)
+    solver = ConjugateGradientSolver(preconditioner, tolerance=1e-10, max_iter=500)
+    info = solver.solve(op, b, x)
+
+    expected = np.linalg.solve(op.to_dense(), b.ravel()).reshape(op.shape)
+    np.testing.assert_allclose(x, expected, rtol=1e-6, atol=1e-7)
+    assert 0 < info["iterations"] < 500
+    assert info["residual"] < 1e-10
+
+
+def test_ssor_preconditioner_reduces_iterations():
+    """測試 SSOR 預條件子所需迭代次數少於 Jacobi"""
+    op = _random_operator(31, 31)
+    b = np.random.default_rng(2).standard_normal(op.shape)
+
+    counts = {}
+    for preconditioner in ("jacobi", "ssor"):
+        solver = ConjugateGradientSolver(preconditioner, tolerance=1e-8, max_iter=500)
+        counts[preconditioner] = solver.solve(op, b, np.zeros(op.shape))["iterations"]
+
+    assert counts["ssor"] < counts["jacobi"]
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.4])
+def test_ssor_preconditioner_is_symmetric_sweep(omega):
+    """測試合併黑點鬆弛後與紅、黑、黑、紅四次掃描相同, 且預條件子對稱"""
+    op = _random_operator(11, 14)
+    rng = np.random.default_rng(5)
+    r1, r2 = rng.standard_normal((2,) + op.shape)
+    solver = ConjugateGradientSolver("ssor", omega=omega)
+
+    red, black = _red_black_masks(op.shape)
+    expected = np.zeros(op.shape)
+    for color in (red, black, black, red):
+        update = (op.neighbour_sum(expected) + r1) / op.a_P
+        expected[color] += omega * (update[color] - expected[color])
+
+    z1 = solver._precondition(op, r1, np.empty(op.shape))
+    z2 = solver._precondition(op, r2, np.empty(op.shape))
+    np.testing.assert_allclose(z1, expected, rtol=1e-12)
+    assert np.vdot(z1, r2) == pytest.approx(np.vdot(z2, r1), rel=1e-12)
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.6])
+def test_red_black_sor_matches_direct_solve(omega):
+    """測試紅黑 SOR 收斂到與高斯-賽德爾相同的解"""
+    op = _random_operator(15, 12)
+    b = np.random.default_rng(3).standard_normal(op.shape)
+
+    x = np.zeros(op.shape)
+    info = RedBlackSORSolver(omega, tolerance=1e-10, max_iter=2000).solve(op, b, x)
+
+    expected = np.linalg.solve(op.to_dense(), b.ravel()).reshape(op.shape)
+    np.testing.assert_allclose(x, expected, rtol=1e-6, atol=1e-7)
+    assert info["iterations"] < 2000
+
+
+def test_red_black_sor_adaptive_stopping():
+    """測試殘差降幅達標即停止, 否則於上限停止"""
+    op = _random_operator(9, 9)
+    b = np.random.default_rng(4).standard_normal(op.shape)
+
+    info = RedBlackSORSolver(1.5, tolerance=1e-2, max_iter=50).solve(op, b, np.zeros(op.shape))
+    assert info["iterations"] < 50
+    assert info["residual"] < 1e-2
+    # 少一次迭代時尚未達標
+    fewer = RedBlackSORSolver(1.5, tolerance=0.0, max_iter=info["iterations"] - 1)
+    assert fewer.solve(op, b, np.zeros(op.shape))["residual"] >= 1e-2
+
+    info = RedBlackSORSolver(1.0, tolerance=1e-12, max_iter=5).solve(op, b, np.zeros(op.shape))
+    assert info["iterations"] == 5
+
+
+def test_create_pressure_solver_from_parameters():
+    """測試依參數選擇求解器"""
+    for name in ("sor", "multigrid", "pcg"):
+        parameters = SimulationParameters(reynolds_number=100.0, pressure_solver=name)
+        assert create_pressure_solver(parameters).name == name
+
+    parameters = SimulationParameters(reynolds_number=100.0, pressure_solver="gauss_seidel")
+    assert create_pressure_solver(parameters).omega == 1.0
+
+    parameters = SimulationParameters(reynolds_number=100.0, pressure_solver="pcg", sor_omega=1.2)
+    solver = create_pressure_solver(parameters)
+    assert solver.preconditioner == "jacobi" and solver.omega == 1.2
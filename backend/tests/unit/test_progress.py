@@ -0,0 +1,35 @@
+"""進度管道單元測試"""
+import asyncio
+import threading
+import time
+from app.services.progress import ProgressChannel
+
+
+def test_progress_channel_coalesces_and_keeps_first_and_last():
+    """測試大量進度被合併, 且第一筆與最後一筆一定送出"""
+    received = []
+
+    async def send(data):
+        received.append(data["iteration"])
+
+    async def scenario():
+        channel = ProgressChannel(asyncio.get_running_loop(), send, min_interval=0.05)
+
+        def producer():
+            for iteration in range(2000):
+                channel.publish({"iteration": iteration})
+                time.sleep(0.0001)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await channel.close()
+        return channel
+
+    channel = asyncio.run(scenario())
+
+    assert received[0] == 0
+    assert received[-1] == 1999
+    assert received == sorted(received)
+    assert channel.published == 2000
+    assert channel.sent == len(received) < 200
@@ -0,0 +1,49 @@
+"""結果快取單元測試"""
+import numpy as np
+from app.models.simulation import SimulationParameters
+from app.services.result_cache import ResultCache, canonical_key
+
+
+def _result(n):
+    field = np.zeros((n, n))
+    return {"pressure": field, "velocity_u": field, "velocity_v": field,
+            "x_coords": np.zeros(n), "y_coords": np.zeros(n)}
+
+
+def test_canonical_key_ignores_scheduling_fields():
+    """測試快取鍵不受排程參數影響, 但隨物理參數改變"""
+    base = SimulationParameters(reynolds_number=100.0)
+    assert canonical_key(base) == canonical_key(
+        SimulationParameters(reynolds_number=100.0, priority="batch", cancel_on_disconnect=True)
+    )
+    assert canonical_key(base) != canonical_key(SimulationParameters(reynolds_number=400.0))
+
+
+def test_cache_lru_eviction_and_stats():
+    """測試超過記憶體預算時淘汰最久未使用的結果"""
+    size = 3 * 10 * 10 * 8 + 2 * 10 * 8
+    cache = ResultCache(max_bytes=2 * size)
+    cache.put("a", "job-a", _result(10))
+    cache.put("b", "job-b", _result(10))
+    assert cache.get("a") == "job-a"  # a 變為最近使用
+    cache.put("c", "job-c", _result(10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "job-a"
+    assert cache.get("c") == "job-c"
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["nbytes"] == 2 * size
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_discard_job_drops_entries():
+    """測試結果被刪除時移除引用該結果的快取項目"""
+    cache = ResultCache(max_bytes=10**9)
+    cache.put("a", "job-a", _result(10))
+    cache.put("b", "job-b", _result(10))
+
+    cache.discard_job("job-a")
+    assert cache.get("a") is None
+    assert cache.get("b") == "job-b"
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,42 @@
+"""結果查詢單元測試"""
+import numpy as np
+import pytest
+from app.services.result_query import SELECTABLE_FIELDS, parse_fields, parse_window, select_fields
+
+
+def _data(nx=9, ny=7):
+    return {
+        "pressure": np.arange(ny * nx, dtype=float).reshape(ny, nx),
+        "velocity_u": np.zeros((ny, nx - 1)),
+        "velocity_v": np.zeros((ny - 1, nx)),
+        "x_coords": np.linspace(0, 1, nx),
+        "y_coords": np.linspace(0, 1, ny),
+        "convergence_history": [{"iteration": 0}],
+    }
+
+
+def test_parse_fields_and_window():
+    """測試欄位與子區域參數解析"""
+    assert parse_fields(None) == SELECTABLE_FIELDS
+    assert parse_fields("pressure, x_coords") == ("pressure", "x_coords")
+    assert parse_window("2:8,:5") == (slice(2, 8), slice(None, 5))
+    for text in ("2:8", "a:b,1:2", "3,1:2"):
+        with pytest.raises(ValueError):
+            parse_window(text)
+    with pytest.raises(ValueError):
+        parse_fields("temperature")
+
+
+def test_select_fields_returns_views():
+    """測試間隔取樣與子區域以檢視返回, 座標套用相同範圍"""
+    data = _data()
+    selected = select_fields(
+        data, ("pressure", "velocity_v", "x_coords", "y_coords"), stride=2, window=parse_window("1:8,2:")
+    )
+
+    np.testing.assert_array_equal(selected["pressure"], data["pressure"][2::2, 1:8:2])
+    assert np.shares_memory(selected["pressure"], data["pressure"])
+    assert selected["velocity_v"].shape == (2, 4)
+    np.testing.assert_array_equal(selected["x_coords"], data["x_coords"][1:8:2])
+    np.testing.assert_array_equal(selected["y_coords"], data["y_coords"][2::2])
+    assert "velocity_u" not in selected
@@ -0,0 +1,106 @@
+"""磁碟結果儲存單元測試"""
+import numpy as np
+import pytest
+from app.services.result_store import ResultStore
+
+
+def _result(n, value=1.0):
+    return {
+        "pressure": np.full((n, n), value),
+        "velocity_u": np.full((n, n - 1), value),
+        "velocity_v": np.full((n - 1, n), value),
+        "x_coords": np.linspace(0, 1, n),
+        "y_coords": np.linspace(0, 1, n),
+        "final_residuals": {"u": 1e-5, "v": 1e-5},
+        "converged": True,
+    }
+
+
+def _size(n):
+    return 8 * (n * n + 2 * n * (n - 1) + 2 * n)
+
+
+def test_put_returns_memmap_and_survives_restart(tmp_path):
+    """測試結果以 memmap 讀取, 且新的儲存實例可讀取既有檔案"""
+    store = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    data = store.put("a", _result(5, 2.0))
+
+    assert isinstance(data["pressure"], np.memmap)
+    assert not data["pressure"].flags.writeable
+    assert data["final_residuals"] == {"u": 1e-5, "v": 1e-5}
+
+    reopened = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    assert "a" in reopened
+    np.testing.assert_array_equal(reopened.get("a")["velocity_v"], np.full((4, 5), 2.0))
+
+
+def test_hot_set_and_disk_eviction(tmp_path):
+    """測試熱集合依 LRU 卸載, 磁碟依 LRU 刪除並通知處理函式"""
+    store = ResultStore(str(tmp_path), hot_bytes=2 * _size(6), max_bytes=3 * _size(6), ttl=3600)
+    evicted = []
+    store.add_evict_handler(evicted.append)
+
+    for job_id in "abcd":
+        store.put(job_id, _result(6))
+    assert store.hot_nbytes <= 2 * _size(6)
+
+    store.get("a")  # a 變為最近使用
+    assert store.evict() == ["b"]
+    assert evicted == ["b"]
+    assert "b" not in store and not (tmp_path / "b").exists()
+    assert store.nbytes == 3 * _size(6)
+
+
+def test_ttl_eviction(tmp_path):
+    """測試閒置超過 ttl 的結果被刪除 (保留最近使用的一筆)"""
+    store = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=0.0)
+    store.put("a", _result(5))
+    store.put("b", _result(5))
+
+    assert store.evict() == ["a"]
+    assert "b" in store
+
+
+def test_alias_shares_files_until_last_reference(tmp_path):
+    """測試別名共用結果目錄, 持有者刪除後目錄原地保留, 最後一個引用刪除時才刪除檔案"""
+    store = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    deleted = []
+    store.add_delete_handler(deleted.append)
+    store.put("a", _result(5, 3.0))
+
+    data = store.alias("b", "a")
+    store.alias("c", "b")
+    assert data is store.get("a")
+    assert store.nbytes == _size(5)
+    assert not list((tmp_path / "b").glob("*.npy"))
+    assert store.alias("d", "missing") is None
+
+    store.pop("a")
+    assert deleted == ["a"]
+    assert "a" not in store and (tmp_path / "a" / "released").exists()
+    np.testing.assert_array_equal(store.get("c")["pressure"], np.full((5, 5), 3.0))
+    assert store.nbytes == _size(5)
+
+    reopened = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    assert "a" not in reopened and "b" in reopened
+    np.testing.assert_array_equal(reopened.get("c")["velocity_u"], np.full((5, 4), 3.0))
+    assert reopened.nbytes == sum(f.stat().st_size for f in (tmp_path / "a").glob("*.npy"))
+
+    store.pop("b")
+    store.pop("c")
+    assert deleted == ["a", "b", "c"]
+    assert not any(tmp_path.iterdir())
+
+
+def test_failed_delete_keeps_index(tmp_path, monkeypatch):
+    """測試刪除檔案失敗時拋出例外, 索引保持不變"""
+    store = ResultStore(str(tmp_path), hot_bytes=10**9, max_bytes=10**9, ttl=3600)
+    store.put("a", _result(5))
+
+    def fail(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr("app.services.result_store.shutil.rmtree", fail)
+    with pytest.raises(PermissionError):
+        store.pop("a")
+    assert "a" in store and store.nbytes == _size(5)
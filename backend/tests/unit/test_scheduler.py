@@ -0,0 +1,133 @@
+"""任務排程器單元測試"""
+import asyncio
+import pytest
+from app.models.simulation import SimulationParameters
+from app.services.scheduler import JobScheduler, SchedulerRejected, estimate_cost
+
+
+def _params(nx=21, max_iter=1000, priority="normal"):
+    return SimulationParameters(
+        reynolds_number=100.0, nx=nx, ny=nx, max_iter=max_iter, priority=priority
+    )
+
+
+def test_admission_rejects_over_budget():
+    """測試佇列工作量超過上限時拒絕"""
+    scheduler = JobScheduler(1, 1e12, estimate_cost(_params()) * 1.5, 1e6)
+    scheduler.check_admission("a", _params(max_iter=100))
+
+    with pytest.raises(SchedulerRejected):
+        scheduler.check_admission("b", _params(max_iter=2000))
+
+
+def test_back_to_back_admissions_reserve_cost():
+    """測試連續提交 (之間不讓出事件迴圈) 時, 預留的成本計入上限"""
+    cost = estimate_cost(_params())
+    scheduler = JobScheduler(1, 1e12, cost * 2.5, 1e6)
+    scheduler.check_admission("a", _params())
+    scheduler.check_admission("b", _params())
+    with pytest.raises(SchedulerRejected):
+        scheduler.check_admission("c", _params())
+
+    # 取消或失敗時釋放預留
+    scheduler.release("b")
+    scheduler.check_admission("c", _params())
+    with pytest.raises(SchedulerRejected):
+        scheduler.check_admission("d", _params())
+
+    async def main():
+        # 排入佇列時沿用預留, 取得槽位後不再計入等待中工作量
+        assert await scheduler.acquire("a", _params())
+        scheduler.check_admission("d", _params())
+        with pytest.raises(SchedulerRejected):
+            scheduler.check_admission("e", _params())
+
+    asyncio.run(main())
+
+
+def test_small_and_interactive_jobs_run_first():
+    """測試同時只執行一個任務時, 依優先權與成本決定執行順序"""
+    scheduler = JobScheduler(1, 1e12, 1e12, 1e6)
+    order = []
+
+    async def job(job_id, parameters):
+        await scheduler.acquire(job_id, parameters)
+        order.append(job_id)
+        await asyncio.sleep(0)
+        scheduler.release(job_id)
+
+    async def main():
+        # 先佔住唯一的槽位, 讓其餘任務進入佇列
+        await scheduler.acquire("running", _params())
+        tasks = [
+            asyncio.ensure_future(job("batch", _params(nx=21, priority="batch"))),
+            asyncio.ensure_future(job("large", _params(nx=101))),
+            asyncio.ensure_future(job("small", _params(nx=11))),
+            asyncio.ensure_future(job("interactive", _params(nx=101, priority="interactive"))),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queue_position("interactive") == 1
+        assert scheduler.queue_position("batch") == 4
+        assert scheduler.estimated_wait("small") > 0
+
+        scheduler.release("running")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["interactive", "small", "large", "batch"]
+    assert scheduler.queue_position("small") is None
+
+
+def test_large_job_not_starved_by_small_jobs():
+    """測試持續有小任務提交時, 等待逾時的大任務仍會取得槽位"""
+    scheduler = JobScheduler(1, 1e12, 1e12, 1e6, max_wait=0.05)
+    started = []
+
+    async def job(job_id, parameters):
+        await scheduler.acquire(job_id, parameters)
+        started.append(job_id)
+
+    async def main():
+        await job("small-0", _params(nx=11))
+        tasks = [asyncio.ensure_future(job("large", _params(nx=101)))]
+        # 每次釋放槽位前都有一個新的小任務在佇列中
+        for i in range(1, 20):
+            tasks.append(asyncio.ensure_future(job(f"small-{i}", _params(nx=11))))
+            await asyncio.sleep(0.01)
+            scheduler.release(started[-1])
+            await asyncio.sleep(0.001)
+        while len(started) < len(tasks) + 1:
+            scheduler.release(started[-1])
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert started[1] == "small-1"
+    assert started.index("large") < 12
+
+
+def test_reported_progress_replaces_max_iter_cost():
+    """測試執行中任務回報的預估取代以 max_iter 估計的成本"""
+    cost = estimate_cost(_params(max_iter=10000))
+    scheduler = JobScheduler(2, cost * 1.5, 1e12, 1e6)
+
+    async def main():
+        assert await scheduler.acquire("long", _params(max_iter=10000))
+        waiting = asyncio.ensure_future(scheduler.acquire("next", _params(max_iter=10000)))
+        await asyncio.sleep(0)
+        # 總成本超過上限, 第二個任務只能等待
+        assert not waiting.done()
+        assert scheduler.estimated_remaining("long") is None
+        wait_before = scheduler.estimated_wait("next")
+
+        # 求解器預估只剩 100 次迭代: 預估總成本下降, 第二個任務即可開始
+        points = 21 * 21
+        scheduler.report_progress("long", points * 400, points * 100, 2.0)
+        assert scheduler.estimated_remaining("long") == pytest.approx(2.0, abs=0.1)
+        assert await asyncio.wait_for(waiting, 1.0) is True
+        assert wait_before > 0
+
+        scheduler.release("long")
+        assert scheduler.estimated_remaining("long") is None
+
+    asyncio.run(main())
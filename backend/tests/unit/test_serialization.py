@@ -0,0 +1,49 @@
+"""結果序列化單元測試"""
+import io
+import json
+import numpy as np
+from app.services.serialization import (
+    JSON_MEDIA_TYPE, NPZ_MEDIA_TYPE, RAW_MEDIA_TYPE, decode_raw, encode_npz, encode_raw, negotiate
+)
+
+
+def test_negotiate_accept_header():
+    """測試依 q 值與萬用字元選擇格式"""
+    assert negotiate(None) == JSON_MEDIA_TYPE
+    assert negotiate("application/json, text/plain, */*") == JSON_MEDIA_TYPE
+    assert negotiate("application/octet-stream") == RAW_MEDIA_TYPE
+    assert negotiate("application/json;q=0.5, application/x-npz") == NPZ_MEDIA_TYPE
+    assert negotiate("text/html") is None
+    assert negotiate("application/octet-stream;q=0, */*") == JSON_MEDIA_TYPE
+
+
+def test_raw_and_npz_round_trip():
+    """測試原始格式與 npz 的往返編碼, 含 float32 降精度"""
+    fields = {"pressure": np.arange(12.0).reshape(3, 4), "x_coords": np.linspace(0, 1, 4)}
+    metadata = {"job_id": "abc", "converged": True}
+
+    decoded, meta = decode_raw(encode_raw(fields, metadata, dtype="float32"))
+    assert meta == metadata
+    assert decoded["pressure"].dtype == np.dtype("<f4")
+    np.testing.assert_array_equal(decoded["pressure"], fields["pressure"])
+    np.testing.assert_array_equal(decoded["x_coords"], fields["x_coords"].astype(np.float32))
+
+    with np.load(io.BytesIO(encode_npz(fields, metadata))) as archive:
+        assert json.loads(str(archive["metadata"])) == metadata
+        np.testing.assert_array_equal(archive["pressure"], fields["pressure"])
+
+
+def test_encode_json_matches_stdlib(monkeypatch):
+    """測試 orjson 與標準 json 兩種路徑輸出相同內容"""
+    from app.services import serialization
+
+    payload = {
+        "pressure": np.linspace(0, 1, 6).reshape(2, 3),
+        "history": [{"iteration": np.int64(10), "residual_u": np.float64(0.5)}],
+    }
+    fast = json.loads(serialization.encode_json(payload))
+    monkeypatch.setattr(serialization, "orjson", None)
+    slow = json.loads(serialization.encode_json(payload))
+
+    assert fast == slow
+    assert fast["pressure"] == payload["pressure"].tolist()
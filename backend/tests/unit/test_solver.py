@@ -79,3 +79,136 @@ def test_solve_cavity_flow_with_callback():
         assert "residual_u" in call
         assert "residual_v" in call
         assert "elapsed_time" in call
+
+
+def test_solve_cavity_flow_with_pcg():
+    """測試以共軛梯度法求解壓力修正並記錄內迭代次數"""
+    parameters = SimulationParameters(
+        reynolds_number=100.0,
+        nx=21,
+        ny=21,
+        max_iter=1000,
+        tolerance=1e-4,
+        pressure_solver="pcg"
+    )
+
+    results = solve_cavity_flow(parameters)
+
+    assert results["converged"] is True
+    history = results["convergence_history"]
+    assert max(history["pressure_iterations"]) >= 1
+    assert len(history["pressure_iterations"]) == len(history["iteration"])
+    assert len(history["pressure_residual"]) == len(history["iteration"])
+    assert all(0.0 <= r < 1.0 for r in history["pressure_residual"])
+
+
+def test_solve_cavity_flow_warm_start():
+    """測試以較粗網格的收斂解暖啟動可減少外迭代次數"""
+    coarse = solve_cavity_flow(
+        SimulationParameters(reynolds_number=100.0, nx=15, ny=15, max_iter=1000, tolerance=1e-4),
+        as_arrays=True
+    )
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=21, ny=21, max_iter=1000, tolerance=1e-4
+    )
+
+    cold = solve_cavity_flow(parameters)
+    warm = solve_cavity_flow(parameters, initial_state={
+        key: coarse[key] for key in ("pressure", "velocity_u", "velocity_v")
+    })
+
+    assert warm["converged"] is True
+    assert warm["total_iterations"] < cold["total_iterations"]
+
+
+def test_solve_cavity_flow_resumes_from_checkpoint(tmp_path):
+    """測試取消後由檢查點續算, 結果與未中斷的求解相同"""
+    import threading
+    import numpy as np
+    from app.core.solver import Checkpointer, SolverCancelled
+
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=15, ny=15, max_iter=1000, tolerance=1e-4
+    )
+    reference = solve_cavity_flow(parameters, as_arrays=True)
+
+    checkpointer = Checkpointer(str(tmp_path / "job.npz"), every_iterations=20, every_seconds=3600)
+    cancel_event = threading.Event()
+
+    def cancel_at_50(data):
+        if data["iteration"] == 50:
+            cancel_event.set()
+
+    with pytest.raises(SolverCancelled):
+        solve_cavity_flow(parameters, cancel_at_50, checkpointer=checkpointer, cancel_event=cancel_event)
+    assert checkpointer.load(15, 15)["iteration"] == 50
+    assert not (tmp_path / "job.npz.tmp").exists()
+
+    resumed = solve_cavity_flow(parameters, as_arrays=True, checkpointer=checkpointer)
+    assert resumed["total_iterations"] == reference["total_iterations"]
+    np.testing.assert_array_equal(
+        resumed["convergence_history"]["iteration"], reference["convergence_history"]["iteration"]
+    )
+    np.testing.assert_allclose(resumed["velocity_u"], reference["velocity_u"], rtol=1e-12, atol=1e-14)
+
+
+def test_grid_levels():
+    """測試網格序列的層級與各層收斂標準"""
+    from app.core.solver.sequencing import grid_levels, level_tolerance
+
+    assert grid_levels(161, 161, 21) == [(21, 21), (41, 41), (81, 81), (161, 161)]
+    assert grid_levels(81, 41, 21) == [(41, 21), (81, 41)]
+    assert grid_levels(30, 30, 21) == [(30, 30)]
+    assert level_tolerance(1e-5, 10.0, 2) == pytest.approx(1e-3)
+    assert level_tolerance(1e-3, 10.0, 5) == 0.1
+
+
+def test_solve_cavity_flow_grid_sequencing():
+    """測試網格序列依序收斂各層, 進度附上層級, 且最細層的外迭代次數少於由零場開始"""
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=21, ny=21, max_iter=3000, tolerance=1e-5,
+        grid_sequencing=True, sequencing_coarsest=11
+    )
+    progress = []
+    sequenced = solve_cavity_flow(parameters, progress.append, as_arrays=True)
+    cold = solve_cavity_flow(parameters.model_copy(update={"grid_sequencing": False}), as_arrays=True)
+
+    assert sequenced["converged"] is True
+    assert [(level["nx"], level["ny"]) for level in sequenced["levels"]] == [(11, 11), (21, 21)]
+    assert [level["tolerance"] for level in sequenced["levels"]] == pytest.approx([1e-4, 1e-5])
+    assert sequenced["levels"][-1]["iterations"] == sequenced["total_iterations"]
+    assert sequenced["pressure"].shape == (21, 21)
+
+    assert [p["level"] for p in (progress[0], progress[-1])] == [0, 1]
+    assert progress[-1]["grid"] == [21, 21] and progress[-1]["levels"] == 2
+    assert sequenced["total_iterations"] < cold["total_iterations"]
+
+
+def test_grid_sequencing_resume_reads_checkpoint_once(tmp_path, monkeypatch):
+    """測試網格序列由檢查點續算時只讀取一次檢查點, 且略過粗層"""
+    import threading
+    from app.core.solver import Checkpointer, SolverCancelled
+
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=21, ny=21, max_iter=3000, tolerance=1e-5,
+        grid_sequencing=True, sequencing_coarsest=11
+    )
+    checkpointer = Checkpointer(str(tmp_path / "job.npz"), every_iterations=20, every_seconds=3600)
+    cancel_event = threading.Event()
+
+    def cancel_on_fine_level(data):
+        if data["level"] == 1 and data["iteration"] == 40:
+            cancel_event.set()
+
+    with pytest.raises(SolverCancelled):
+        solve_cavity_flow(parameters, cancel_on_fine_level, checkpointer=checkpointer, cancel_event=cancel_event)
+
+    loads = []
+    load = checkpointer.load
+    monkeypatch.setattr(checkpointer, "load", lambda nx, ny: loads.append((nx, ny)) or load(nx, ny))
+    resumed = solve_cavity_flow(parameters, as_arrays=True, checkpointer=checkpointer)
+
+    assert loads == [(21, 21)]
+    assert resumed["converged"] is True
+    assert "levels" not in resumed
+    assert resumed["convergence_history"]["iteration"][0] == 0
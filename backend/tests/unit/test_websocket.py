@@ -0,0 +1,152 @@
+"""WebSocket 連線管理單元測試"""
+import asyncio
+import json
+import threading
+import numpy as np
+from app.api.websocket import ConnectionManager
+from app.core.solver import SnapshotEmitter, solve_cavity_flow
+from app.models.results import SnapshotOptions
+from app.models.simulation import SimulationParameters
+from app.services.serialization import decode_raw
+
+
+class FakeWebSocket:
+    """記錄送出訊息的假連線; blocked 時傳送會等待"""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        await self.gate.wait()
+        self.sent.append(decode_raw(data))
+
+
+def test_broadcast_fan_out_and_drop_oldest():
+    """測試多個訂閱者各自收到訊息, 慢速訂閱者丟棄最舊訊息且不影響其他訂閱者"""
+    async def scenario():
+        manager = ConnectionManager(max_queue=3)
+        disconnected = []
+        manager.add_disconnect_handler(disconnected.append)
+        fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+        fast_sub = await manager.connect("job", fast)
+        slow_sub = await manager.connect("job", slow)
+
+        for iteration in range(10):
+            await manager.send_progress("job", {"iteration": iteration})
+            await asyncio.sleep(0)
+        await manager.send_completion("job", True, "done")
+        await asyncio.sleep(0.01)
+
+        # 慢速訂閱者: 第一筆已在傳送中, 佇列只保留最新的 3 筆
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+
+        manager.disconnect("job", fast_sub)
+        assert disconnected == []
+        manager.disconnect("job", slow_sub)
+        assert disconnected == ["job"]
+        return fast.sent, slow.sent, slow_sub.dropped
+
+    fast_sent, slow_sent, dropped = asyncio.run(scenario())
+
+    assert [m["data"]["iteration"] for m in fast_sent[:-1]] == list(range(10))
+    assert fast_sent[-1]["type"] == "completed"
+    assert [m.get("data", {}).get("iteration") for m in slow_sent] == [0, 8, 9, None]
+    assert slow_sent[-1]["type"] == "completed"
+    assert dropped == 7
+
+
+def _snapshot(iteration, n=32):
+    return {
+        "iteration": iteration,
+        "pressure": np.random.rand(n, n).astype(np.float32),
+        "velocity_u": np.random.rand(n, n - 1).astype(np.float32),
+        "velocity_v": np.random.rand(n - 1, n).astype(np.float32),
+        "x_coords": np.linspace(0.0, 1.0, n, dtype=np.float32),
+        "y_coords": np.linspace(0.0, 1.0, n, dtype=np.float32),
+    }
+
+
+def test_snapshots_follow_subscriber_options():
+    """測試快照只送給訂閱者, 並依各自的解析度、精度與迭代間隔送出"""
+    async def scenario():
+        manager = ConnectionManager()
+        demand = []
+        manager.add_snapshot_handler(lambda job_id, wanted: demand.append(wanted))
+        coarse, fine, plain = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        coarse_sub = await manager.connect("job", coarse)
+        fine_sub = await manager.connect("job", fine)
+        await manager.connect("job", plain)
+
+        manager.set_snapshot_options(
+            "job", coarse_sub, SnapshotOptions(every=20, max_points=8, dtype="float16", max_rate=1000)
+        )
+        manager.set_snapshot_options(
+            "job", fine_sub, SnapshotOptions(every=10, max_points=64, dtype="float32", max_rate=1000)
+        )
+        for iteration in (0, 10, 20):
+            await manager.send_snapshot("job", _snapshot(iteration))
+            await asyncio.sleep(0.01)
+
+        manager.set_snapshot_options("job", coarse_sub, None)
+        manager.disconnect("job", fine_sub)
+        return coarse.sent, fine.sent, plain.sent, demand
+
+    coarse_sent, fine_sent, plain_sent, demand = asyncio.run(scenario())
+
+    assert plain_sent == []
+    assert [metadata["iteration"] for _, metadata in coarse_sent] == [0, 20]
+    assert [metadata["iteration"] for _, metadata in fine_sent] == [0, 10, 20]
+
+    fields, metadata = coarse_sent[0]
+    assert metadata == {"type": "snapshot", "job_id": "job", "iteration": 0, "level": 0}
+    assert fields["pressure"].shape == (8, 8)
+    assert fields["pressure"].dtype == np.float16
+    assert fine_sent[0][0]["pressure"].shape == (32, 32)
+    assert fine_sent[0][0]["velocity_u"].dtype == np.float32
+
+    # 第一個訂閱者出現時啟用, 最後一個離開時停用
+    assert demand == [True, False]
+
+
+def test_snapshots_continue_across_grid_sequencing_levels():
+    """測試網格序列進入較細層 (迭代次數重新起算) 後仍持續送出快照"""
+    parameters = SimulationParameters(
+        reynolds_number=100.0, nx=21, ny=21, max_iter=3000, tolerance=1e-5,
+        grid_sequencing=True, sequencing_coarsest=11
+    )
+    enabled = threading.Event()
+    enabled.set()
+    emitter = SnapshotEmitter(enabled, every=10, max_points=8)
+    snapshots = []
+    emitter.callback = snapshots.append
+    solve_cavity_flow(parameters, snapshots=emitter, as_arrays=True)
+
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        subscriber = await manager.connect("job", websocket)
+        manager.set_snapshot_options(
+            "job", subscriber, SnapshotOptions(every=50, max_points=8, max_rate=1e6)
+        )
+        for snapshot in snapshots:
+            await manager.send_snapshot("job", snapshot)
+        await asyncio.sleep(0.01)
+        return websocket.sent
+
+    sent = [metadata for _, metadata in asyncio.run(scenario())]
+    coarse = [m["iteration"] for m in sent if m["level"] == 0]
+    fine = [m["iteration"] for m in sent if m["level"] == 1]
+    # 粗層最後一筆快照的迭代次數不小於取樣間隔, 細層仍由第 0 次迭代開始送出
+    assert coarse[-1] >= 50
+    assert fine[:2] == [0, 50]
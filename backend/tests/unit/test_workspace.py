@@ -0,0 +1,31 @@
+"""求解器工作區單元測試"""
+from app.models.simulation import SimulationParameters
+from app.core.solver import solve_cavity_flow
+from app.core.solver.workspace import SolverWorkspace, WorkspacePool
+
+
+def test_pool_reuses_workspace_per_grid():
+    """測試相同網格尺寸重複使用工作區並清除內容"""
+    pool = WorkspacePool()
+    workspace = pool.acquire(11, 13)
+    workspace.p.fill(1.0)
+    pool.release(workspace)
+
+    reused = pool.acquire(11, 13)
+    assert reused is workspace
+    assert not reused.p.any()
+    assert pool.acquire(11, 13) is not workspace
+    assert pool.acquire(13, 11).key == (13, 11)
+
+
+def test_reused_workspace_gives_identical_results():
+    """測試重複使用工作區不影響求解結果"""
+    parameters = SimulationParameters(reynolds_number=100.0, nx=11, ny=11, max_iter=100)
+    workspace = SolverWorkspace(11, 11)
+
+    first = solve_cavity_flow(parameters, workspace=workspace)
+    second = solve_cavity_flow(parameters, workspace=workspace)
+
+    assert first["velocity_u"] == second["velocity_u"]
+    assert first["pressure"] == second["pressure"]
+    assert first["total_iterations"] == second["total_iterations"]
@@ -51,72 +51,66 @@ for it in range(max_iter):
     # --- 步驟 A: 求解動量方程式 (速度預測) ---
 
     # A1. 求解 u-動量方程式 (x方向)
-    for j in range(1, NY - 1):
-        for i in range(1, NX - 2):
-            # 對流項 (使用一階迎風格式 Upwind Scheme)
-            conv_u_E = 0.5 * rho * dy * (u[j, i] + u[j, i + 1])
-            conv_u_W = 0.5 * rho * dy * (u[j, i - 1] + u[j, i])
-            conv_v_N = 0.5 * rho * dx * (v[j, i] + v[j, i + 1])
-            conv_v_S = 0.5 * rho * dx * (v[j - 1, i] + v[j - 1, i + 1])
-
-            # 擴散項
-            diff_u_E = mu * dy / dx
-            diff_u_W = mu * dy / dx
-            diff_u_N = mu * dx / dy
-            diff_u_S = mu * dx / dy
-
-            # 離散方程式的係數
-            a_E = diff_u_E + max(0, -conv_u_E)
-            a_W = diff_u_W + max(0, conv_u_W)
-            a_N = diff_u_N + max(0, -conv_v_N)
-            a_S = diff_u_S + max(0, conv_v_S)
-
-            # 壓力梯度項
-            source_p_u = (p[j, i] - p[j, i + 1]) * dy
-
-            # 中心點係數 a_P
-            a_P_u = a_E + a_W + a_N + a_S + \
-                (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
-
-            # 預測速度 u_star (包含鬆弛因子)
-            numerator = a_E * u[j, i+1] + a_W * u[j, i-1] + \
-                a_N * u[j+1, i] + a_S * u[j-1, i] + source_p_u
-            u_star[j, i] = (1 - alpha_u) * u[j, i] + \
-                alpha_u * (numerator / a_P_u)
+    # 以陣列切片一次處理所有內部 u 面 (j=1..NY-2, i=1..NX-3)
+    J, I = slice(1, NY - 1), slice(1, NX - 2)
+
+    # 對流項 (使用一階迎風格式 Upwind Scheme)
+    conv_u_E = 0.5 * rho * dy * (u[J, I] + u[J, 2:NX - 1])
+    conv_u_W = 0.5 * rho * dy * (u[J, 0:NX - 3] + u[J, I])
+    conv_v_N = 0.5 * rho * dx * (v[J, 1:NX - 2] + v[J, 2:NX - 1])
+    conv_v_S = 0.5 * rho * dx * (v[0:NY - 2, 1:NX - 2] + v[0:NY - 2, 2:NX - 1])
+
+    # 離散方程式的係數 (擴散 + 迎風)
+    a_E = mu * dy / dx + np.maximum(0.0, -conv_u_E)
+    a_W = mu * dy / dx + np.maximum(0.0, conv_u_W)
+    a_N = mu * dx / dy + np.maximum(0.0, -conv_v_N)
+    a_S = mu * dx / dy + np.maximum(0.0, conv_v_S)
+
+    # 壓力梯度項
+    source_p_u = (p[J, 1:NX - 2] - p[J, 2:NX - 1]) * dy
+
+    # 中心點係數 a_P
+    a_P_u_field = a_E + a_W + a_N + a_S + \
+        (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
+
+    # 預測速度 u_star (包含鬆弛因子)
+    numerator = a_E * u[J, 2:NX - 1] + a_W * u[J, 0:NX - 3] + \
+        a_N * u[2:NY, I] + a_S * u[0:NY - 2, I] + source_p_u
+    u_star[J, I] = (1 - alpha_u) * u[J, I] + \
+        alpha_u * (numerator / a_P_u_field)
 
     # A2. 求解 v-動量方程式 (y方向)
-    for j in range(1, NY - 2):
-        for i in range(1, NX - 1):
-            # 對流項
-            conv_u_E = 0.5 * rho * dy * (u[j, i] + u[j + 1, i])
-            conv_u_W = 0.5 * rho * dy * (u[j, i - 1] + u[j + 1, i - 1])
-            conv_v_N = 0.5 * rho * dx * (v[j, i] + v[j + 1, i])
-            conv_v_S = 0.5 * rho * dx * (v[j - 1, i] + v[j, i])
-
-            # 擴散項
-            diff_v_E = mu * dy / dx
-            diff_v_W = mu * dy / dx
-            diff_v_N = mu * dx / dy
-            diff_v_S = mu * dx / dy
-
-            # 離散方程式的係數
-            a_E = diff_v_E + max(0, -conv_u_E)
-            a_W = diff_v_W + max(0, conv_u_W)
-            a_N = diff_v_N + max(0, -conv_v_N)
-            a_S = diff_v_S + max(0, conv_v_S)
-
-            # 壓力梯度項
-            source_p_v = (p[j, i] - p[j + 1, i]) * dx
-
-            # 中心點係數 a_P
-            a_P_v = a_E + a_W + a_N + a_S + \
-                (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
-
-            # 預測速度 v_star (包含鬆弛因子)
-            numerator = a_E * v[j, i+1] + a_W * v[j, i-1] + \
-                a_N * v[j+1, i] + a_S * v[j-1, i] + source_p_v
-            v_star[j, i] = (1 - alpha_u) * v[j, i] + \
-                alpha_u * (numerator / a_P_v)
+    # 以陣列切片一次處理所有內部 v 面 (j=1..NY-3, i=1..NX-2)
+    J, I = slice(1, NY - 2), slice(1, NX - 1)
+
+    # 對流項
+    conv_u_E = 0.5 * rho * dy * (u[J, I] + u[2:NY - 1, I])
+    conv_u_W = 0.5 * rho * dy * (u[J, 0:NX - 2] + u[2:NY - 1, 0:NX - 2])
+    conv_v_N = 0.5 * rho * dx * (v[J, I] + v[2:NY - 1, I])
+    conv_v_S = 0.5 * rho * dx * (v[0:NY - 3, I] + v[J, I])
+
+    # 離散方程式的係數
+    a_E = mu * dy / dx + np.maximum(0.0, -conv_u_E)
+    a_W = mu * dy / dx + np.maximum(0.0, conv_u_W)
+    a_N = mu * dx / dy + np.maximum(0.0, -conv_v_N)
+    a_S = mu * dx / dy + np.maximum(0.0, conv_v_S)
+
+    # 壓力梯度項
+    source_p_v = (p[J, I] - p[2:NY - 1, I]) * dx
+
+    # 中心點係數 a_P
+    a_P_v_field = a_E + a_W + a_N + a_S + \
+        (conv_u_E - conv_u_W) + (conv_v_N - conv_v_S)
+
+    # 預測速度 v_star (包含鬆弛因子)
+    numerator = a_E * v[J, 2:NX] + a_W * v[J, 0:NX - 2] + \
+        a_N * v[2:NY - 1, I] + a_S * v[0:NY - 3, I] + source_p_v
+    v_star[J, I] = (1 - alpha_u) * v[J, I] + \
+        alpha_u * (numerator / a_P_v_field)
+
+    # 壓力修正沿用最後一個面的 a_P (與原迴圈實作一致)
+    a_P_u = a_P_u_field[-1, -1]
+    a_P_v = a_P_v_field[-1, -1]
 
     # --- 步驟 B: 求解壓力修正方程式 ---
     p_prime[:, :] = 0  # 重置壓力修正量